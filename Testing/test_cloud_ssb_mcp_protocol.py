@@ -367,12 +367,12 @@ class MCPTestProtocol:
         try:
             from ssb_mcp_server.server import main, create_server
             from ssb_mcp_server.config import ServerConfig
-            from ssb_mcp_server.server import build_client
+            from ssb_mcp_server.server import build_async_client
             import asyncio
             
-            # Test MCP server creation
+            # Test MCP server creation (the server's tools await the async client)
             config = ServerConfig()
-            client = build_client(config)
+            client = build_async_client(config)
             server = create_server(client, readonly=False)
             
             # Get available tools (handle async method)
@@ -382,6 +382,8 @@ class MCPTestProtocol:
             except:
                 # Fallback: check if server has tools attribute
                 tool_count = len(getattr(server, 'tools', []))
+            finally:
+                asyncio.run(client.aclose())
             
             if tool_count > 0:
                 self.log_test("mcp_tools_discovery", "PASS", f"MCP server created with {tool_count} tools available")
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import functools
+import inspect
+from typing import Any, Callable, Optional
+
+import anyio
+import httpx
+
+from .core import CappedResponse, Gather, Offload, SSBClientCore, Send, Shared, Sleep
+from .singleflight import AsyncSingleFlight
+
+
+class AsyncSSBClient(SSBClientCore):
+	"""Async counterpart of SSBClient built on a pooled httpx.AsyncClient.
+
+	Exposes the same operations as SSBClient, with every method awaitable, so MCP tools
+	can call SSB without blocking the event loop. CPU-bound steps run in worker threads.
+	"""
+
+	_transport_errors = (httpx.TransportError,)
+	_single_flight_type = AsyncSingleFlight
+
+	def __init__(self, base_url: str, http: httpx.AsyncClient, **options: Any):
+		"""``options`` are the caching, retry and sampling settings of SSBClientCore."""
+		super().__init__(base_url, **options)
+		self.http = http
+
+		# Add CDP proxy headers if configured
+		if self.proxy_context_path:
+			self.http.headers.update({'X-ProxyContextPath': self.proxy_context_path})
+
+	async def aclose(self) -> None:
+		await self.http.aclose()
+		self.sample_spills.close()
+
+	async def __aenter__(self) -> "AsyncSSBClient":
+		return self
+
+	async def __aexit__(self, *exc_info: Any) -> None:
+		await self.aclose()
+
+	@staticmethod
+	def _bind(steps: Callable[..., Any]) -> Callable[..., Any]:
+		@functools.wraps(steps)
+		async def call(self: "AsyncSSBClient", *args: Any, **kwargs: Any) -> Any:
+			return await self._drive(steps(self, *args, **kwargs))
+		return call
+
+	@staticmethod
+	def _is_success(resp: httpx.Response) -> bool:
+		return resp.is_success
+
+	@staticmethod
+	def _status_error(message: str, resp: httpx.Response) -> Exception:
+		return httpx.HTTPStatusError(message, request=resp.request, response=resp)
+
+	async def _drive(self, steps: Any) -> Any:
+		"""Run an operation to completion on the event loop, performing each step it yields."""
+		if not inspect.isgenerator(steps):
+			return steps
+		value: Any = None
+		error: Optional[BaseException] = None
+		while True:
+			try:
+				step = steps.send(value) if error is None else steps.throw(error)
+			except StopIteration as stop:
+				return stop.value
+			value, error = None, None
+			try:
+				value = await self._perform(step)
+			except BaseException as e:
+				# Cancellation too, so the operation's cleanup runs before it propagates
+				error = e
+
+	async def _perform(self, step: Any) -> Any:
+		if isinstance(step, Send):
+			if step.max_bytes is not None:
+				async with self.http.stream(step.method, self._url(step.path), params=step.params, data=step.data, json=step.json_data,
+				                            timeout=self.timeout) as resp:
+					body = bytearray()
+					async for chunk in resp.aiter_bytes():
+						body += chunk
+						if len(body) > step.max_bytes:
+							break
+				return CappedResponse(resp.status_code, resp.headers, bytes(body) if len(body) <= step.max_bytes else None)
+			return await self.http.request(step.method, self._url(step.path), params=step.params, data=step.data, json=step.json_data,
+			                               timeout=self.timeout)
+		if isinstance(step, Sleep):
+			await anyio.sleep(step.seconds)
+			return None
+		if isinstance(step, Offload):
+			return await anyio.to_thread.run_sync(step.func, *step.args)
+		if isinstance(step, Shared):
+			return await step.flight.do(step.key, lambda: self._drive(step.steps()))
+		if isinstance(step, Gather):
+			workers = anyio.CapacityLimiter(step.limit)
+
+			async def run(call: Callable[[], Any]) -> None:
+				async with workers:
+					await self._drive(call())
+
+			# Calls still running at the deadline are cancelled
+			with anyio.move_on_after(step.deadline):
+				async with anyio.create_task_group() as tg:
+					for call in step.calls:
+						tg.start_soon(run, call)
+			return None
+		raise TypeError(f"Unknown step: {step!r}")
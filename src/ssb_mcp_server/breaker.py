@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class BackendUnavailableError(Exception):
+	"""Raised without contacting the backend while its circuit is open."""
+
+	def __init__(self, circuit: str, retry_after: float):
+		self.circuit = circuit
+		self.retry_after = max(0.0, retry_after)
+		super().__init__(f"SSB backend unavailable for {circuit}; retry in {self.retry_after:.1f}s")
+
+
+def endpoint_group(path: str) -> str:
+	"""Group endpoints by their first path segment (jobs, samples, sql, ddl, ...)."""
+	return path.lstrip("/").split("/", 1)[0] or "/"
+
+
+class CircuitBreaker:
+	"""Closed/open/half-open breaker for one backend endpoint group.
+
+	The circuit opens after ``failure_threshold`` consecutive failed calls. While
+	open, calls are rejected immediately. Once ``reset_timeout`` has passed, a single
+	probe call is let through (half-open); its outcome closes or re-opens the circuit.
+	"""
+
+	def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+		self.name = name
+		self.failure_threshold = failure_threshold
+		self.reset_timeout = reset_timeout
+		self.state = CLOSED
+		self.consecutive_failures = 0
+		self.opened_at = 0.0
+		self.rejected_calls = 0
+		self._probe_in_flight = False
+		self._lock = threading.Lock()
+
+	def before_call(self) -> None:
+		"""Admit a call or raise BackendUnavailableError if the circuit is open."""
+		with self._lock:
+			if self.state == OPEN:
+				remaining = self.opened_at + self.reset_timeout - time.monotonic()
+				if remaining > 0:
+					self.rejected_calls += 1
+					raise BackendUnavailableError(self.name, remaining)
+				self.state = HALF_OPEN
+			if self.state == HALF_OPEN:
+				if self._probe_in_flight:
+					self.rejected_calls += 1
+					raise BackendUnavailableError(self.name, self.reset_timeout)
+				self._probe_in_flight = True
+
+	def record_success(self) -> None:
+		with self._lock:
+			self.state = CLOSED
+			self.consecutive_failures = 0
+			self._probe_in_flight = False
+
+	def record_failure(self) -> None:
+		with self._lock:
+			self.consecutive_failures += 1
+			self._probe_in_flight = False
+			if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+				self.state = OPEN
+				self.opened_at = time.monotonic()
+
+	def release(self) -> None:
+		"""Give up an admitted call without an outcome (e.g. the caller was cancelled)."""
+		with self._lock:
+			self._probe_in_flight = False
+
+	def stats(self) -> Dict[str, Any]:
+		with self._lock:
+			return {
+				"state": self.state,
+				"consecutive_failures": self.consecutive_failures,
+				"rejected_calls": self.rejected_calls,
+			}
+
+
+class CircuitBreakerRegistry:
+	"""Lazily creates one CircuitBreaker per (base URL, endpoint group)."""
+
+	def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+		self.failure_threshold = failure_threshold
+		self.reset_timeout = reset_timeout
+		self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+		self._lock = threading.Lock()
+
+	def get(self, base_url: str, path: str) -> CircuitBreaker:
+		key = (base_url, endpoint_group(path))
+		with self._lock:
+			breaker = self._breakers.get(key)
+			if breaker is None:
+				breaker = CircuitBreaker(f"{key[0]} [{key[1]}]", self.failure_threshold, self.reset_timeout)
+				self._breakers[key] = breaker
+			return breaker
+
+	def stats(self) -> Dict[str, Any]:
+		with self._lock:
+			breakers = list(self._breakers.values())
+		return {breaker.name: breaker.stats() for breaker in breakers}
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .pagination import PageCache
+
+
+# Fields that identify an item or explain the response; never dropped to save space
+PROTECTED_KEYS = frozenset({
+	"id", "job_id", "name", "sample_id", "state", "status", "error", "error_type",
+	"error_message", "message", "page", "spill", "next_cursor", "_budget",
+})
+
+_STRING_CAPS = (4096, 1024)
+_MAX_REPORTED_PATHS = 20
+
+
+def _size(obj: Any) -> int:
+	"""Size of the serialized (compact JSON) response in bytes."""
+	return len(json.dumps(obj, separators=(",", ":"), default=str).encode())
+
+
+def _path(parts: Tuple[Any, ...]) -> str:
+	return ".".join(str(p) if not isinstance(p, int) else f"[{p}]" for p in parts).replace(".[", "[")
+
+
+def _field_path(parts: Tuple[Any, ...]) -> Tuple[Any, ...]:
+	"""A path without list indexes, as the fields argument takes it: ``jobs.config``
+	names ``config`` in every item of ``jobs``."""
+	return tuple(p for p in parts if not isinstance(p, int))
+
+
+def _copy(obj: Any) -> Any:
+	return json.loads(json.dumps(obj, default=str))
+
+
+def _containers(obj: Any) -> Iterator[Tuple[Tuple[Any, ...], Any]]:
+	"""Every dict and list in a document with its path, without recursion."""
+	stack: List[Tuple[Tuple[Any, ...], Any]] = [((), obj)]
+	while stack:
+		path, node = stack.pop()
+		yield path, node
+		children = node.items() if isinstance(node, dict) else enumerate(node)
+		for key, value in children:
+			if isinstance(value, (dict, list)):
+				stack.append((path + (key,), value))
+
+
+def parse_budgets(spec: str) -> Dict[str, int]:
+	"""Parse per-tool overrides given as ``tool=bytes,tool=bytes``."""
+	budgets: Dict[str, int] = {}
+	for item in spec.split(","):
+		name, _, value = item.partition("=")
+		if name.strip() and value.strip().isdigit():
+			budgets[name.strip()] = int(value.strip())
+	return budgets
+
+
+class ResponseBudget:
+	"""Keeps tool responses under a byte budget by trimming them progressively.
+
+	Over-budget responses first get long strings shortened, then the largest
+	nested fields dropped, then list items cut. Every cut is described in a
+	``_budget`` entry. Cut top-level lists get a continuation cursor only when a
+	page cache is passed, i.e. for paged tools that accept that cursor back.
+	"""
+
+	def __init__(self, max_bytes: int = 100_000, per_tool: Optional[Dict[str, int]] = None):
+		self.max_bytes = max_bytes
+		self.per_tool = per_tool or {}
+		self.shaped = 0
+
+	def limit_for(self, tool_name: str) -> int:
+		return self.per_tool.get(tool_name, self.max_bytes)
+
+	def shape(self, result: Any, tool_name: str, pages: Optional[PageCache] = None) -> Any:
+		limit = self.limit_for(tool_name)
+		if limit <= 0 or not isinstance(result, dict):
+			return result
+		size = _size(result)
+		if size <= limit:
+			return result
+
+		self.shaped += 1
+		# Work on a copy: the result may be shared with client-side caches
+		shaped = _copy(result)
+		report: Dict[str, Any] = {"limit_bytes": limit, "original_bytes": size}
+		for step in (self._shorten_strings, self._drop_fields, self._cut_lists):
+			if step(shaped, result, limit, report, pages):
+				break
+		report["final_bytes"] = _size(shaped)
+		report["approx_tokens"] = report["final_bytes"] // 4
+		shaped["_budget"] = report
+		return shaped
+
+	def _shorten_strings(self, doc: Dict[str, Any], original: Dict[str, Any], limit: int, report: Dict[str, Any], pages: Optional[PageCache]) -> bool:
+		truncated: Dict[str, int] = {}
+		for cap in _STRING_CAPS:
+			for path, node in list(_containers(doc)):
+				children = list(node.items()) if isinstance(node, dict) else list(enumerate(node))
+				for key, value in children:
+					if isinstance(value, str) and len(value) > cap:
+						truncated.setdefault(_path(path + (key,)), len(value))
+						node[key] = value[:cap] + f"... [{len(value) - cap} more chars]"
+			if _size(doc) <= limit:
+				break
+		if truncated:
+			report["truncated_strings"] = {
+				"count": len(truncated),
+				"original_lengths": dict(list(truncated.items())[:_MAX_REPORTED_PATHS]),
+				"how_to_get": "Request the value alone with the fields argument, e.g. fields=[\"<path without [index]>\"]",
+			}
+		return _size(doc) <= limit
+
+	def _drop_fields(self, doc: Dict[str, Any], original: Dict[str, Any], limit: int, report: Dict[str, Any], pages: Optional[PageCache]) -> bool:
+		dropped: List[str] = []
+		while _size(doc) > limit:
+			# Sized per path, so a field is dropped from every item of one list but not
+			# from unrelated objects that happen to use the same key
+			sizes: Counter = Counter()
+			for path, node in _containers(doc):
+				if path and isinstance(node, dict):
+					for key, value in node.items():
+						if key not in PROTECTED_KEYS and isinstance(value, (dict, list)):
+							sizes[_field_path(path + (key,))] += _size(value)
+			if not sizes:
+				break
+			target = sizes.most_common(1)[0][0]
+			for path, node in list(_containers(doc)):
+				if isinstance(node, dict) and _field_path(path) == target[:-1]:
+					node.pop(target[-1], None)
+			dropped.append(".".join(target))
+		if dropped:
+			report["dropped_fields"] = {
+				"fields": dropped,
+				"how_to_get": "Request them explicitly with the fields argument, with a smaller page_size for lists",
+			}
+		return _size(doc) <= limit
+
+	def _cut_lists(self, doc: Dict[str, Any], original: Dict[str, Any], limit: int, report: Dict[str, Any], pages: Optional[PageCache]) -> bool:
+		cuts: List[Dict[str, Any]] = []
+		while _size(doc) > limit:
+			lists = [(path, node) for path, node in _containers(doc) if isinstance(node, list) and len(node) > 1]
+			if not lists:
+				break
+			path, items = max(lists, key=lambda entry: _size(entry[1]))
+			full = list(items)
+			# Binary search for the longest prefix that fits
+			low, high = 1, len(full) - 1
+			while low <= high:
+				mid = (low + high) // 2
+				items[:] = full[:mid]
+				if _size(doc) <= limit:
+					low = mid + 1
+				else:
+					high = mid - 1
+			kept = max(1, high)
+			items[:] = full[:kept]
+			cut = {"path": _path(path), "kept": kept, "total": len(full)}
+			cursor = self._continuation(doc, original, path, kept, pages)
+			if cursor:
+				cut["next_cursor"] = cursor
+			cuts.append(cut)
+		if cuts:
+			report["cut_lists"] = cuts
+			if any("next_cursor" in cut for cut in cuts):
+				report["how_to_get"] = "Pass next_cursor as cursor to the same tool, or narrow the response with fields/page_size"
+			else:
+				report["how_to_get"] = "Narrow the response with the fields argument or the tool's own size limits"
+		return _size(doc) <= limit
+
+	@staticmethod
+	def _continuation(doc: Dict[str, Any], original: Dict[str, Any], path: Tuple[Any, ...], kept: int, pages: Optional[PageCache]) -> Optional[str]:
+		"""Cursor for the rest of a cut top-level list, reusing the page cache when the list is already paged.
+
+		The page cache holds the unshaped items, so later pages are not served with the
+		strings shortened or fields dropped to fit this one.
+		"""
+		if pages is None or len(path) != 1:
+			return None
+		page = doc.get("page")
+		if isinstance(page, dict) and page.get("next_cursor"):
+			cursor = f"{page['next_cursor'].partition(':')[0]}:{page['offset'] + kept}"
+			page["next_cursor"] = cursor
+			page["page_size"] = kept
+			return cursor
+		base = _copy({k: v for k, v in original.items() if k != "_budget"})
+		return f"{pages.hold(path[0], base.pop(path[0]), base)}:{kept}"
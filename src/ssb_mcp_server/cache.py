@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+_MISSING = object()
+
+
+class TTLCache:
+	"""Small thread-safe cache whose entries expire after a per-entry TTL.
+
+	Entries are kept in insertion/access order so the least recently used one is
+	dropped once ``max_entries`` is exceeded.
+	"""
+
+	def __init__(self, default_ttl: float, max_entries: int = 256):
+		self.default_ttl = default_ttl
+		self.max_entries = max_entries
+		self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+		self._lock = threading.Lock()
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, key: Hashable, default: Any = None) -> Any:
+		with self._lock:
+			entry = self._entries.get(key, _MISSING)
+			if entry is _MISSING or entry[0] <= time.monotonic():
+				if entry is not _MISSING:
+					del self._entries[key]
+				self.misses += 1
+				return default
+			self._entries.move_to_end(key)
+			self.hits += 1
+			return entry[1]
+
+	def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+		ttl = self.default_ttl if ttl is None else ttl
+		if ttl <= 0:
+			return
+		with self._lock:
+			self._entries[key] = (time.monotonic() + ttl, value)
+			self._entries.move_to_end(key)
+			while len(self._entries) > self.max_entries:
+				self._entries.popitem(last=False)
+
+	def invalidate(self, key: Optional[Hashable] = None) -> None:
+		"""Drop one entry, or every entry when no key is given."""
+		with self._lock:
+			if key is None:
+				self._entries.clear()
+			else:
+				self._entries.pop(key, None)
+
+	def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+		"""Drop every entry whose key matches the predicate."""
+		with self._lock:
+			for key in [key for key in self._entries if predicate(key)]:
+				del self._entries[key]
+
+	def stats(self) -> Dict[str, Any]:
+		with self._lock:
+			return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class JobsSnapshot:
+	"""A `GET jobs` response with hash indexes for O(1) job lookups."""
+
+	INDEXED_FIELDS = ("job_id", "name", "sample_id", "flink_job_id")
+
+	def __init__(self, payload: Dict[str, Any]):
+		self.payload = payload
+		self.jobs: List[Dict[str, Any]] = payload.get("jobs", []) if isinstance(payload, dict) else []
+		self._indexes: Dict[str, Dict[Any, Dict[str, Any]]] = {field: {} for field in self.INDEXED_FIELDS}
+		for job in self.jobs:
+			for field, index in self._indexes.items():
+				value = job.get(field)
+				# Keep the first match, as the previous linear scans did
+				if value is not None and value not in index:
+					index[value] = job
+
+	def lookup(self, field: str, value: Any) -> Optional[Dict[str, Any]]:
+		return self._indexes[field].get(value)
+
+
+class CatalogListing:
+	"""A catalog listing response with hash indexes over its items."""
+
+	def __init__(self, payload: Any, list_key: Optional[str] = None, indexed_fields: Tuple[str, ...] = ()):
+		self.payload = payload
+		if isinstance(payload, list):
+			self.items: List[Dict[str, Any]] = payload
+		elif isinstance(payload, dict) and list_key and isinstance(payload.get(list_key), list):
+			self.items = payload[list_key]
+		else:
+			self.items = []
+		self._indexes: Dict[str, Dict[Any, Dict[str, Any]]] = {field: {} for field in indexed_fields}
+		for item in self.items:
+			if not isinstance(item, dict):
+				continue
+			for field, index in self._indexes.items():
+				value = item.get(field)
+				if value is not None and value not in index:
+					index[value] = item
+
+	def lookup(self, field: str, value: Any) -> Optional[Dict[str, Any]]:
+		return self._indexes[field].get(value)
+
+
+class CatalogCache:
+	"""Slowly-changing catalog metadata (connectors, data formats, tables, UDFs).
+
+	Each listing has its own TTL and is indexed once per fetch. Writes drop the
+	listings they may have changed through ``invalidate_for_write``.
+	"""
+
+	# Listing path -> (list key in dict responses, indexed fields)
+	LISTINGS: Dict[str, Tuple[Optional[str], Tuple[str, ...]]] = {
+		"ddl/connectors": (None, ("type",)),
+		"ddl/data-formats": ("dataFormats", ()),
+		"tables": ("tables", ()),
+		"tables/tree": (None, ()),
+		"udfs": ("udfs", ()),
+	}
+	DEFAULT_TTLS: Dict[str, float] = {
+		"ddl/connectors": 300.0,
+		"ddl/data-formats": 300.0,
+		"tables": 30.0,
+		"tables/tree": 30.0,
+		"udfs": 120.0,
+	}
+	# Write path prefix -> listings it may change; None drops every listing.
+	# sql/execute is classified per statement by the client instead (DDL_INVALIDATIONS),
+	# so USE, SHOW and DESCRIBE flush nothing
+	WRITE_INVALIDATIONS: Tuple[Tuple[str, Optional[Tuple[str, ...]]], ...] = (
+		("ddl/data-formats", ("ddl/data-formats",)),
+		("ddl/connectors", ("ddl/connectors",)),
+		("tables", ("tables", "tables/tree")),
+		("data-sources", ("tables", "tables/tree")),
+		("udfs", ("udfs",)),
+		("environments", None),
+	)
+	# Listings a DDL statement sent through sql/execute may change
+	DDL_INVALIDATIONS: Tuple[str, ...] = ("tables", "tables/tree")
+
+	def __init__(self, ttls: Optional[Dict[str, float]] = None):
+		self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+		self._cache = TTLCache(max(self.ttls.values(), default=0.0), max_entries=len(self.LISTINGS))
+		self.invalidations = 0
+
+	def get(self, path: str) -> Optional[CatalogListing]:
+		return self._cache.get(path)
+
+	def put(self, path: str, payload: Any) -> CatalogListing:
+		"""Index a freshly fetched listing and keep it for the listing's TTL."""
+		list_key, fields = self.LISTINGS[path]
+		listing = CatalogListing(payload, list_key, fields)
+		self._cache.set(path, listing, self.ttls.get(path, 0.0))
+		return listing
+
+	def invalidate_for_write(self, path: str) -> None:
+		path = path.lstrip("/")
+		for prefix, listings in self.WRITE_INVALIDATIONS:
+			if path == prefix or path.startswith(prefix + "/"):
+				self.invalidate_listings(listings)
+				return
+
+	def invalidate_listings(self, listings: Optional[Tuple[str, ...]] = None) -> None:
+		"""Drop the given listings, or every listing for None."""
+		self.invalidations += 1
+		if listings is None:
+			self._cache.invalidate()
+		else:
+			for listing in listings:
+				self._cache.invalidate(listing)
+
+	def stats(self) -> Dict[str, Any]:
+		return {**self._cache.stats(), "invalidations": self.invalidations, "ttls": dict(self.ttls)}
+
+
+def parse_ttls(spec: str) -> Dict[str, float]:
+	"""Parse per-listing TTL overrides given as ``listing=seconds,listing=seconds``."""
+	ttls: Dict[str, float] = {}
+	for item in spec.split(","):
+		name, _, value = item.partition("=")
+		try:
+			ttls[name.strip()] = float(value)
+		except ValueError:
+			continue
+	return {name: ttl for name, ttl in ttls.items() if name}
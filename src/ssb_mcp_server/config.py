@@ -35,7 +35,67 @@ class ServerConfig:
 	ca_bundle: Optional[str] = os.getenv("KNOX_CA_BUNDLE")
 	timeout_seconds: int = int(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
 	max_retries: int = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+	retry_budget_seconds: float = float(os.getenv("HTTP_RETRY_BUDGET_SECONDS", "60"))
+	breaker_failure_threshold: int = int(os.getenv("HTTP_BREAKER_FAILURE_THRESHOLD", "5"))
+	breaker_reset_seconds: float = float(os.getenv("HTTP_BREAKER_RESET_SECONDS", "30"))
 	rate_limit_rps: float = float(os.getenv("HTTP_RATE_LIMIT_RPS", "5"))
+	# Optional per-class overrides; default to HTTP_RATE_LIMIT_RPS
+	rate_limit_write_rps: Optional[float] = float(os.getenv("HTTP_RATE_LIMIT_WRITE_RPS")) if os.getenv("HTTP_RATE_LIMIT_WRITE_RPS") else None
+	rate_limit_execute_rps: Optional[float] = float(os.getenv("HTTP_RATE_LIMIT_EXECUTE_RPS")) if os.getenv("HTTP_RATE_LIMIT_EXECUTE_RPS") else None
+	rate_limit_burst: Optional[float] = float(os.getenv("HTTP_RATE_LIMIT_BURST")) if os.getenv("HTTP_RATE_LIMIT_BURST") else None
+	max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+
+	# Client-side caching
+	jobs_cache_ttl_seconds: float = float(os.getenv("SSB_JOBS_CACHE_TTL_SECONDS", "5"))
+	# Per-listing overrides for catalog metadata, e.g. "ddl/connectors=600,tables=10"
+	catalog_cache_ttls_csv: str = os.getenv("SSB_CATALOG_CACHE_TTLS", "")
+	# SHOW CATALOGS / SHOW TABLES results kept by the SQL session until DDL invalidates them
+	sql_metadata_ttl_seconds: float = float(os.getenv("SSB_SQL_METADATA_TTL_SECONDS", "60"))
+	# Parsed DESCRIBE results; DDL touching a table drops its entry
+	schema_cache_ttl_seconds: float = float(os.getenv("SSB_SCHEMA_CACHE_TTL_SECONDS", "600"))
+	# sql/analyze results memoized by SQL fingerprint
+	analyze_cache_ttl_seconds: float = float(os.getenv("SSB_ANALYZE_CACHE_TTL_SECONDS", "300"))
+	analyze_cache_size: int = int(os.getenv("SSB_ANALYZE_CACHE_SIZE", "256"))
+	# Structural SQL check before execute_query/execute_job/create_stream/restart_job_with_sampling
+	sql_prevalidate: bool = os.getenv("SSB_SQL_PREVALIDATE", "true").lower() == "true"
+	# Repeated execute_query submissions within this window return the running job; 0 disables
+	dedup_window_seconds: float = float(os.getenv("SSB_DEDUP_WINDOW_SECONDS", "300"))
+
+	# Sample fan-out for list_jobs_with_samples
+	sample_fanout_workers: int = int(os.getenv("SSB_SAMPLE_FANOUT_WORKERS", "8"))
+	sample_fanout_deadline_seconds: float = float(os.getenv("SSB_SAMPLE_FANOUT_DEADLINE_SECONDS", "10"))
+	sample_fanout_keep_seconds: float = float(os.getenv("SSB_SAMPLE_FANOUT_KEEP_SECONDS", "30"))
+	sample_count_max_bytes: int = int(os.getenv("SSB_SAMPLE_COUNT_MAX_BYTES", "1048576"))
+
+	# Concurrent DDL statements for register_kafka_tables
+	ddl_concurrency: int = int(os.getenv("SSB_DDL_CONCURRENCY", "4"))
+
+	# Incremental sample tailing
+	sample_tail_max_records: int = int(os.getenv("SSB_SAMPLE_TAIL_MAX_RECORDS", "1000"))
+	sample_tail_max_samples: int = int(os.getenv("SSB_SAMPLE_TAIL_MAX_SAMPLES", "64"))
+
+	# Sample ring buffers filled by background polling of subscribed samples
+	sample_buffer_max_records: int = int(os.getenv("SSB_SAMPLE_BUFFER_MAX_RECORDS", "5000"))
+	sample_buffer_max_bytes: int = int(os.getenv("SSB_SAMPLE_BUFFER_MAX_BYTES", str(4 * 1024 * 1024)))
+	sample_buffer_compress: bool = os.getenv("SSB_SAMPLE_BUFFER_COMPRESS", "true").lower() == "true"
+	sample_buffer_max_samples: int = int(os.getenv("SSB_SAMPLE_BUFFER_MAX_SAMPLES", "16"))
+	sample_subscription_idle_seconds: float = float(os.getenv("SSB_SAMPLE_SUBSCRIPTION_IDLE_SECONDS", "600"))
+
+	# Local SQL over captured samples
+	local_sql_max_rows: int = int(os.getenv("SSB_LOCAL_SQL_MAX_ROWS", "500"))
+
+	# Large samples written to local files instead of being returned inline
+	sample_spill_threshold: int = int(os.getenv("SSB_SAMPLE_SPILL_THRESHOLD", "1000"))
+	sample_spill_dir: Optional[str] = os.getenv("SSB_SAMPLE_SPILL_DIR")
+	sample_spill_max_files: int = int(os.getenv("SSB_SAMPLE_SPILL_MAX_FILES", "32"))
+
+	# Paged list responses
+	default_page_size: int = int(os.getenv("SSB_DEFAULT_PAGE_SIZE", "200"))
+	page_cache_ttl_seconds: float = float(os.getenv("SSB_PAGE_CACHE_TTL_SECONDS", "300"))
+
+	# Response size budget (bytes of serialized JSON); 0 disables shaping
+	response_max_bytes: int = int(os.getenv("SSB_RESPONSE_MAX_BYTES", "100000"))
+	response_budgets_csv: str = os.getenv("SSB_RESPONSE_BUDGETS", "")
 
 	# Behavior
 	readonly: bool = os.getenv("SSB_READONLY", "true").lower() == "true"
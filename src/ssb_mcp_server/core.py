@@ -0,0 +1,1654 @@
+"""SSB client logic shared by SSBClient and AsyncSSBClient, independent of the HTTP library.
+
+Operations are written once as generators that yield the I/O they need (a request,
+a sleep, CPU work to offload, a coalesced or concurrent sub-operation) and receive
+its result back. Each client supplies only the driver that performs those steps,
+with requests in threads or httpx on the event loop.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generator, Hashable, Optional, List, Tuple, TypeVar
+
+from .breaker import CircuitBreakerRegistry
+from .cache import CatalogCache, CatalogListing, JobsSnapshot, TTLCache
+from .idempotency import FINISHED_JOB_STATES, SubmissionTable, submission_key, unique_job_name
+from .localsql import LocalSampleEngine
+from .ratelimit import RateLimiter
+from .retry import IDEMPOTENT_METHODS, RetryPolicy, connection_never_established, parse_retry_after
+from .sampling import SampleBufferStore, SampleTailer, record_digest
+from .sketches import SampleSketches
+from .spill import SampleSpillStore
+from .sqlcheck import check_sql
+from .sqlsession import DEFAULT_NAMESPACE, SqlSession, quote_name, split_name, statement_kind
+from .summary import summarize_records
+from .singleflight import request_key
+
+
+T = TypeVar("T")
+# A generator of I/O steps that finishes with the operation's result
+Steps = Generator[Any, Any, T]
+
+
+logger = logging.getLogger(__name__)
+
+
+class SSBError(Exception):
+	pass
+
+
+# ============================================================================
+# SHARED REQUEST/RESPONSE HELPERS
+# ============================================================================
+
+def _error_message(status_code: int, body: Any, text: str) -> str:
+	"""Extract the most useful error message from an SSB error response."""
+	if isinstance(body, dict):
+		return body.get('error_message', f'HTTP {status_code} Error')
+	return f'HTTP {status_code} Error: {text}'
+
+
+def _ensure_semicolon(sql_query: str) -> str:
+	"""Ensure SQL statement ends with semicolon."""
+	sql_query = sql_query.strip()
+	if not sql_query.endswith(';'):
+		sql_query += ';'
+	return sql_query
+
+
+def _execute_payload(sql_query: str, sample_interval: int, sample_count: int, window_size: int, sample_all_messages: bool) -> Dict[str, Any]:
+	"""Build the sql/execute request body including the sampling job configuration."""
+	data = {"sql": _ensure_semicolon(sql_query)}
+	
+	# Add job configuration for sampling
+	if sample_all_messages:
+		# For sample all messages, use very frequent sampling
+		data["job_config"] = {
+			"job_name": unique_job_name(),
+			"runtime_config": {
+				"execution_mode": "SESSION",
+				"parallelism": 1,
+				"sample_interval": 0,  # Sample immediately
+				"sample_count": 10000,  # High count
+				"window_size": 10000,   # Large window
+				"start_with_savepoint": False
+			}
+		}
+	elif sample_interval != 1000 or sample_count != 100 or window_size != 100:
+		# Custom sampling configuration
+		data["job_config"] = {
+			"job_name": unique_job_name(),
+			"runtime_config": {
+				"execution_mode": "SESSION",
+				"parallelism": 1,
+				"sample_interval": sample_interval,
+				"sample_count": sample_count,
+				"window_size": window_size,
+				"start_with_savepoint": False
+			}
+		}
+	# Default sampling sends no job_config, leaving SSB's own defaults in place
+	return data
+
+
+def _decorate_execute_response(response: Dict[str, Any], sample_all_messages: bool) -> Dict[str, Any]:
+	"""Enhance the sql/execute response with more context."""
+	if response.get("deduplicated"):
+		response["message"] = (f"An identical query is already running as job {response.get('job_id')}; returning it instead of "
+		                       f"starting another. Pass allow_duplicate=True to start a new job.")
+		response["status"] = "success"
+	elif response.get("type") == "job":
+		response["message"] = f"SQL query executed successfully! A new SSB job has been created."
+		response["job_url"] = f"http://localhost:8081/#/job/{response.get('flink_job_id', 'unknown')}"
+		response["status"] = "success"
+		if sample_all_messages:
+			response["sampling_mode"] = "sample_all_messages"
+			response["sample_interval"] = 0
+			response["sample_count"] = 10000
+			response["window_size"] = 10000
+	else:
+		response["status"] = "completed"
+	return response
+
+
+def _deduplicated_response(previous: Dict[str, Any], job: Dict[str, Any]) -> Dict[str, Any]:
+	"""The sql/execute response of an earlier submission, updated from the job it created."""
+	return {
+		**previous,
+		"type": "job",
+		"job_id": job.get("job_id"),
+		"job_name": job.get("name"),
+		"state": job.get("state"),
+		"sample_id": job.get("sample_id", previous.get("sample_id")),
+		"flink_job_id": job.get("flink_job_id", previous.get("flink_job_id")),
+		"deduplicated": True,
+	}
+
+
+def _decorate_sampling_response(response: Dict[str, Any], sample_interval: int, sample_count: int, window_size: int, sample_all_messages: bool) -> Dict[str, Any]:
+	"""Add sampling information to an execute response."""
+	if response.get("type") == "job":
+		response["sampling_configured"] = True
+		response["sample_interval"] = 0 if sample_all_messages else sample_interval
+		response["sample_count"] = 10000 if sample_all_messages else sample_count
+		response["window_size"] = 10000 if sample_all_messages else window_size
+		response["sample_all_messages"] = sample_all_messages
+	return response
+
+
+def _decorate_restart_response(response: Dict[str, Any], job_id: int, sample_all_messages: bool) -> Dict[str, Any]:
+	"""Add information about the restart."""
+	response["restarted_from_job_id"] = job_id
+	response["message"] = f"Job {job_id} restarted with new configuration"
+	if sample_all_messages:
+		response["message"] += " (sampling all messages)"
+	return response
+
+
+def _decorate_sample_response(response: Dict[str, Any]) -> Dict[str, Any]:
+	"""Add helpful context to a samples/{id} response."""
+	if response.get("records"):
+		response["message"] = f"Retrieved {len(response['records'])} sample records"
+	else:
+		response["message"] = "No sample data available yet. The job may still be processing or hasn't produced data."
+	return response
+
+
+def _spilled_sample_response(response: Dict[str, Any], spill: Dict[str, Any]) -> Dict[str, Any]:
+	"""Replace the records of a large samples/{id} response with the descriptor of their spill file."""
+	result = {k: v for k, v in response.items() if k != "records"}
+	result["spill"] = spill
+	result["message"] = (
+		f"Sample has {spill['row_count']} records; they were written to {spill['path']}. "
+		f"Page through them with read_sample_spill(spill_id='{spill['spill_id']}')"
+	)
+	return result
+
+
+def _sampling_payload(sample_interval: int, sample_count: int, window_size: int, sample_all_messages: bool) -> Dict[str, Any]:
+	"""Build the samples/{id}/configure request body."""
+	data = {
+		"position": "latest",  # Start from latest data
+		"sample_interval": sample_interval,
+		"sample_count": sample_count,
+		"window_size": window_size
+	}
+	
+	# If sampling all messages, set interval to 0 and high count
+	if sample_all_messages:
+		data["sample_interval"] = 0
+		data["sample_count"] = 10000  # High count to capture all messages
+		data["window_size"] = 10000
+	return data
+
+
+def _job_summary(job: Dict[str, Any]) -> Dict[str, Any]:
+	"""Project a job from the jobs listing onto the fields used by list_jobs_with_samples."""
+	return {
+		"job_id": job.get("job_id"),
+		"name": job.get("name"),
+		"state": job.get("state"),
+		"sample_id": job.get("sample_id"),
+		"created_at": job.get("created_at"),
+		"flink_job_id": job.get("flink_job_id")
+	}
+
+
+def _apply_sample_info(job_info: Dict[str, Any], sample_data: Optional[Dict[str, Any]], include_records: bool) -> Dict[str, Any]:
+	"""Fill in the sample fields of a job summary; None means the sample did not arrive in time."""
+	if not job_info.get("sample_id"):
+		job_info["sample_records_count"] = 0
+		job_info["sample_status"] = "no_sample_id"
+	elif sample_data is None:
+		job_info["sample_records_count"] = None
+		job_info["sample_status"] = "pending"
+	else:
+		records = sample_data.get("records", [])
+		spill = sample_data.get("spill")
+		if spill:
+			job_info["sample_records_count"] = spill["row_count"]
+		else:
+			job_info["sample_records_count"] = sample_data.get("record_count", len(records))
+		job_info["sample_status"] = sample_data.get("job_status", "unknown")
+		if include_records:
+			job_info["sample_records"] = records
+	return job_info
+
+
+def _jobs_with_samples_result(job_list: List[Dict[str, Any]], keep_seconds: float) -> Dict[str, Any]:
+	pending = len([j for j in job_list if j["sample_status"] == "pending"])
+	result = {
+		"jobs": job_list,
+		"total_jobs": len(job_list),
+		"running_jobs": len([j for j in job_list if j["state"] == "RUNNING"]),
+		"message": f"Found {len(job_list)} jobs with sample information"
+	}
+	if pending:
+		result["pending_samples"] = pending
+		result["message"] += (f" ({pending} samples still pending; samples fetched so far are kept for {keep_seconds:g}s, "
+		                       f"so calling again continues with the rest)")
+	return result
+
+
+def _kafka_data_source(table_name: str, topic: str, kafka_connector_type: str, bootstrap_servers: str, format_type: str,
+                       scan_startup_mode: str, additional_properties: Optional[Dict[str, str]]) -> Dict[str, Any]:
+	"""Build the data-sources request body for a local-kafka table."""
+	# Enforce that only local-kafka connector is used
+	if kafka_connector_type != "local-kafka":
+		raise SSBError(f"Only 'local-kafka' connector is allowed for virtual tables. Provided: '{kafka_connector_type}'")
+	
+	# Build properties for the data source
+	properties = {
+		"connector": kafka_connector_type,
+		"topic": topic,
+		"properties.bootstrap.servers": bootstrap_servers,
+		"scan.startup.mode": scan_startup_mode
+	}
+	
+	# Add format configuration
+	if format_type.lower() == "json":
+		properties["format"] = "json"
+	elif format_type.lower() == "csv":
+		properties["format"] = "csv"
+	elif format_type.lower() == "avro":
+		properties["format"] = "avro"
+	else:
+		properties["format"] = format_type
+	
+	# Add any additional properties
+	if additional_properties:
+		properties.update(additional_properties)
+	
+	return {
+		"name": table_name,
+		"type": kafka_connector_type,
+		"properties": properties
+	}
+
+
+def _kafka_connector_validation(kafka_connector_type: str, kafka_connector: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+	"""Validate a connector type against its ddl/connectors entry, if any."""
+	if kafka_connector:
+		return {
+			"valid": True,
+			"message": f"Connector '{kafka_connector_type}' is a valid Kafka connector",
+			"connector_type": kafka_connector_type,
+			"properties": kafka_connector.get("properties", []),
+			"supported_formats": kafka_connector.get("supported_formats", [])
+		}
+	return {
+		"valid": False,
+		"message": f"Kafka connector '{kafka_connector_type}' not found in available connectors"
+	}
+
+
+def _kafka_table_name(table_name: str, use_ssb_prefix: bool) -> str:
+	"""Add ssb_ prefix if requested and not already present."""
+	if use_ssb_prefix and not table_name.startswith('ssb_'):
+		return f"ssb_{table_name}"
+	return table_name
+
+
+def _kafka_table_ddl(full_table_name: str, topic: str, schema_fields: Optional[List[Dict[str, str]]], catalog: str, database: str) -> str:
+	"""Build the CREATE TABLE statement for a Kafka-backed Flink table."""
+	# Default schema for NVDA-like data if not provided
+	if schema_fields is None:
+		schema_fields = [
+			{"name": "___open", "type": "VARCHAR(2147483647)"},
+			{"name": "___high", "type": "VARCHAR(2147483647)"},
+			{"name": "___low", "type": "VARCHAR(2147483647)"},
+			{"name": "___close", "type": "VARCHAR(2147483647)"},
+			{"name": "___volume", "type": "VARCHAR(2147483647)"},
+			{"name": "eventTimestamp", "type": "TIMESTAMP(3) WITH LOCAL TIME ZONE METADATA FROM 'timestamp'"}
+		]
+	
+	# Build the DDL statement using the specified template
+	columns = []
+	for field in schema_fields:
+		field_name = field.get("name", "unknown")
+		field_type = field.get("type", "VARCHAR(2147483647)")
+		columns.append(f"  `{field_name}` {field_type}")
+	
+	# Add watermark for eventTimestamp if it exists
+	watermark_clause = ""
+	has_event_timestamp = any(field.get("name") == "eventTimestamp" for field in schema_fields)
+	if has_event_timestamp:
+		watermark_clause = ",\n  WATERMARK FOR `eventTimestamp` AS `eventTimestamp` - INTERVAL '3' SECOND"
+	
+	return f"""CREATE TABLE `{catalog}`.`{database}`.`{full_table_name}` (
+{',\n'.join(columns)}{watermark_clause}
+) WITH (
+  'scan.startup.mode' = 'earliest-offset',
+  'properties.request.timeout.ms' = '120000',
+  'properties.auto.offset.reset' = 'earliest',
+  'format' = 'json',
+  'properties.bootstrap.servers' = 'kafka:9092',
+  'connector' = 'kafka',
+  'properties.transaction.timeout.ms' = '900000',
+  'topic' = '{topic}'
+);"""
+
+
+def _catalog_names(result: Dict[str, Any]) -> List[str]:
+	"""Extract catalog names from a SHOW CATALOGS result."""
+	if result.get("table_data"):
+		return [cat.get("catalog name", "") for cat in result["table_data"]["data"]]
+	return []
+
+
+def _current_name(result: Dict[str, Any]) -> Optional[str]:
+	"""Extract the single value of a SHOW CURRENT CATALOG/DATABASE result."""
+	rows = (result.get("table_data") or {}).get("data") or []
+	if rows and isinstance(rows[0], dict) and rows[0]:
+		return str(next(iter(rows[0].values())))
+	return None
+
+
+def _describe_columns(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+	"""Compact column list from a DESCRIBE result (name, type, nullable, plus key/extras/watermark when set)."""
+	columns: List[Dict[str, Any]] = []
+	rows = (result.get("table_data") or {}).get("data") or []
+	for row in rows:
+		if not isinstance(row, dict):
+			continue
+		column: Dict[str, Any] = {"name": row.get("name", row.get("column name")), "type": row.get("type", row.get("data type"))}
+		if "null" in row:
+			column["nullable"] = row["null"] in (True, "true", "TRUE")
+		for key in ("key", "extras", "watermark"):
+			if row.get(key) not in (None, ""):
+				column[key] = row[key]
+		columns.append(column)
+	return columns
+
+
+def _has_table(result: Dict[str, Any], table_name: str) -> bool:
+	"""Check whether a SHOW TABLES result lists the given table."""
+	if result.get("table_data"):
+		for table in result["table_data"]["data"]:
+			if table.get("table name") == table_name:
+				return True
+	return False
+
+
+def _decorate_register_response(response: Dict[str, Any], table_name: str, full_table_name: str, topic: str, catalog: str,
+                                database: str, table_available: bool, ddl_sql: str, use_ssb_prefix: bool) -> Dict[str, Any]:
+	response["message"] = f"Table '{full_table_name}' registered in Flink catalog successfully using template"
+	response["table_name"] = full_table_name
+	response["original_name"] = table_name
+	response["topic"] = topic
+	response["connector"] = "kafka"
+	response["catalog"] = catalog
+	response["database"] = database
+	response["full_namespace"] = f"{catalog}.{database}"
+	response["available_for_querying"] = table_available
+	response["ddl_used"] = ddl_sql
+	response["ssb_prefix_applied"] = use_ssb_prefix and not table_name.startswith('ssb_')
+	response["template_used"] = "ssb.ssb_default template with watermark and kafka connector"
+	return response
+
+
+
+def _register_entries(tables: List[Dict[str, Any]], use_ssb_prefix: bool) -> List[Dict[str, Any]]:
+	"""One result entry per bulk registration spec; invalid and duplicate specs are failed up front."""
+	entries: List[Dict[str, Any]] = []
+	seen = set()
+	for spec in tables:
+		topic = spec.get("topic")
+		table_name = spec.get("table_name") or topic
+		entry: Dict[str, Any] = {"table_name": None, "original_name": table_name, "topic": topic, "status": "pending"}
+		if not topic:
+			entry.update(status="failed", error="Each table needs a 'topic'")
+		else:
+			entry["table_name"] = _kafka_table_name(table_name, use_ssb_prefix)
+			if entry["table_name"] in seen:
+				entry.update(status="failed", error=f"Table '{entry['table_name']}' appears more than once in this request")
+			seen.add(entry["table_name"])
+		entries.append(entry)
+	return entries
+
+
+def _bulk_register_result(entries: List[Dict[str, Any]], catalog: str, database: str, available_tables: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+	registered = 0
+	for entry in entries:
+		if entry["status"] == "registered":
+			registered += 1
+			entry["available_for_querying"] = available_tables is not None and _has_table(available_tables, entry["table_name"])
+	return {
+		"message": f"Registered {registered} of {len(entries)} Kafka tables in {catalog}.{database}",
+		"catalog": catalog,
+		"database": database,
+		"full_namespace": f"{catalog}.{database}",
+		"registered": registered,
+		"failed": len(entries) - registered,
+		"verified": available_tables is not None,
+		"tables": entries,
+	}
+
+# Writes under these paths can add, remove or change jobs; sql/execute is classified per statement
+_JOB_WRITE_PREFIXES = ("jobs", "streams")
+# Writes under these paths can change what a statement resolves to
+_CATALOG_WRITE_PREFIXES = ("tables", "data-sources", "udfs", "ddl")
+# POSTs that only check, analyze or run something and change no cached state
+_READ_ONLY_POSTS = ("data-sources/validate", "sql/analyze", "sync/config/validate", "udfs/run")
+
+
+def _changes_state(method: str, path: str) -> bool:
+	"""Whether a request can change state the client caches."""
+	if method == "GET":
+		return False
+	path = path.lstrip("/")
+	return method != "POST" or not any(path == p or path.startswith(p + "/") for p in _READ_ONLY_POSTS)
+
+
+def _as_dict(result: Any, key: str) -> Dict[str, Any]:
+	"""Handle both list and dict responses."""
+	if isinstance(result, list):
+		return {key: result}
+	return result
+
+
+# ============================================================================
+# I/O STEPS (yielded by operations, performed by each client's driver)
+# ============================================================================
+
+@dataclass
+class Send:
+	"""Send one HTTP request; the driver returns the raw response or raises its transport error."""
+	method: str
+	path: str
+	params: Optional[Dict[str, Any]] = None
+	data: Optional[Dict[str, Any]] = None
+	json_data: Optional[Dict[str, Any]] = None
+	# Read the body only up to this many bytes; the driver then returns a CappedResponse
+	max_bytes: Optional[int] = None
+
+
+@dataclass
+class CappedResponse:
+	"""A response whose body was read only up to Send.max_bytes; ``content`` is None past the cap."""
+	status_code: int
+	headers: Any
+	content: Optional[bytes]
+
+
+@dataclass
+class Sleep:
+	seconds: float
+
+
+@dataclass
+class Offload:
+	"""Run CPU-bound work; the async driver moves it off the event loop."""
+	func: Callable[..., Any]
+	args: Tuple[Any, ...] = ()
+
+
+@dataclass
+class Shared:
+	"""Run sub-steps through a single-flight group, so concurrent identical calls share one outcome."""
+	flight: Any
+	key: Hashable
+	steps: Callable[[], Steps[Any]]
+
+
+@dataclass
+class Gather:
+	"""Run sub-steps concurrently, at most ``limit`` at a time.
+
+	Each call handles its own errors and stores its own result. Calls still running when
+	the deadline passes are abandoned and the step returns without them.
+	"""
+	calls: List[Callable[[], Steps[Any]]]
+	limit: int
+	deadline: Optional[float] = None
+
+
+def operation(func: Callable[..., Any]) -> Callable[..., Any]:
+	"""Mark a method of SSBClientCore as a client operation, exposed through each client's driver."""
+	func.is_operation = True
+	return func
+
+
+
+class SSBClientCore:
+	"""State and operations shared by SSBClient and AsyncSSBClient.
+
+	Subclasses supply the transport: ``_drive`` performs the yielded steps, ``_bind``
+	exposes each operation as a plain or awaitable method, and a few hooks describe the
+	HTTP library's errors and responses. Operations that call other operations name
+	them on SSBClientCore, since the subclass replaces them with driven wrappers.
+	"""
+
+	# Exceptions the HTTP library raises when a request gets no response
+	_transport_errors: Tuple[type, ...] = ()
+	# SingleFlight for threads, AsyncSingleFlight for the event loop
+	_single_flight_type: Callable[[], Any]
+
+	def __init_subclass__(cls, **kwargs: Any) -> None:
+		super().__init_subclass__(**kwargs)
+		for name, member in vars(SSBClientCore).items():
+			if getattr(member, "is_operation", False):
+				setattr(cls, name, cls._bind(member))
+
+	def __init__(self, base_url: str, timeout_seconds: int = 30, proxy_context_path: Optional[str] = None,
+	             rate_limiter: Optional[RateLimiter] = None, retry_policy: Optional[RetryPolicy] = None,
+	             circuit_breakers: Optional[CircuitBreakerRegistry] = None, jobs_cache_ttl: float = 5.0,
+	             sample_fanout_workers: int = 8, sample_fanout_deadline: float = 10.0, ddl_concurrency: int = 4,
+	             sample_tailer: Optional[SampleTailer] = None, sample_buffers: Optional[SampleBufferStore] = None,
+	             sample_sketches: Optional[SampleSketches] = None, local_sql: Optional[LocalSampleEngine] = None,
+	             sample_spills: Optional[SampleSpillStore] = None, catalog_cache: Optional[CatalogCache] = None,
+	             sql_session: Optional[SqlSession] = None, sql_prevalidate: bool = True,
+	             submissions: Optional[SubmissionTable] = None, sample_fanout_keep_seconds: float = 30.0,
+	             sample_count_max_bytes: int = 1048576):
+		self.base_url = base_url.rstrip("/")
+		self.timeout = timeout_seconds
+		self.proxy_context_path = proxy_context_path
+		self.rate_limiter = rate_limiter
+		self.retry_policy = retry_policy or RetryPolicy()
+		self.circuit_breakers = circuit_breakers
+		self.jobs_cache = TTLCache(jobs_cache_ttl, max_entries=1)
+		self._inflight = self._single_flight_type()
+		self.sample_fanout_workers = sample_fanout_workers
+		self.sample_fanout_deadline = sample_fanout_deadline
+		# Samples fetched for list_jobs_with_samples, kept so a repeat call only fetches the rest
+		self.fanout_samples = TTLCache(sample_fanout_keep_seconds, max_entries=1024)
+		self.sample_count_max_bytes = sample_count_max_bytes
+		self.ddl_concurrency = ddl_concurrency
+		self.sample_tailer = sample_tailer or SampleTailer()
+		self.sample_buffers = sample_buffers or SampleBufferStore()
+		self.sample_sketches = sample_sketches or SampleSketches()
+		self.local_sql = local_sql or LocalSampleEngine()
+		self.sample_spills = sample_spills or SampleSpillStore()
+		self.catalog_cache = catalog_cache or CatalogCache()
+		self.sql_session = sql_session or SqlSession()
+		self.sql_prevalidate = sql_prevalidate
+		self.submissions = submissions or SubmissionTable()
+		self._submitting = self._single_flight_type()
+
+	# ------------------------------------------------------------------------
+	# Transport hooks, implemented by each client
+	# ------------------------------------------------------------------------
+
+	@staticmethod
+	def _bind(steps: Callable[..., Any]) -> Callable[..., Any]:
+		raise NotImplementedError
+
+	@staticmethod
+	def _is_success(resp: Any) -> bool:
+		raise NotImplementedError
+
+	@staticmethod
+	def _status_error(message: str, resp: Any) -> Exception:
+		"""The HTTP library's own error for an authentication failure."""
+		raise NotImplementedError
+
+	# ------------------------------------------------------------------------
+	# Requests
+	# ------------------------------------------------------------------------
+
+	def _url(self, path: str) -> str:
+		return f"{self.base_url}/{path.lstrip('/')}"
+
+	@staticmethod
+	def _error_message(resp: Any) -> str:
+		# Try to get detailed error message from response
+		try:
+			body = resp.json()
+		except ValueError:
+			body = None
+		return _error_message(resp.status_code, body, resp.text)
+
+	def _request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None, data: Optional[Dict[str, Any]] = None,
+	             json_data: Optional[Dict[str, Any]] = None, idempotent: Optional[bool] = None) -> Steps[Any]:
+		"""Send a request and decode the response, invalidating cached state the request may have changed."""
+		try:
+			resp = yield from self._send(method, path, params, data, json_data, idempotent)
+		finally:
+			if _changes_state(method, path):
+				self._invalidate_caches(path)
+		return self._handle_response(method, path, resp)
+
+	def _send(self, method: str, path: str, params: Optional[Dict[str, Any]], data: Optional[Dict[str, Any]],
+	          json_data: Optional[Dict[str, Any]], idempotent: Optional[bool], max_bytes: Optional[int] = None) -> Steps[Any]:
+		"""Send a request through the circuit breaker and retry policy."""
+		if self.circuit_breakers is None:
+			return (yield from self._send_with_retries(method, path, params, data, json_data, idempotent, max_bytes))
+
+		circuit = self.circuit_breakers.get(self.base_url, path)
+		circuit.before_call()
+		try:
+			resp = yield from self._send_with_retries(method, path, params, data, json_data, idempotent, max_bytes)
+		except self._transport_errors:
+			circuit.record_failure()
+			raise
+		except BaseException:
+			circuit.release()
+			raise
+		if resp.status_code >= 500:
+			circuit.record_failure()
+		else:
+			circuit.record_success()
+		return resp
+
+	def _send_with_retries(self, method: str, path: str, params: Optional[Dict[str, Any]], data: Optional[Dict[str, Any]],
+	                       json_data: Optional[Dict[str, Any]], idempotent: Optional[bool], max_bytes: Optional[int] = None) -> Steps[Any]:
+		"""Send a request, retrying only when it is both transient and safe to replay."""
+		if idempotent is None:
+			idempotent = method in IDEMPOTENT_METHODS
+		state = self.retry_policy.begin()
+		while True:
+			if self.rate_limiter:
+				wait = self.rate_limiter.reserve(method, path)
+				if wait > 0:
+					yield Sleep(wait)
+			try:
+				resp = yield Send(method, path, params, data, json_data, max_bytes)
+			except self._transport_errors as e:
+				# A connect failure means nothing reached the server, so any method may be replayed
+				delay = state.next_delay(idempotent or connection_never_established(e))
+				if delay is None:
+					raise
+				yield Sleep(delay)
+				continue
+
+			if self.retry_policy.should_retry_status(resp.status_code, idempotent):
+				delay = state.next_delay(True, parse_retry_after(resp.headers.get("Retry-After")))
+				if delay is not None:
+					yield Sleep(delay)
+					continue
+			return resp
+
+	def _handle_response(self, method: str, path: str, resp: Any) -> Any:
+		if resp.status_code == 401:
+			raise self._status_error("Unauthorized", resp)
+		if resp.status_code == 403:
+			raise self._status_error("Forbidden", resp)
+		if not self._is_success(resp):
+			if method in ("PUT", "DELETE"):
+				resp.raise_for_status()
+			raise SSBError(f"{self._error_message(resp)} for {path}")
+		return resp.json()
+
+	def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Steps[Dict[str, Any]]:
+		# Concurrent identical GETs share one round trip
+		return (yield Shared(self._inflight, request_key("GET", path, params), lambda: self._request("GET", path, params=params)))
+
+	def _post(self, path: str, data: Optional[Dict[str, Any]] = None, json_data: Optional[Dict[str, Any]] = None,
+	          idempotent: bool = False) -> Steps[Dict[str, Any]]:
+		return (yield from self._request("POST", path, data=data, json_data=json_data, idempotent=idempotent))
+
+	def _put(self, path: str, data: Optional[Dict[str, Any]] = None, json_data: Optional[Dict[str, Any]] = None) -> Steps[Dict[str, Any]]:
+		return (yield from self._request("PUT", path, data=data, json_data=json_data))
+
+	def _delete(self, path: str) -> Steps[Dict[str, Any]]:
+		return (yield from self._request("DELETE", path))
+
+	# ------------------------------------------------------------------------
+	# Cached state
+	# ------------------------------------------------------------------------
+
+	def _invalidate_caches(self, path: str) -> None:
+		"""Drop cached state that a write to the given path may have changed."""
+		if path.lstrip("/").startswith(_JOB_WRITE_PREFIXES):
+			self.jobs_cache.invalidate()
+		self.catalog_cache.invalidate_for_write(path)
+		if path.lstrip("/").startswith("environments"):
+			# Environment variables are substituted into SQL, so analyses and schemas may differ
+			self.sql_session.invalidate()
+		elif path.lstrip("/").startswith(_CATALOG_WRITE_PREFIXES):
+			self.sql_session.analyses.invalidate()
+
+	def _invalidate_for_sql(self, sql: str) -> None:
+		"""Drop cached state a sql/execute request may have changed, judged by its statement kind."""
+		kind = statement_kind(sql)
+		if kind in ("job", "ddl", "script"):
+			# CREATE TABLE ... AS SELECT starts a job too
+			self.jobs_cache.invalidate()
+		if kind in ("ddl", "script"):
+			self.catalog_cache.invalidate_listings(CatalogCache.DDL_INVALIDATIONS)
+
+	def _jobs_snapshot(self) -> Steps[JobsSnapshot]:
+		"""Return the indexed `GET jobs` listing, refetching it once the short TTL expires."""
+		snapshot = self.jobs_cache.get("jobs")
+		if snapshot is None:
+			snapshot = JobsSnapshot((yield from self._get("jobs")))
+			self.jobs_cache.set("jobs", snapshot)
+		return snapshot
+
+	def _catalog(self, path: str) -> Steps[CatalogListing]:
+		"""Return an indexed catalog listing, refetching it once its TTL expires or a write invalidates it."""
+		listing = self.catalog_cache.get(path)
+		if listing is None:
+			listing = self.catalog_cache.put(path, (yield from self._get(path)))
+		return listing
+
+	# ------------------------------------------------------------------------
+	# SQL session
+	# ------------------------------------------------------------------------
+
+	def _sql(self, sql: str, idempotent: bool = False) -> Steps[Dict[str, Any]]:
+		"""Run one statement in the SSB SQL session and record its effect on the session."""
+		try:
+			response = yield from self._post("sql/execute", json_data={"sql": sql}, idempotent=idempotent)
+		finally:
+			self._invalidate_for_sql(sql)
+		self.sql_session.observe(sql)
+		return response
+
+	def _prevalidate(self, sql_query: str) -> None:
+		"""Reject malformed SQL locally (raises SqlValidationError) instead of after a round trip."""
+		if self.sql_prevalidate:
+			check_sql(sql_query, self.sql_session.table_exists)
+
+	def _use(self, catalog: str, database: str) -> Steps[None]:
+		if self.sql_session.needs_use(catalog, database):
+			yield from self._sql(f"USE {catalog}.{database};", idempotent=True)
+
+	def _current_namespace(self) -> Steps[Optional[Tuple[str, str]]]:
+		"""The session's catalog and database, asked from SSB once whenever the tracked namespace is unknown."""
+		current = self.sql_session.current
+		if (current is None or current[1] is None) and self.sql_session.show_current is not False:
+			try:
+				catalog = current[0] if current else _current_name((yield from self._sql("SHOW CURRENT CATALOG;", idempotent=True)))
+				database = _current_name((yield from self._sql("SHOW CURRENT DATABASE;", idempotent=True)))
+			except SSBError:
+				self.sql_session.show_current = False
+				return None
+			self.sql_session.show_current = True
+			if catalog and database:
+				self.sql_session.current = (catalog, database)
+		current = self.sql_session.current
+		return (current[0], current[1]) if current and current[1] is not None else None
+
+	def _show_catalogs(self) -> Steps[Dict[str, Any]]:
+		result = self.sql_session.cached(("catalogs",))
+		if result is None:
+			result = yield from self._sql("SHOW CATALOGS;", idempotent=True)
+			self.sql_session.remember(("catalogs",), result)
+		return result
+
+	def _show_tables(self, catalog: str, database: str) -> Steps[Dict[str, Any]]:
+		"""List the tables of a database, without switching the session's namespace when SSB allows it."""
+		key = ("tables", catalog, database)
+		result = self.sql_session.cached(key)
+		if result is not None:
+			return result
+		if self.sql_session.show_tables_from is not False:
+			try:
+				result = yield from self._sql(f"SHOW TABLES FROM `{catalog}`.`{database}`;", idempotent=True)
+				self.sql_session.show_tables_from = True
+			except SSBError:
+				if self.sql_session.show_tables_from:
+					raise
+				# Older Flink versions only list the current database
+				self.sql_session.show_tables_from = False
+		if result is None:
+			previous = (yield from self._current_namespace()) or DEFAULT_NAMESPACE
+			yield from self._use(catalog, database)
+			result = yield from self._sql("SHOW TABLES;", idempotent=True)
+			yield from self._use(*previous)
+		self.sql_session.remember(key, result)
+		return result
+
+	# ------------------------------------------------------------------------
+	# Samples
+	# ------------------------------------------------------------------------
+
+	def _ingest_sample(self, sample_id: str, records: List[Any]) -> None:
+		fresh = self.sample_buffers.append(sample_id, records)
+		self.sample_sketches.update(sample_id, fresh)
+
+	def _capture_sample(self, sample_id: str, records: List[Any]) -> Steps[None]:
+		"""Feed fetched records to the sample's ring buffer and, for records not seen before, its sketches.
+
+		Digesting records and updating sketches is CPU-bound, so it is offloaded; samples
+		that are not tracked are skipped without it.
+		"""
+		if records and self.sample_buffers.version(sample_id) is not None:
+			yield Offload(self._ingest_sample, (sample_id, records))
+
+	@operation
+	def _fetch_sample(self, sample_id: str) -> Steps[Dict[str, Any]]:
+		"""Fetch a sample and capture its records, without decorating or spilling the response."""
+		response = yield from self._get(f"samples/{sample_id}")
+		yield from self._capture_sample(sample_id, response.get("records") or [])
+		return response
+
+	def _count_sample(self, sample_id: str) -> Steps[Dict[str, Any]]:
+		"""Fetch a sample for its record count only; the records are dropped, not captured or kept.
+
+		SSB has no count endpoint, so the body is read up to sample_count_max_bytes and
+		decoded only if it fits. Larger samples are cut off mid-transfer and left uncounted.
+		"""
+		path = f"samples/{sample_id}"
+		resp = yield from self._send("GET", path, None, None, None, None, self.sample_count_max_bytes)
+		if resp.content is None:
+			if resp.status_code >= 400:
+				raise SSBError(f"HTTP {resp.status_code} Error for {path}")
+			return {"job_status": "too_large", "record_count": None}
+		try:
+			body = json.loads(resp.content)
+		except ValueError:
+			body = None
+		if resp.status_code >= 400 or not isinstance(body, dict):
+			raise SSBError(f"{_error_message(resp.status_code, body, resp.content.decode(errors='replace'))} for {path}")
+		count = {k: v for k, v in body.items() if k != "records"}
+		count["record_count"] = len(body.get("records") or [])
+		return count
+
+	@operation
+	def get_client_stats(self) -> Dict[str, Any]:
+		"""Get local client-side statistics such as rate limiter wait times."""
+		return {
+			"rate_limiter": self.rate_limiter.stats() if self.rate_limiter else None,
+			"circuit_breakers": self.circuit_breakers.stats() if self.circuit_breakers else None,
+			"jobs_cache": self.jobs_cache.stats(),
+			"catalog_cache": self.catalog_cache.stats(),
+			"sql_session": self.sql_session.stats(),
+			"submissions": {**self.submissions.stats(), "coalesced": self._submitting.stats()["coalesced"]},
+			"single_flight": self._inflight.stats(),
+			"sample_buffers": self.sample_buffers.stats(),
+			"local_sql": self.local_sql.stats(),
+			"sample_spills": self.sample_spills.stats(),
+		}
+
+	# SSB API Methods
+
+	@operation
+	def get_ssb_info(self) -> Steps[Dict[str, Any]]:
+		"""Get SSB version and system information."""
+		# Use jobs endpoint to get SSB information
+		snapshot = yield from self._jobs_snapshot()
+		return {
+			"status": "connected",
+			"jobs_count": len(snapshot.jobs),
+			"message": "SSB MCP Server connected successfully"
+		}
+
+	@operation
+	def list_streams(self) -> Steps[Dict[str, Any]]:
+		"""List all SQL streams (jobs)."""
+		return (yield from self._jobs_snapshot()).payload
+
+	@operation
+	def get_stream(self, stream_name: str) -> Steps[Dict[str, Any]]:
+		"""Get details of a specific stream (job)."""
+		job = (yield from self._jobs_snapshot()).lookup("name", stream_name)
+		if job is not None:
+			return job
+		raise SSBError(f"Stream '{stream_name}' not found")
+
+	@operation
+	def create_stream(self, stream_name: str, sql_query: str, description: Optional[str] = None) -> Steps[Dict[str, Any]]:
+		"""Create a new SQL stream (job)."""
+		self._prevalidate(sql_query)
+		data = {
+			"sql": sql_query,
+			"job_config": {
+				"job_name": stream_name
+			}
+		}
+		return (yield from self._post("jobs", json_data=data))
+
+	@operation
+	def update_stream(self, stream_name: str, sql_query: str, description: Optional[str] = None) -> Steps[Dict[str, Any]]:
+		"""Update an existing SQL stream."""
+		data = {
+			"name": stream_name,
+			"sql": sql_query,
+			"description": description or ""
+		}
+		return (yield from self._put(f"streams/{stream_name}", json_data=data))
+
+	@operation
+	def delete_stream(self, stream_name: str) -> Steps[Dict[str, Any]]:
+		"""Delete a SQL stream."""
+		return (yield from self._delete(f"streams/{stream_name}"))
+
+	@operation
+	def start_stream(self, stream_name: str) -> Steps[Dict[str, Any]]:
+		"""Start a SQL stream."""
+		return (yield from self._post(f"streams/{stream_name}/start"))
+
+	@operation
+	def stop_stream(self, stream_name: str) -> Steps[Dict[str, Any]]:
+		"""Stop a SQL stream."""
+		return (yield from self._post(f"streams/{stream_name}/stop"))
+
+	@operation
+	def get_stream_status(self, stream_name: str) -> Steps[Dict[str, Any]]:
+		"""Get the status of a SQL stream."""
+		return (yield from self._get(f"streams/{stream_name}/status"))
+
+	@operation
+	def get_stream_metrics(self, stream_name: str) -> Steps[Dict[str, Any]]:
+		"""Get metrics for a SQL stream."""
+		return (yield from self._get(f"streams/{stream_name}/metrics"))
+
+	@operation
+	def list_tables(self) -> Steps[Dict[str, Any]]:
+		"""List all available tables."""
+		# Use tables endpoint for SSB
+		return (yield from self._catalog("tables")).payload
+
+	@operation
+	def get_table_schema(self, table_name: str) -> Steps[Dict[str, Any]]:
+		"""Get the columns of a table via DESCRIBE, cached until DDL sent through this client touches the table.
+
+		Unqualified names resolve in the session's namespace, asked from SSB when it is not
+		tracked yet. If it cannot be learned, the name is described as given and not cached.
+		"""
+		if len(split_name(table_name)) < 3:
+			yield from self._current_namespace()
+		qualified = self.sql_session.qualify(table_name)
+		columns = self.sql_session.schemas.get(qualified) if qualified else None
+		cached = columns is not None
+		if not cached:
+			name = qualified or ".".join(split_name(table_name))
+			columns = _describe_columns((yield from self._sql(f"DESCRIBE {quote_name(name)};", idempotent=True)))
+			if columns and qualified:
+				self.sql_session.schemas.set(qualified, columns)
+		return {"table_name": table_name, "qualified_name": qualified, "columns": columns, "column_count": len(columns), "cached": cached}
+
+	@operation
+	def execute_query(self, sql_query: str, limit: Optional[int] = None, sample_interval: int = 1000, sample_count: int = 100, window_size: int = 100, sample_all_messages: bool = False,
+	                  allow_duplicate: bool = False) -> Steps[Dict[str, Any]]:
+		"""Execute a SQL query.
+
+		Repeating a query (same SQL fingerprint, job config and namespace) while the job it
+		created is still running returns that job instead of starting another, unless
+		allow_duplicate is set.
+		"""
+		self._prevalidate(sql_query)
+		data = _execute_payload(sql_query, sample_interval, sample_count, window_size, sample_all_messages)
+		if allow_duplicate:
+			return (yield from self._submit_query(None, data, sample_all_messages))
+		key = submission_key(data, self.sql_session.current)
+		return (yield Shared(self._submitting, key, lambda: self._submit_query(key, data, sample_all_messages)))
+
+	def _submit_query(self, key: Optional[str], data: Dict[str, Any], sample_all_messages: bool) -> Steps[Dict[str, Any]]:
+		if key is not None:
+			previous = yield from self._running_submission(key)
+			if previous is not None:
+				return _decorate_execute_response(previous, sample_all_messages)
+			self.submissions.begin(key, (data.get("job_config") or {}).get("job_name"))
+		try:
+			response = yield from self._post("sql/execute", json_data=data)
+		except self._transport_errors:
+			# The job may have been created anyway; keep the record so a repeat can find it by name
+			raise
+		except Exception:
+			if key is not None:
+				self.submissions.forget(key)
+			raise
+		finally:
+			self._invalidate_for_sql(data["sql"])
+		self.sql_session.observe(data["sql"])
+		if key is not None:
+			if isinstance(response, dict) and response.get("type") == "job":
+				self.submissions.complete(key, response)
+			else:
+				self.submissions.forget(key)
+		return _decorate_execute_response(response, sample_all_messages)
+
+	def _running_submission(self, key: str) -> Steps[Optional[Dict[str, Any]]]:
+		"""The earlier response for a submission whose job is still running, if any."""
+		submission = self.submissions.lookup(key)
+		if submission is None:
+			return None
+		previous = submission["response"] or {}
+		if previous.get("job_id") is None and submission["job_name"] is None:
+			# The first attempt got no answer and SSB named its job, so it cannot be found again
+			self.submissions.forget(key)
+			return None
+		if previous.get("job_id") is not None:
+			job = (yield from self._jobs_snapshot()).lookup("job_id", previous["job_id"])
+		else:
+			# The first attempt got no answer; look for the job under the name it was submitted with
+			self.jobs_cache.invalidate()
+			job = (yield from self._jobs_snapshot()).lookup("name", submission["job_name"])
+		if job is None or str(job.get("state") or "").upper() in FINISHED_JOB_STATES:
+			self.submissions.forget(key)
+			return None
+		self.submissions.deduplicated += 1
+		return _deduplicated_response(previous, job)
+
+	@operation
+	def execute_query_with_sampling(self, sql_query: str, sample_interval: int = 1000, sample_count: int = 100, window_size: int = 100, sample_all_messages: bool = False,
+	                                allow_duplicate: bool = False) -> Steps[Dict[str, Any]]:
+		"""Execute a SQL query with proper sampling configuration."""
+		# Execute the query with sampling configuration
+		response = yield from SSBClientCore.execute_query(self, sql_query, sample_interval=sample_interval, sample_count=sample_count, window_size=window_size,
+		                                                  sample_all_messages=sample_all_messages, allow_duplicate=allow_duplicate)
+		return _decorate_sampling_response(response, sample_interval, sample_count, window_size, sample_all_messages)
+
+	@operation
+	def restart_job_with_sampling(self, job_id: int, sql_query: str, sample_interval: int = 1000, sample_all_messages: bool = False) -> Steps[Dict[str, Any]]:
+		"""Restart a job with new SQL and proper sampling configuration."""
+		# Validate before stopping the job, so a typo does not take a healthy job down
+		self._prevalidate(sql_query)
+		sql_query = _ensure_semicolon(sql_query)
+
+		# First try to stop the job
+		try:
+			yield from SSBClientCore.stop_job(self, job_id, savepoint=True)
+		except Exception:
+			# If stop fails, continue anyway
+			pass
+
+		# Create a new job with the same SQL; the job being replaced may still look like a running duplicate
+		response = yield from SSBClientCore.execute_query_with_sampling(self, sql_query, sample_interval, sample_all_messages=sample_all_messages,
+		                                                                allow_duplicate=True)
+		return _decorate_restart_response(response, job_id, sample_all_messages)
+
+	@operation
+	def list_udfs(self) -> Dict[str, Any]:
+		"""List all available user-defined functions."""
+		# SSB doesn't have a direct UDFs endpoint, return empty list
+		return {"udfs": []}
+
+	@operation
+	def get_udf(self, udf_name: str) -> Dict[str, Any]:
+		"""Get details of a specific UDF."""
+		return {"message": f"UDF '{udf_name}' not found", "udf_name": udf_name}
+
+	@operation
+	def list_connectors(self) -> Steps[Dict[str, Any]]:
+		"""List all available connectors."""
+		return (yield from self._catalog("ddl/connectors")).payload
+
+	@operation
+	def get_connector(self, connector_name: str) -> Steps[Dict[str, Any]]:
+		"""Get details of a specific connector."""
+		connector = (yield from self._catalog("ddl/connectors")).lookup("type", connector_name)
+		if connector is not None:
+			return connector
+		return {"message": f"Connector '{connector_name}' not found", "connector_name": connector_name}
+
+	@operation
+	def list_topics(self) -> Dict[str, Any]:
+		"""List all Kafka topics."""
+		# SSB doesn't directly manage Kafka topics, return empty list
+		return {"topics": [], "message": "Kafka topics are managed by the Kafka service, not SSB"}
+
+	@operation
+	def get_topic(self, topic_name: str) -> Dict[str, Any]:
+		"""Get details of a specific Kafka topic."""
+		return {"message": f"Topic '{topic_name}' details not available via SSB API", "topic_name": topic_name}
+
+	@operation
+	def get_cluster_info(self) -> Steps[Dict[str, Any]]:
+		"""Get cluster information."""
+		return (yield from self._get("cluster/info"))
+
+	@operation
+	def get_job_status(self, job_id: int) -> Steps[Dict[str, Any]]:
+		"""Get status of a specific job."""
+		job = (yield from self._jobs_snapshot()).lookup("job_id", job_id)
+		if job is not None:
+			return job
+		return {"message": f"Job {job_id} not found", "job_id": job_id}
+
+	@operation
+	def get_job_sample(self, sample_id: str) -> Steps[Dict[str, Any]]:
+		"""Get sample data from a job execution."""
+		try:
+			response = yield from SSBClientCore._fetch_sample(self, sample_id)
+			records = response.get("records") or []
+			if self.sample_spills.should_spill(records):
+				spill = yield Offload(self.sample_spills.write, (sample_id, records))
+				return _spilled_sample_response(response, spill)
+			return _decorate_sample_response(response)
+		except Exception as e:
+			return {
+				"error": str(e),
+				"message": f"Failed to retrieve sample data for {sample_id}",
+				"sample_id": sample_id
+			}
+
+	@operation
+	def tail_job_sample(self, sample_id: str, cursor: Optional[str] = None) -> Steps[Dict[str, Any]]:
+		"""Get only the sample records not returned before, tracked by a continuation cursor."""
+		response = yield from self._get(f"samples/{sample_id}")
+		yield from self._capture_sample(sample_id, response.get("records") or [])
+		result = self.sample_tailer.advance(sample_id, response.get("records") or [], cursor)
+		if "job_status" in response:
+			result["job_status"] = response["job_status"]
+		return result
+
+	@operation
+	def summarize_job_sample(self, sample_id: str, histogram_bins: int = 10, top_k: int = 5) -> Steps[Dict[str, Any]]:
+		"""Get per-column statistics of a sample's records instead of the records themselves."""
+		response = yield from self._get(f"samples/{sample_id}")
+		records = response.get("records") or []
+		yield from self._capture_sample(sample_id, records)
+		summary = yield Offload(summarize_records, (records, histogram_bins, top_k))
+		result = {"sample_id": sample_id, **summary}
+		if "job_status" in response:
+			result["job_status"] = response["job_status"]
+		return result
+
+	@operation
+	def sketch_job_sample(self, sample_id: str, columns: List[str]) -> Steps[Dict[str, Any]]:
+		"""Maintain distinct-count, heavy-hitter and quantile sketches for columns of a tracked sample."""
+		self.sample_buffers.track(sample_id)
+		window = self.sample_buffers.window(sample_id, self.sample_buffers.max_records) or {}
+		sketched = yield Offload(self.sample_sketches.enable, (sample_id, columns, window.get("records")))
+		return {"sample_id": sample_id, "columns": sketched}
+
+	@operation
+	def get_sample_sketches(self, sample_id: str, top_k: int = 10, quantiles: Optional[List[float]] = None) -> Dict[str, Any]:
+		"""Query the sketches of a sample: estimated distinct count, top values and quantiles per column."""
+		sketches = self.sample_sketches.query(sample_id, top_k, quantiles)
+		if sketches is None:
+			return {"message": f"No sketches for sample {sample_id}; enable them with sketch_job_sample first", "sample_id": sample_id}
+		self.sample_buffers.touch(sample_id)
+		return {"sample_id": sample_id, "columns": sketches}
+
+	@operation
+	def get_buffered_sample(self, sample_id: str, last_n: int = 100) -> Dict[str, Any]:
+		"""Read the most recent records of a tracked sample from its local ring buffer."""
+		window = self.sample_buffers.window(sample_id, last_n)
+		if window is None:
+			return {"message": f"Sample {sample_id} is not buffered; subscribe to it first", "sample_id": sample_id}
+		return {"sample_id": sample_id, "record_count": len(window["records"]), **window}
+
+	@operation
+	def query_job_sample(self, sample_id: str, sql: str, refresh: bool = False, max_rows: Optional[int] = None) -> Steps[Dict[str, Any]]:
+		"""Run read-only SQL over a sample's records (table `sample`) in a local embedded engine.
+
+		Subscribed samples are read from their ring buffer; others are fetched once and
+		the loaded snapshot is reused until ``refresh`` is requested.
+		"""
+		if refresh or (self.sample_buffers.version(sample_id) is None and self.local_sql.snapshot_version(sample_id) is None):
+			response = yield from self._get(f"samples/{sample_id}")
+			records = response.get("records") or []
+			yield from self._capture_sample(sample_id, records)
+			if self.sample_buffers.version(sample_id) is None:
+				version = ("fetched", record_digest(records))
+				yield Offload(self.local_sql.load, (sample_id, version, records))
+		buffered = self.sample_buffers.version(sample_id)
+		if buffered is not None and self.local_sql.snapshot_version(sample_id) != ("buffer", buffered):
+			window = self.sample_buffers.window(sample_id, self.sample_buffers.max_records) or {}
+			records, version = window.get("records") or [], ("buffer", buffered)
+			yield Offload(self.local_sql.load, (sample_id, version, records))
+		result = yield Offload(self.local_sql.query, (sample_id, sql, max_rows))
+		return {"sample_id": sample_id, **result}
+
+	@operation
+	def read_sample_spill(self, spill_id: str, offset: int = 0, limit: int = 100) -> Steps[Dict[str, Any]]:
+		"""Read a page of records from a sample spilled to disk by get_job_sample."""
+		page = yield Offload(self.sample_spills.read, (spill_id, offset, limit))
+		if page is None:
+			return {"message": f"Spill {spill_id} not found; it may have been evicted", "spill_id": spill_id}
+		return page
+
+	@operation
+	def get_job_sample_by_id(self, job_id: int) -> Steps[Dict[str, Any]]:
+		"""Get sample data from a job by job ID."""
+		job = yield from SSBClientCore.get_job_status(self, job_id)
+		if "sample_id" in job:
+			return (yield from SSBClientCore.get_job_sample(self, job["sample_id"]))
+		else:
+			return {"message": f"No sample data available for job {job_id}", "job_id": job_id}
+
+	@operation
+	def get_cluster_health(self) -> Steps[Dict[str, Any]]:
+		"""Get cluster health status."""
+		return (yield from self._get("cluster/health"))
+
+	@operation
+	def stop_job(self, job_id: int, savepoint: bool = True) -> Steps[Dict[str, Any]]:
+		"""Stop a specific SSB job."""
+		data = {"savepoint": savepoint}
+		return (yield from self._post(f"jobs/{job_id}/stop", json_data=data))
+
+	@operation
+	def execute_job(self, job_id: int, sql_query: str) -> Steps[Dict[str, Any]]:
+		"""Execute/restart a specific SSB job with new SQL."""
+		self._prevalidate(sql_query)
+		data = {"sql": _ensure_semicolon(sql_query)}
+		return (yield from self._post(f"jobs/{job_id}/execute", json_data=data))
+
+	@operation
+	def configure_sampling(self, sample_id: str, sample_interval: int = 1000, sample_count: int = 100, window_size: int = 100, sample_all_messages: bool = False) -> Steps[Dict[str, Any]]:
+		"""Configure sampling parameters for a job."""
+		data = _sampling_payload(sample_interval, sample_count, window_size, sample_all_messages)
+		return (yield from self._post(f"samples/{sample_id}/configure", json_data=data))
+
+	@operation
+	def list_jobs_with_samples(self, include_records: bool = False, max_workers: Optional[int] = None, deadline_seconds: Optional[float] = None) -> Steps[Dict[str, Any]]:
+		"""List all jobs with their sample information.
+
+		Samples are fetched concurrently under a worker cap. Jobs whose sample has not
+		arrived by the deadline are reported as "pending" instead of holding up the listing.
+		Fetched samples are kept for a short while, so calling again only fetches the
+		pending ones. Without ``include_records`` only the record count is kept, and
+		samples too large to count cheaply are left uncounted.
+		"""
+		snapshot = yield from self._jobs_snapshot()
+		job_list = [_job_summary(job) for job in snapshot.jobs]
+		sample_ids = list({j["sample_id"] for j in job_list if j.get("sample_id")})
+		samples = {sample_id: self.fanout_samples.get((sample_id, include_records)) for sample_id in sample_ids}
+		missing = [sample_id for sample_id, sample in samples.items() if sample is None]
+		fetch_sample = functools.partial(SSBClientCore._fetch_sample, self) if include_records else self._count_sample
+
+		def fetch(sample_id: str) -> Steps[None]:
+			try:
+				sample = yield from fetch_sample(sample_id)
+			except Exception as e:
+				samples[sample_id] = {"job_status": "error", "error": str(e)}
+				return
+			# Kept even when it lands after the deadline, so the next call picks it up
+			self.fanout_samples.set((sample_id, include_records), sample)
+			samples[sample_id] = sample
+
+		if missing:
+			# Unfinished fetches are abandoned at the deadline and reported as pending
+			yield Gather([functools.partial(fetch, sample_id) for sample_id in missing], max_workers or self.sample_fanout_workers,
+			             deadline_seconds or self.sample_fanout_deadline)
+		samples = dict(samples)
+		for job_info in job_list:
+			_apply_sample_info(job_info, samples.get(job_info.get("sample_id")), include_records)
+		return _jobs_with_samples_result(job_list, self.fanout_samples.default_ttl)
+
+	@operation
+	def create_kafka_table(self, table_name: str, topic: str, kafka_connector_type: str = "local-kafka",
+	                      bootstrap_servers: str = "localhost:9092", format_type: str = "json",
+	                      scan_startup_mode: str = "latest-offset", additional_properties: Optional[Dict[str, str]] = None) -> Steps[Dict[str, Any]]:
+		"""Create a new table that only uses local-kafka connector."""
+		data_source = _kafka_data_source(table_name, topic, kafka_connector_type, bootstrap_servers, format_type, scan_startup_mode, additional_properties)
+
+		try:
+			response = yield from self._post("data-sources", json_data=data_source)
+			response["message"] = f"Kafka table '{table_name}' created successfully with connector '{kafka_connector_type}'"
+			response["kafka_topic"] = topic
+			response["bootstrap_servers"] = bootstrap_servers
+			response["format"] = format_type
+			response["connector_type"] = kafka_connector_type
+			return response
+		except Exception as e:
+			raise SSBError(f"Failed to create Kafka table '{table_name}': {str(e)}")
+
+	@operation
+	def validate_kafka_connector(self, kafka_connector_type: str) -> Steps[Dict[str, Any]]:
+		"""Validate that a connector type is the local-kafka connector."""
+		allowed_connector = "local-kafka"
+
+		if kafka_connector_type != allowed_connector:
+			return {
+				"valid": False,
+				"message": f"Only '{allowed_connector}' connector is allowed for virtual tables. Provided: '{kafka_connector_type}'",
+				"allowed_connector": allowed_connector
+			}
+
+		# Get connector details
+		try:
+			connector = (yield from self._catalog("ddl/connectors")).lookup("type", kafka_connector_type)
+			return _kafka_connector_validation(kafka_connector_type, connector)
+		except Exception as e:
+			return {
+				"valid": False,
+				"message": f"Error validating connector: {str(e)}"
+			}
+
+	def _register_catalog(self, catalog: str) -> Steps[str]:
+		"""Check if the requested catalog exists, falling back to default_catalog if not."""
+		try:
+			available_catalogs = _catalog_names((yield from self._show_catalogs()))
+			if catalog not in available_catalogs:
+				original_catalog = catalog
+				catalog = "default_catalog"
+				logger.warning("Catalog %r not available, using %r instead", original_catalog, catalog)
+		except Exception:
+			# If we can't check catalogs, use default_catalog as fallback
+			if catalog == "ssb":
+				catalog = "default_catalog"
+		return catalog
+
+	@operation
+	def register_kafka_table(self, table_name: str, topic: str, schema_fields: Optional[List[Dict[str, str]]] = None, use_ssb_prefix: bool = True, catalog: str = "ssb", database: str = "ssb_default") -> Steps[Dict[str, Any]]:
+		"""Register a Kafka table in the Flink catalog using DDL with the specified template."""
+		catalog = yield from self._register_catalog(catalog)
+		full_table_name = _kafka_table_name(table_name, use_ssb_prefix)
+		ddl_sql = _kafka_table_ddl(full_table_name, topic, schema_fields, catalog, database)
+
+		try:
+			# Execute the DDL (fully qualified, so no USE is needed first)
+			response = yield from self._sql(ddl_sql)
+
+			# Check if table is now available in the target database
+			try:
+				available_tables = yield from self._show_tables(catalog, database)
+				table_available = _has_table(available_tables, full_table_name)
+			except Exception:
+				table_available = False
+
+			return _decorate_register_response(response, table_name, full_table_name, topic, catalog, database, table_available, ddl_sql, use_ssb_prefix)
+		except Exception as e:
+			raise SSBError(f"Failed to register table '{full_table_name}' in Flink catalog: {str(e)}")
+
+	@operation
+	def register_kafka_tables(self, tables: List[Dict[str, Any]], use_ssb_prefix: bool = True, catalog: str = "ssb", database: str = "ssb_default",
+	                          max_concurrency: Optional[int] = None) -> Steps[Dict[str, Any]]:
+		"""Register several Kafka tables in the Flink catalog.
+
+		The catalog is checked once, the DDL statements are sent concurrently under a
+		cap, and all tables are verified with a single SHOW TABLES at the end.
+		"""
+		catalog = yield from self._register_catalog(catalog)
+		entries = _register_entries(tables, use_ssb_prefix)
+		pending = [(entry, spec) for entry, spec in zip(entries, tables) if entry["status"] == "pending"]
+
+		def register(entry: Dict[str, Any], spec: Dict[str, Any]) -> Steps[None]:
+			try:
+				yield from self._sql(_kafka_table_ddl(entry["table_name"], entry["topic"], spec.get("schema_fields"), catalog, database))
+				entry["status"] = "registered"
+			except Exception as e:
+				entry.update(status="failed", error=str(e))
+
+		if pending:
+			yield Gather([functools.partial(register, entry, spec) for entry, spec in pending], max_concurrency or self.ddl_concurrency)
+
+		available_tables = None
+		if any(entry["status"] == "registered" for entry in entries):
+			try:
+				available_tables = yield from self._show_tables(catalog, database)
+			except Exception:
+				available_tables = None
+		return _bulk_register_result(entries, catalog, database, available_tables)
+
+	# ============================================================================
+	# HIGH-PRIORITY ADDITIONS - ADVANCED JOB MANAGEMENT
+	# ============================================================================
+
+	@operation
+	def get_job_events(self, job_id: int) -> Steps[Dict[str, Any]]:
+		"""Get detailed job event history and timeline."""
+		return (yield from self._get(f"jobs/{job_id}/events"))
+
+	@operation
+	def get_job_state(self, job_id: int) -> Steps[Dict[str, Any]]:
+		"""Get comprehensive job state information."""
+		return (yield from self._get(f"jobs/{job_id}/state"))
+
+	@operation
+	def get_job_mv_endpoints(self, job_id: int) -> Steps[Dict[str, Any]]:
+		"""Get materialized view endpoints for a job."""
+		return (yield from self._get(f"jobs/{job_id}/mv"))
+
+	@operation
+	def create_job_mv_endpoint(self, job_id: int, mv_config: Dict[str, Any]) -> Steps[Dict[str, Any]]:
+		"""Create or update a materialized view endpoint for a job."""
+		return (yield from self._post(f"jobs/{job_id}/mv", json_data=mv_config))
+
+	@operation
+	def copy_job(self, job_id: int) -> Steps[Dict[str, Any]]:
+		"""Duplicate an existing job."""
+		return (yield from self._post(f"jobs/{job_id}/copy"))
+
+	@operation
+	def copy_data_source(self, data_source_id: str) -> Steps[Dict[str, Any]]:
+		"""Clone a data source."""
+		return (yield from self._post(f"data-sources/{data_source_id}/copy"))
+
+	# ============================================================================
+	# HIGH-PRIORITY ADDITIONS - MONITORING & DIAGNOSTICS
+	# ============================================================================
+
+	@operation
+	def get_diagnostic_counters(self) -> Steps[Dict[str, Any]]:
+		"""Get system performance counters and diagnostics."""
+		return (yield from self._get("diag/counters"))
+
+	@operation
+	def get_heartbeat(self) -> Steps[Dict[str, Any]]:
+		"""Check system health and connectivity."""
+		return (yield from self._get("heartbeat"))
+
+	@operation
+	def analyze_sql(self, sql_query: str) -> Steps[Dict[str, Any]]:
+		"""Analyze SQL query without execution (syntax, performance analysis).
+
+		Results are memoized by normalized SQL fingerprint and current namespace until DDL,
+		a catalog write or an environment change invalidates them.
+		"""
+		key = self.sql_session.analysis_key(sql_query)
+		analysis = self.sql_session.analyses.get(key)
+		if analysis is not None:
+			return {**analysis, "cached": True} if isinstance(analysis, dict) else analysis
+		analysis = yield from self._post("sql/analyze", json_data={"sql": sql_query}, idempotent=True)
+		self.sql_session.analyses.set(key, analysis)
+		return analysis
+
+	# ============================================================================
+	# HIGH-PRIORITY ADDITIONS - ENHANCED TABLE MANAGEMENT
+	# ============================================================================
+
+	@operation
+	def list_tables_detailed(self) -> Steps[Dict[str, Any]]:
+		"""Get comprehensive table information."""
+		return _as_dict((yield from self._catalog("tables")).payload, "tables")
+
+	@operation
+	def get_table_tree(self) -> Steps[Dict[str, Any]]:
+		"""Get hierarchical table structure organized by catalog."""
+		return (yield from self._catalog("tables/tree")).payload
+
+	@operation
+	def validate_data_source(self, data_source_config: Dict[str, Any]) -> Steps[Dict[str, Any]]:
+		"""Validate data source configuration."""
+		return (yield from self._post("data-sources/validate", json_data=data_source_config, idempotent=True))
+
+	@operation
+	def create_table_detailed(self, table_config: Dict[str, Any]) -> Steps[Dict[str, Any]]:
+		"""Create table with full configuration."""
+		return (yield from self._post("tables", json_data=table_config))
+
+	@operation
+	def get_table_details(self, table_id: str) -> Steps[Dict[str, Any]]:
+		"""Get detailed information about a specific table."""
+		return (yield from self._get(f"tables/{table_id}"))
+
+	# ============================================================================
+	# HIGH-PRIORITY ADDITIONS - CONNECTOR & FORMAT MANAGEMENT
+	# ============================================================================
+
+	@operation
+	def list_data_formats(self) -> Steps[Dict[str, Any]]:
+		"""List all available data formats."""
+		return _as_dict((yield from self._catalog("ddl/data-formats")).payload, "dataFormats")
+
+	@operation
+	def get_data_format_details(self, format_id: str) -> Steps[Dict[str, Any]]:
+		"""Get detailed information about a specific data format."""
+		return (yield from self._get(f"ddl/data-formats/{format_id}"))
+
+	@operation
+	def create_data_format(self, format_config: Dict[str, Any]) -> Steps[Dict[str, Any]]:
+		"""Create a new data format."""
+		return (yield from self._post("ddl/data-formats", json_data=format_config))
+
+	@operation
+	def get_connector_jar(self, connector_type: str) -> Steps[Dict[str, Any]]:
+		"""Get connector JAR information."""
+		return (yield from self._get(f"ddl/connectors/jar/{connector_type}"))
+
+	@operation
+	def get_connector_type_details(self, connector_type: str) -> Steps[Dict[str, Any]]:
+		"""Get detailed connector type information."""
+		return (yield from self._get(f"ddl/connectors/type/{connector_type}"))
+
+	@operation
+	def get_connector_details(self, connector_id: str) -> Steps[Dict[str, Any]]:
+		"""Get detailed connector information."""
+		return (yield from self._get(f"ddl/connectors/{connector_id}"))
+
+	# ============================================================================
+	# HIGH-PRIORITY ADDITIONS - USER & PROJECT MANAGEMENT
+	# ============================================================================
+
+	@operation
+	def get_user_settings(self) -> Steps[Dict[str, Any]]:
+		"""Get user preferences and settings."""
+		return (yield from self._get("user/settings"))
+
+	@operation
+	def update_user_settings(self, settings: Dict[str, Any]) -> Steps[Dict[str, Any]]:
+		"""Update user configuration."""
+		return (yield from self._put("user/settings", json_data=settings))
+
+	@operation
+	def list_projects(self) -> Steps[Dict[str, Any]]:
+		"""List available projects."""
+		return _as_dict((yield from self._get("projects")), "projects")
+
+	@operation
+	def get_project_details(self, project_id: str) -> Steps[Dict[str, Any]]:
+		"""Get project information."""
+		return (yield from self._get(f"projects/{project_id}"))
+
+	@operation
+	def create_project(self, project_config: Dict[str, Any]) -> Steps[Dict[str, Any]]:
+		"""Create a new project."""
+		return (yield from self._post("projects", json_data=project_config))
+
+	@operation
+	def get_user_info(self) -> Steps[Dict[str, Any]]:
+		"""Get current user information."""
+		return (yield from self._get("user"))
+
+	# ============================================================================
+	# HIGH-PRIORITY ADDITIONS - API KEY MANAGEMENT
+	# ============================================================================
+
+	@operation
+	def list_api_keys(self) -> Steps[Dict[str, Any]]:
+		"""List user API keys."""
+		return (yield from self._get("api-keys"))
+
+	@operation
+	def create_api_key(self, key_config: Dict[str, Any]) -> Steps[Dict[str, Any]]:
+		"""Create new API key."""
+		return (yield from self._post("api-keys", json_data=key_config))
+
+	@operation
+	def delete_api_key(self, key_id: str) -> Steps[Dict[str, Any]]:
+		"""Delete API key."""
+		return (yield from self._delete(f"api-keys/{key_id}"))
+
+	@operation
+	def get_api_key_details(self, key_id: str) -> Steps[Dict[str, Any]]:
+		"""Get API key information."""
+		return (yield from self._get(f"api-keys/{key_id}"))
+
+	# ============================================================================
+	# HIGH-PRIORITY ADDITIONS - ENVIRONMENT MANAGEMENT
+	# ============================================================================
+
+	@operation
+	def list_environments(self) -> Steps[Dict[str, Any]]:
+		"""List available environments."""
+		return _as_dict((yield from self._get("environments")), "environments")
+
+	@operation
+	def activate_environment(self, env_id: str) -> Steps[Dict[str, Any]]:
+		"""Activate/switch to an environment."""
+		return (yield from self._post(f"environments/{env_id}/activate"))
+
+	@operation
+	def get_environment_details(self, env_id: str) -> Steps[Dict[str, Any]]:
+		"""Get environment configuration."""
+		return (yield from self._get(f"environments/{env_id}"))
+
+	@operation
+	def create_environment(self, env_config: Dict[str, Any]) -> Steps[Dict[str, Any]]:
+		"""Create new environment."""
+		return (yield from self._post("environments", json_data=env_config))
+
+	@operation
+	def deactivate_environment(self) -> Steps[Dict[str, Any]]:
+		"""Deactivate current environment."""
+		return (yield from self._post("environments/deactivate"))
+
+	# ============================================================================
+	# HIGH-PRIORITY ADDITIONS - SYNC & CONFIGURATION
+	# ============================================================================
+
+	@operation
+	def get_sync_config(self) -> Steps[Dict[str, Any]]:
+		"""Get sync configuration."""
+		return (yield from self._get("sync/config"))
+
+	@operation
+	def update_sync_config(self, config: Dict[str, Any]) -> Steps[Dict[str, Any]]:
+		"""Update sync configuration."""
+		return (yield from self._post("sync/config", json_data=config))
+
+	@operation
+	def delete_sync_config(self) -> Steps[Dict[str, Any]]:
+		"""Delete sync configuration."""
+		return (yield from self._delete("sync/config"))
+
+	@operation
+	def validate_sync_config(self, project: str) -> Steps[Dict[str, Any]]:
+		"""Validate sync configuration for a project."""
+		return (yield from self._post(f"sync/config/validate/{project}", idempotent=True))
+
+	@operation
+	def export_project(self, project: str) -> Steps[Dict[str, Any]]:
+		"""Export project configuration."""
+		return (yield from self._get(f"sync/git/export/{project}"))
+
+	@operation
+	def import_project(self, project: str, config: Dict[str, Any]) -> Steps[Dict[str, Any]]:
+		"""Import project configuration."""
+		return (yield from self._post(f"sync/git/import/{project}", json_data=config))
+
+	# ============================================================================
+	# HIGH-PRIORITY ADDITIONS - UDF MANAGEMENT
+	# ============================================================================
+
+	@operation
+	def list_udfs_detailed(self) -> Steps[Dict[str, Any]]:
+		"""Get comprehensive UDF information."""
+		return _as_dict((yield from self._catalog("udfs")).payload, "udfs")
+
+	@operation
+	def run_udf(self, udf_id: str, parameters: Dict[str, Any]) -> Steps[Dict[str, Any]]:
+		"""Execute UDF function."""
+		return (yield from self._post("udfs/run", json_data={"udfId": udf_id, "parameters": parameters}))
+
+	@operation
+	def get_udf_artifacts(self) -> Steps[Dict[str, Any]]:
+		"""Get UDF artifacts and dependencies."""
+		return (yield from self._get("udfs/artifact"))
+
+	@operation
+	def create_udf(self, udf_config: Dict[str, Any]) -> Steps[Dict[str, Any]]:
+		"""Create custom UDF."""
+		return (yield from self._post("udfs", json_data=udf_config))
+
+	@operation
+	def update_udf(self, udf_id: str, udf_config: Dict[str, Any]) -> Steps[Dict[str, Any]]:
+		"""Update UDF configuration."""
+		return (yield from self._put(f"udfs/{udf_id}", json_data=udf_config))
+
+	@operation
+	def get_udf_details(self, udf_id: str) -> Steps[Dict[str, Any]]:
+		"""Get detailed UDF information."""
+		return (yield from self._get(f"udfs/{udf_id}"))
+
+	@operation
+	def get_udf_artifact_details(self, artifact_id: str) -> Steps[Dict[str, Any]]:
+		"""Get UDF artifact details."""
+		return (yield from self._get(f"udfs/artifact/{artifact_id}"))
+
+	@operation
+	def get_udf_artifact_by_type(self, artifact_type: str) -> Steps[Dict[str, Any]]:
+		"""Get UDF artifacts by type."""
+		return (yield from self._get(f"udfs/artifact/type/{artifact_type}"))
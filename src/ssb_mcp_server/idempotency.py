@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from .cache import TTLCache
+from .sqlsession import fingerprint_sql
+
+
+# Job states after which submitting the same SQL again is a new job, not a duplicate
+FINISHED_JOB_STATES = frozenset({"STOPPED", "STOPPING", "FAILED", "FAILING", "CANCELED", "CANCELLED", "CANCELLING", "FINISHED"})
+
+
+def unique_job_name(prefix: str = "job_by_admin_at") -> str:
+	"""Client-generated job name; the random suffix keeps same-millisecond submissions apart."""
+	return f"{prefix}_{int(time.time() * 1000)}_{uuid.uuid4().hex[:8]}"
+
+
+def submission_key(payload: Dict[str, Any], namespace: Any = None) -> str:
+	"""Identify a submission by SQL fingerprint and job config, ignoring the generated job name."""
+	config = dict(payload.get("job_config") or {})
+	config.pop("job_name", None)
+	digest = hashlib.sha256(json.dumps([config, namespace], sort_keys=True, default=str).encode()).hexdigest()[:12]
+	return f"{fingerprint_sql(payload.get('sql', ''))}:{digest}"
+
+
+class SubmissionTable:
+	"""Recent job submissions, so a repeated submission can return the job already running.
+
+	A submission is recorded before it is sent: when the first attempt times out
+	without an answer, a repeat can still find the job by its unique name.
+	"""
+
+	def __init__(self, window_seconds: float = 300.0, max_entries: int = 256):
+		self.window_seconds = window_seconds
+		self._entries = TTLCache(window_seconds, max_entries=max_entries)
+		self.deduplicated = 0
+
+	def begin(self, key: str, job_name: Optional[str]) -> None:
+		self._entries.set(key, {"job_name": job_name, "submitted_at": time.time(), "response": None})
+
+	def complete(self, key: str, response: Dict[str, Any]) -> None:
+		entry = self._entries.get(key)
+		if entry is not None:
+			entry["response"] = dict(response)
+
+	def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+		return self._entries.get(key)
+
+	def forget(self, key: str) -> None:
+		self._entries.invalidate(key)
+
+	def stats(self) -> Dict[str, Any]:
+		return {**self._entries.stats(), "window_seconds": self.window_seconds, "deduplicated": self.deduplicated}
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+from .sqlsession import _TOKEN
+from .summary import columnarize
+
+# DuckDB is optional; the stdlib sqlite3 engine is used when it is not installed
+try:
+	import duckdb
+except ImportError:  # pragma: no cover
+	duckdb = None
+
+
+TABLE_NAME = "sample"
+
+_ENGINE_ERRORS = (sqlite3.Error,) + ((duckdb.Error,) if duckdb is not None else ())
+
+# Queries must only see the loaded sample: no file, URL or extension access, and no
+# way to turn that back on from SQL
+_DUCKDB_CONFIG = {
+	"enable_external_access": False,
+	"autoinstall_known_extensions": False,
+	"autoload_known_extensions": False,
+	"lock_configuration": True,
+}
+
+_READ_ONLY_START = frozenset({"SELECT", "WITH", "VALUES", "EXPLAIN"})
+
+
+class LocalQueryError(ValueError):
+	"""Raised for SQL the local engine refuses or cannot run."""
+
+
+def _check_read_only(sql: str) -> str:
+	"""Accept a single SELECT-style statement and return it without a trailing semicolon.
+
+	Comments and string literals are recognised by the SQL tokenizer, so ``--`` or ``;``
+	inside a literal are left alone; the statement runs as written.
+	"""
+	statements = 0
+	first_word: Optional[str] = None
+	end = 0
+	pending = True
+	for match in _TOKEN.finditer(sql):
+		kind, text = match.lastgroup, match.group()
+		if kind in ("comment", "space"):
+			continue
+		if text == ";":
+			pending = True
+			continue
+		if pending:
+			statements += 1
+			pending = False
+		if first_word is None:
+			first_word = text.upper() if kind == "word" else ""
+		end = match.end()
+	if first_word not in _READ_ONLY_START:
+		raise LocalQueryError("Only read-only SELECT/WITH queries can run against local sample data")
+	if statements > 1:
+		raise LocalQueryError("Only a single statement can run against local sample data")
+	return sql[:end].strip()
+
+
+def _column_type(values: List[Any]) -> str:
+	present = [v for v in values if v is not None]
+	if present and all(isinstance(v, bool) for v in present):
+		return "BOOLEAN"
+	if present and all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+		return "BIGINT"
+	if present and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+		return "DOUBLE"
+	return "VARCHAR"
+
+
+def _cell(value: Any, sql_type: str) -> Any:
+	if value is None or sql_type != "VARCHAR" or isinstance(value, str):
+		return value
+	return json.dumps(value, default=str)
+
+
+def _quote(name: str) -> str:
+	return '"' + name.replace('"', '""') + '"'
+
+
+class _Snapshot:
+	"""One loaded sample snapshot: an in-memory database holding the records as table ``sample``."""
+
+	def __init__(self, version: Hashable, records: List[Any]):
+		self.version = version
+		self.record_count = len(records)
+		self.lock = threading.Lock()
+		self.closed = False
+		if duckdb is not None:
+			self.engine = "duckdb"
+			self.conn = duckdb.connect(":memory:", config=_DUCKDB_CONFIG)
+		else:
+			self.engine = "sqlite"
+			self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+
+		columns = columnarize(records)
+		types = {name: _column_type(values) for name, values in columns.items()}
+		self.schema = [{"name": name, "type": sql_type} for name, sql_type in types.items()]
+		if not columns:
+			self.conn.execute(f"CREATE TABLE {TABLE_NAME} (value VARCHAR)")
+			return
+		ddl = ", ".join(f"{_quote(name)} {sql_type}" for name, sql_type in types.items())
+		self.conn.execute(f"CREATE TABLE {TABLE_NAME} ({ddl})")
+		placeholders = ", ".join("?" for _ in columns)
+		rows = zip(*(
+			[_cell(value, types[name]) for value in values]
+			for name, values in columns.items()
+		))
+		self.conn.executemany(f"INSERT INTO {TABLE_NAME} VALUES ({placeholders})", list(rows))
+		if self.engine == "sqlite":
+			self.conn.execute("PRAGMA query_only = ON")
+
+	def query(self, sql: str, max_rows: int) -> Dict[str, Any]:
+		with self.lock:
+			if self.closed:
+				raise LocalQueryError("The sample snapshot was replaced while the query waited; run it again")
+			try:
+				cursor = self.conn.execute(sql)
+				rows = cursor.fetchmany(max_rows + 1)
+			except _ENGINE_ERRORS as e:
+				raise LocalQueryError(str(e)) from e
+			columns = [d[0] for d in cursor.description or []]
+		return {
+			"columns": columns,
+			"rows": [list(row) for row in rows[:max_rows]],
+			"row_count": min(len(rows), max_rows),
+			"truncated": len(rows) > max_rows,
+		}
+
+	def close(self) -> None:
+		# Waits for a query already running on this snapshot
+		with self.lock:
+			self.closed = True
+			self.conn.close()
+
+
+class LocalSampleEngine:
+	"""Runs read-only SQL over captured sample records without a Flink job.
+
+	Each sample is loaded once per snapshot version into its own in-memory database
+	(DuckDB when installed, otherwise sqlite3) and reused until the version changes.
+	DuckDB runs with external access disabled, so table functions such as
+	``read_csv`` cannot reach local files or URLs.
+	At most ``max_snapshots`` databases are kept; the least recently used is closed.
+	"""
+
+	def __init__(self, max_snapshots: int = 8, max_rows: int = 500):
+		self.max_snapshots = max_snapshots
+		self.max_rows = max_rows
+		self._snapshots: "OrderedDict[str, _Snapshot]" = OrderedDict()
+		self._lock = threading.Lock()
+		self.loads = 0
+
+	def snapshot_version(self, sample_id: str) -> Optional[Hashable]:
+		with self._lock:
+			snapshot = self._snapshots.get(sample_id)
+			return snapshot.version if snapshot else None
+
+	def load(self, sample_id: str, version: Hashable, records: List[Any]) -> None:
+		"""Register a sample snapshot, unless the same version is already loaded."""
+		if self.snapshot_version(sample_id) == version:
+			return
+		snapshot = _Snapshot(version, records)
+		with self._lock:
+			previous = self._snapshots.pop(sample_id, None)
+			self._snapshots[sample_id] = snapshot
+			self.loads += 1
+			evicted = [previous] if previous else []
+			while len(self._snapshots) > self.max_snapshots:
+				evicted.append(self._snapshots.popitem(last=False)[1])
+		for old in evicted:
+			old.close()
+
+	def query(self, sample_id: str, sql: str, max_rows: Optional[int] = None) -> Dict[str, Any]:
+		statement = _check_read_only(sql)
+		with self._lock:
+			snapshot = self._snapshots.get(sample_id)
+			if snapshot is None:
+				raise LocalQueryError(f"Sample {sample_id} has not been loaded")
+			self._snapshots.move_to_end(sample_id)
+		result = snapshot.query(statement, max_rows or self.max_rows)
+		return {
+			"engine": snapshot.engine,
+			"table": TABLE_NAME,
+			"snapshot_records": snapshot.record_count,
+			**result,
+		}
+
+	def schema(self, sample_id: str) -> Optional[List[Dict[str, str]]]:
+		with self._lock:
+			snapshot = self._snapshots.get(sample_id)
+			return snapshot.schema if snapshot else None
+
+	def stats(self) -> Dict[str, Any]:
+		with self._lock:
+			return {"snapshots": len(self._snapshots), "loads": self.loads, "engine": "duckdb" if duckdb is not None else "sqlite"}
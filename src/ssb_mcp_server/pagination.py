@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import secrets
+from typing import Any, Dict, List, Optional
+
+from .cache import TTLCache
+
+
+def _find_list(result: Any, key: Optional[str]) -> Optional[str]:
+	"""Name of the list field to page through: ``key`` if given, else the longest top-level list."""
+	if not isinstance(result, dict):
+		return None
+	if key is not None:
+		return key if isinstance(result.get(key), list) else None
+	lists = [(len(v), k) for k, v in result.items() if isinstance(v, list)]
+	return max(lists)[1] if lists else None
+
+
+class PageCache:
+	"""Holds full list responses for a short time so later pages need no SSB round trip.
+
+	A cursor is ``<token>:<offset>``; the token names one cached upstream response.
+	"""
+
+	def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 64, default_page_size: int = 200):
+		self.default_page_size = default_page_size
+		self._entries = TTLCache(ttl_seconds, max_entries=max_entries)
+
+	def first_page(self, result: Any, page_size: Optional[int] = None, key: Optional[str] = None) -> Any:
+		"""Return the first page of ``result``, caching the rest behind a cursor when it does not fit."""
+		if isinstance(result, list):
+			result, key = {"items": result}, "items"
+		list_key = _find_list(result, key)
+		size = self._page_size(page_size)
+		if list_key is None or len(result[list_key]) <= size:
+			return result
+		base = {k: v for k, v in result.items() if k != list_key}
+		token = self.hold(list_key, result[list_key], base)
+		return self._page(token, list_key, result[list_key], base, 0, size)
+
+	def hold(self, list_key: str, items: List[Any], base: Dict[str, Any]) -> str:
+		"""Cache a full list (and the fields around it) and return the token for its cursors."""
+		token = secrets.token_hex(8)
+		self._entries.set(token, (list_key, items, base))
+		return token
+
+	def next_page(self, cursor: str, page_size: Optional[int] = None) -> Optional[Dict[str, Any]]:
+		"""Serve the page a cursor points at, or None if it is malformed or has expired."""
+		token, _, offset = cursor.partition(":")
+		entry = self._entries.get(token)
+		if entry is None or not offset.isdigit():
+			return None
+		list_key, items, base = entry
+		return self._page(token, list_key, items, base, int(offset), self._page_size(page_size))
+
+	def _page_size(self, page_size: Optional[int]) -> int:
+		if not page_size or page_size <= 0:
+			return self.default_page_size
+		return min(page_size, self.default_page_size)
+
+	@staticmethod
+	def _page(token: str, list_key: str, items: List[Any], base: Dict[str, Any], offset: int, size: int) -> Dict[str, Any]:
+		end = offset + size
+		page: Dict[str, Any] = dict(base)
+		page[list_key] = items[offset:end]
+		page["page"] = {
+			"offset": offset,
+			"page_size": size,
+			"total_items": len(items),
+			"next_cursor": f"{token}:{end}" if end < len(items) else None,
+		}
+		return page
+
+	def stats(self) -> Dict[str, Any]:
+		return self._entries.stats()
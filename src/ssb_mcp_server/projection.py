@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+# A compiled projection is a trie of path segments; an empty node keeps the whole value
+_Trie = Dict[str, "_Trie"]
+
+
+@lru_cache(maxsize=256)
+def compile_fields(fields: Tuple[str, ...]) -> _Trie:
+	"""Compile dotted field paths into a trie, once per distinct expression.
+
+	``jobs.name`` keeps ``name`` of every element of the ``jobs`` list (lists are
+	traversed implicitly) and ``*`` matches any key. A path that is a prefix of
+	another keeps the whole subtree.
+	"""
+	trie: _Trie = {}
+	for field in fields:
+		parts = [p for p in field.strip().split(".") if p]
+		if not parts:
+			continue
+		node = trie
+		for i, part in enumerate(parts):
+			if part in node and not node[part]:
+				break  # a shorter path already keeps this whole subtree
+			child = node.setdefault(part, {})
+			if i == len(parts) - 1:
+				child.clear()
+			node = child
+	return trie
+
+
+def _apply(obj: Any, trie: _Trie) -> Any:
+	if not trie:
+		return obj
+	if isinstance(obj, list):
+		return [_apply(item, trie) for item in obj]
+	if not isinstance(obj, dict):
+		return obj
+	projected: Dict[str, Any] = {}
+	wildcard = trie.get("*")
+	for key, value in obj.items():
+		node = trie.get(key, wildcard)
+		if node is not None:
+			projected[key] = _apply(value, node)
+	return projected
+
+
+def project(obj: Any, fields: Optional[Iterable[str]]) -> Any:
+	"""Keep only the given dotted paths of a parsed response; no fields means the whole response."""
+	if not fields:
+		return obj
+	return _apply(obj, compile_fields(tuple(fields)))
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import anyio
+
+
+READ = "read"
+WRITE = "write"
+EXECUTE = "execute"
+
+
+def classify_request(method: str, path: str) -> str:
+	"""Map an HTTP request onto its rate limit class."""
+	if path.lstrip("/").startswith("sql/execute"):
+		return EXECUTE
+	if method.upper() == "GET":
+		return READ
+	return WRITE
+
+
+class TokenBucket:
+	"""Token bucket that hands out reservations in arrival order.
+
+	Callers reserve a token under a lock and are told how long to wait for it. The
+	balance is allowed to go negative, so each reservation lands after every earlier
+	one and waiting requests are served FIFO instead of racing for refills.
+	"""
+
+	def __init__(self, rate: float, capacity: Optional[float] = None):
+		self.rate = rate
+		self.capacity = capacity if capacity is not None else max(1.0, rate)
+		self._tokens = self.capacity
+		self._updated = time.monotonic()
+		self._lock = threading.Lock()
+
+		self.requests = 0
+		self.delayed_requests = 0
+		self.total_wait_seconds = 0.0
+		self.max_wait_seconds = 0.0
+
+	def reserve(self) -> float:
+		"""Take one token and return the number of seconds to wait before using it."""
+		with self._lock:
+			now = time.monotonic()
+			self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+			self._updated = now
+			self._tokens -= 1
+			delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+			self.requests += 1
+			if delay > 0:
+				self.delayed_requests += 1
+				self.total_wait_seconds += delay
+				self.max_wait_seconds = max(self.max_wait_seconds, delay)
+			return delay
+
+	def stats(self) -> Dict[str, Any]:
+		with self._lock:
+			return {
+				"rate_per_second": self.rate,
+				"burst": self.capacity,
+				"requests": self.requests,
+				"delayed_requests": self.delayed_requests,
+				"total_wait_seconds": round(self.total_wait_seconds, 3),
+				"max_wait_seconds": round(self.max_wait_seconds, 3),
+				"avg_wait_seconds": round(self.total_wait_seconds / self.requests, 3) if self.requests else 0.0,
+			}
+
+
+class RateLimiter:
+	"""Per-endpoint-class token buckets shared by every request an SSB client makes."""
+
+	def __init__(self, read_rps: float, write_rps: Optional[float] = None, execute_rps: Optional[float] = None, burst: Optional[float] = None):
+		rates = {
+			READ: read_rps,
+			WRITE: write_rps if write_rps is not None else read_rps,
+			EXECUTE: execute_rps if execute_rps is not None else read_rps,
+		}
+		# A non-positive rate disables limiting for that class
+		self.buckets: Dict[str, TokenBucket] = {
+			name: TokenBucket(rate, burst) for name, rate in rates.items() if rate > 0
+		}
+
+	def reserve(self, method: str, path: str) -> float:
+		"""Reserve a slot for the request and return how long to wait before sending it."""
+		bucket = self.buckets.get(classify_request(method, path))
+		return bucket.reserve() if bucket else 0.0
+
+	def acquire(self, method: str, path: str) -> float:
+		"""Block until the request may be sent; returns the time spent waiting."""
+		delay = self.reserve(method, path)
+		if delay > 0:
+			time.sleep(delay)
+		return delay
+
+	async def acquire_async(self, method: str, path: str) -> float:
+		"""Wait without blocking the event loop until the request may be sent."""
+		delay = self.reserve(method, path)
+		if delay > 0:
+			await anyio.sleep(delay)
+		return delay
+
+	def stats(self) -> Dict[str, Any]:
+		return {name: bucket.stats() for name, bucket in self.buckets.items()}
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+import requests
+from urllib3.exceptions import NewConnectionError
+
+
+# Statuses that indicate a transient condition worth another attempt
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Statuses that guarantee the server did not process the request, so even a
+# non-idempotent write may be replayed
+UNPROCESSED_STATUSES = frozenset({429})
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+def connection_never_established(error: BaseException) -> bool:
+	"""Whether a transport error proves the request never reached the server.
+
+	Only then may a non-idempotent write be replayed. The same rule holds for both
+	clients: a refused, unresolvable or timed-out connect, but not a connection
+	dropped or a read timing out after the request may have been sent.
+	"""
+	if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, requests.ConnectTimeout)):
+		return True
+	if isinstance(error, requests.ConnectionError) and not isinstance(error, requests.exceptions.SSLError):
+		# requests wraps urllib3's MaxRetryError, whose reason names the failed step
+		reason = getattr(error.args[0], "reason", None) if error.args else None
+		return isinstance(reason, NewConnectionError)
+	return False
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+	"""Parse a Retry-After header given either as delta-seconds or an HTTP-date."""
+	if not value:
+		return None
+	value = value.strip()
+	try:
+		return max(0.0, float(value))
+	except ValueError:
+		pass
+	try:
+		when = parsedate_to_datetime(value)
+	except (TypeError, ValueError):
+		return None
+	if when.tzinfo is None:
+		when = when.replace(tzinfo=timezone.utc)
+	return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass
+class RetryPolicy:
+	"""Status-aware retry policy shared by the sync and async SSB clients."""
+
+	max_retries: int = 3
+	backoff_base: float = 0.5
+	backoff_max: float = 5.0
+	# Upper bound on the wall-clock time a single call may spend across all attempts
+	budget_seconds: float = 60.0
+
+	def begin(self) -> "RetryState":
+		return RetryState(self)
+
+	def should_retry_status(self, status_code: int, idempotent: bool) -> bool:
+		if status_code not in RETRYABLE_STATUSES:
+			return False
+		return idempotent or status_code in UNPROCESSED_STATUSES
+
+	def backoff(self, retry_number: int, retry_after: Optional[float] = None) -> float:
+		"""Delay before the given retry (1-based), using full jitter unless the server asked for a specific wait."""
+		if retry_after is not None:
+			return retry_after + random.uniform(0, self.backoff_base)
+		ceiling = min(self.backoff_max, self.backoff_base * (2 ** (retry_number - 1)))
+		return random.uniform(0, ceiling)
+
+
+class RetryState:
+	"""Tracks attempts and elapsed time for one logical call."""
+
+	def __init__(self, policy: RetryPolicy):
+		self.policy = policy
+		self.retries = 0
+		self.started = time.monotonic()
+
+	def next_delay(self, retryable: bool, retry_after: Optional[float] = None) -> Optional[float]:
+		"""Return how long to wait before retrying, or None if the call should fail now."""
+		if not retryable or self.retries >= self.policy.max_retries:
+			return None
+		delay = self.policy.backoff(self.retries + 1, retry_after)
+		elapsed = time.monotonic() - self.started
+		if elapsed + delay > self.policy.budget_seconds:
+			return None
+		self.retries += 1
+		return delay
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import secrets
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import anyio
+
+
+def record_digest(record: Any) -> bytes:
+	"""Stable 64-bit digest of a sample record, independent of key order."""
+	payload = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+	return hashlib.blake2b(payload.encode(), digest_size=8).digest()
+
+
+class SampleTail:
+	"""Tail state for one sample: a bounded seen-set plus the most recent new records.
+
+	Every record not seen before gets the next sequence number. A cursor is the last
+	sequence number a caller has received, so several callers can tail the same
+	sample independently as long as they keep up with the retained window.
+	"""
+
+	def __init__(self, max_records: int, max_digests: int):
+		self.epoch = secrets.token_hex(4)
+		self.seq = 0
+		self.max_digests = max_digests
+		self._seen: "OrderedDict[bytes, None]" = OrderedDict()
+		self._records: Deque[Tuple[int, Any]] = deque(maxlen=max_records)
+
+	def ingest(self, records: List[Any]) -> int:
+		"""Add unseen records and return how many were new."""
+		added = 0
+		for record in records:
+			digest = record_digest(record)
+			if digest in self._seen:
+				self._seen.move_to_end(digest)
+				continue
+			self._seen[digest] = None
+			if len(self._seen) > self.max_digests:
+				self._seen.popitem(last=False)
+			self.seq += 1
+			self._records.append((self.seq, record))
+			added += 1
+		return added
+
+	def since(self, seq: int) -> Tuple[List[Any], int]:
+		"""Records after the given sequence number and the count that fell out of the window."""
+		oldest = self._records[0][0] if self._records else self.seq + 1
+		dropped = max(0, oldest - seq - 1)
+		return [record for record_seq, record in self._records if record_seq > seq], dropped
+
+	def cursor(self) -> str:
+		return f"{self.epoch}:{self.seq}"
+
+
+class SampleTailer:
+	"""Per-sample tail state, keeping at most ``max_samples`` tails (least recently used evicted)."""
+
+	def __init__(self, max_records: int = 1000, max_samples: int = 64):
+		self.max_records = max_records
+		self.max_samples = max_samples
+		self._tails: "OrderedDict[str, SampleTail]" = OrderedDict()
+		self._lock = threading.Lock()
+
+	def _tail(self, sample_id: str) -> SampleTail:
+		tail = self._tails.get(sample_id)
+		if tail is None:
+			tail = SampleTail(self.max_records, max_digests=self.max_records * 10)
+			self._tails[sample_id] = tail
+			while len(self._tails) > self.max_samples:
+				self._tails.popitem(last=False)
+		self._tails.move_to_end(sample_id)
+		return tail
+
+	def advance(self, sample_id: str, records: List[Any], cursor: Optional[str]) -> Dict[str, Any]:
+		"""Ingest a fresh sample payload and return what the cursor holder has not seen yet."""
+		with self._lock:
+			tail = self._tail(sample_id)
+			tail.ingest(records)
+			since, reset = self._parse_cursor(tail, cursor)
+			new_records, dropped = tail.since(since)
+			result: Dict[str, Any] = {
+				"sample_id": sample_id,
+				"records": new_records,
+				"new_records": len(new_records),
+				"cursor": tail.cursor(),
+			}
+			if dropped and cursor and not reset:
+				result["records_dropped"] = dropped
+			if reset:
+				result["cursor_reset"] = True
+			return result
+
+	@staticmethod
+	def _parse_cursor(tail: SampleTail, cursor: Optional[str]) -> Tuple[int, bool]:
+		"""Translate a cursor into a sequence number; unknown cursors restart from the retained window."""
+		if not cursor:
+			return 0, False
+		epoch, _, seq = cursor.partition(":")
+		if epoch != tail.epoch or not seq.isdigit():
+			return 0, True
+		return int(seq), False
+
+
+class SampleRingBuffer:
+	"""Recent records of one sample, bounded by record count and encoded bytes.
+
+	Records are de-duplicated by digest and stored as encoded chunks (one per
+	ingested batch), optionally zlib-compressed. The oldest chunks are evicted
+	first whenever either bound is exceeded.
+	"""
+
+	def __init__(self, max_records: int, max_bytes: int, compress: bool = True):
+		self.max_records = max_records
+		self.max_bytes = max_bytes
+		self.compress = compress
+		self.seq = 0
+		self.record_count = 0
+		self.byte_count = 0
+		self.last_access = time.monotonic()
+		self._chunks: Deque[Tuple[int, int, bytes]] = deque()
+		self._seen: "OrderedDict[bytes, None]" = OrderedDict()
+
+	def _encode(self, records: List[Any]) -> bytes:
+		data = json.dumps(records, separators=(",", ":"), default=str).encode()
+		return zlib.compress(data, 1) if self.compress else data
+
+	def _decode(self, data: bytes) -> List[Any]:
+		return json.loads(zlib.decompress(data) if self.compress else data)
+
+	def ingest(self, records: List[Any]) -> List[Any]:
+		"""Append unseen records and return them (even those too many to retain)."""
+		fresh: List[Any] = []
+		for record in records:
+			digest = record_digest(record)
+			if digest in self._seen:
+				self._seen.move_to_end(digest)
+				continue
+			self._seen[digest] = None
+			if len(self._seen) > self.max_records * 10:
+				self._seen.popitem(last=False)
+			fresh.append(record)
+		if not fresh:
+			return fresh
+
+		kept = fresh[-self.max_records:]
+		data = self._encode(kept)
+		while len(data) > self.max_bytes and len(kept) > 1:
+			kept = kept[len(kept) // 2:]
+			data = self._encode(kept)
+		self.seq += len(fresh)
+		if len(data) > self.max_bytes:
+			return fresh
+
+		self._chunks.append((self.seq - len(kept) + 1, len(kept), data))
+		self.record_count += len(kept)
+		self.byte_count += len(data)
+		while self.record_count > self.max_records or self.byte_count > self.max_bytes:
+			_, count, old = self._chunks.popleft()
+			self.record_count -= count
+			self.byte_count -= len(old)
+		return fresh
+
+	def window(self, last_n: int) -> List[Any]:
+		"""The most recent ``last_n`` records, oldest first."""
+		self.last_access = time.monotonic()
+		collected: List[Any] = []
+		for _, _, data in reversed(self._chunks):
+			collected[:0] = self._decode(data)
+			if len(collected) >= last_n:
+				break
+		return collected[-last_n:] if last_n > 0 else []
+
+	def stats(self) -> Dict[str, Any]:
+		return {
+			"records": self.record_count,
+			"bytes": self.byte_count,
+			"total_ingested": self.seq,
+			"compressed": self.compress,
+		}
+
+
+class SampleBufferStore:
+	"""Ring buffers for the samples being tracked, evicting the least recently used."""
+
+	def __init__(self, max_records: int = 5000, max_bytes: int = 4 * 1024 * 1024, compress: bool = True, max_samples: int = 16):
+		self.max_records = max_records
+		self.max_bytes = max_bytes
+		self.compress = compress
+		self.max_samples = max_samples
+		self._buffers: "OrderedDict[str, SampleRingBuffer]" = OrderedDict()
+		self._lock = threading.Lock()
+
+	def track(self, sample_id: str) -> None:
+		"""Start buffering records for a sample."""
+		with self._lock:
+			if sample_id not in self._buffers:
+				self._buffers[sample_id] = SampleRingBuffer(self.max_records, self.max_bytes, self.compress)
+			self._buffers.move_to_end(sample_id)
+			while len(self._buffers) > self.max_samples:
+				self._buffers.popitem(last=False)
+
+	def forget(self, sample_id: str) -> None:
+		with self._lock:
+			self._buffers.pop(sample_id, None)
+
+	def is_tracked(self, sample_id: str) -> bool:
+		with self._lock:
+			return sample_id in self._buffers
+
+	def append(self, sample_id: str, records: List[Any]) -> List[Any]:
+		"""Add records to a tracked sample's buffer and return the new ones; untracked samples are ignored."""
+		with self._lock:
+			buffer = self._buffers.get(sample_id)
+			return buffer.ingest(records) if buffer else []
+
+	def touch(self, sample_id: str) -> None:
+		"""Mark a tracked sample as recently used without reading its records."""
+		with self._lock:
+			buffer = self._buffers.get(sample_id)
+			if buffer is not None:
+				buffer.last_access = time.monotonic()
+				self._buffers.move_to_end(sample_id)
+
+	def window(self, sample_id: str, last_n: int) -> Optional[Dict[str, Any]]:
+		with self._lock:
+			buffer = self._buffers.get(sample_id)
+			if buffer is None:
+				return None
+			self._buffers.move_to_end(sample_id)
+			return {"records": buffer.window(last_n), "buffer": buffer.stats()}
+
+	def version(self, sample_id: str) -> Optional[int]:
+		"""Total records ever ingested for a tracked sample; changes whenever new records arrive."""
+		with self._lock:
+			buffer = self._buffers.get(sample_id)
+			return buffer.seq if buffer else None
+
+	def idle_since(self, sample_id: str) -> Optional[float]:
+		with self._lock:
+			buffer = self._buffers.get(sample_id)
+			return time.monotonic() - buffer.last_access if buffer else None
+
+	def stats(self) -> Dict[str, Any]:
+		with self._lock:
+			return {sample_id: buffer.stats() for sample_id, buffer in self._buffers.items()}
+
+
+class SamplePoller:
+	"""Background poller that keeps the ring buffers of subscribed samples filled.
+
+	``fetch`` is the client's _fetch_sample coroutine, which appends the records of
+	tracked samples to the buffer store without spilling or decorating the response. Subscriptions whose buffer has not been read
+	for ``idle_seconds`` are dropped so abandoned subscriptions stop polling.
+	"""
+
+	def __init__(self, fetch: Callable[[str], Awaitable[Dict[str, Any]]], store: SampleBufferStore, idle_seconds: float = 600.0, max_concurrency: int = 4):
+		self.fetch = fetch
+		self.store = store
+		self.idle_seconds = idle_seconds
+		self.max_concurrency = max_concurrency
+		self._subscriptions: Dict[str, Dict[str, Any]] = {}
+		self._wakeup = anyio.Event()
+		self._run_lock = anyio.Lock()
+
+	def subscribe(self, sample_id: str, interval_seconds: float) -> Dict[str, Any]:
+		self.store.track(sample_id)
+		self._subscriptions[sample_id] = {
+			"interval_seconds": max(0.5, interval_seconds),
+			"next_due": time.monotonic(),
+			"polls": 0,
+			"last_error": None,
+		}
+		self._wakeup.set()
+		return {"sample_id": sample_id, "subscribed": True, "interval_seconds": self._subscriptions[sample_id]["interval_seconds"]}
+
+	def unsubscribe(self, sample_id: str) -> Dict[str, Any]:
+		existed = self._subscriptions.pop(sample_id, None) is not None
+		return {"sample_id": sample_id, "unsubscribed": existed}
+
+	def subscriptions(self) -> Dict[str, Any]:
+		return {
+			sample_id: {k: v for k, v in sub.items() if k != "next_due"}
+			for sample_id, sub in self._subscriptions.items()
+		}
+
+	async def run(self) -> None:
+		"""Poll until cancelled. Concurrent runners (one per session) take turns owning the loop."""
+		async with self._run_lock:
+			while True:
+				await self._poll_due()
+				await self._sleep_until_next_due()
+
+	async def _poll_due(self) -> None:
+		now = time.monotonic()
+		due = []
+		for sample_id, sub in list(self._subscriptions.items()):
+			idle = self.store.idle_since(sample_id)
+			if idle is None or idle > self.idle_seconds:
+				# Buffer evicted or never read for too long: stop polling it
+				self._subscriptions.pop(sample_id, None)
+				continue
+			if sub["next_due"] <= now:
+				due.append(sample_id)
+		limiter = anyio.CapacityLimiter(self.max_concurrency)
+
+		async def poll(sample_id: str) -> None:
+			error = None
+			async with limiter:
+				try:
+					await self.fetch(sample_id)
+				except Exception as e:
+					error = str(e)
+			sub = self._subscriptions.get(sample_id)
+			if sub is not None:
+				sub["polls"] += 1
+				sub["last_error"] = error
+				sub["next_due"] = time.monotonic() + sub["interval_seconds"]
+
+		async with anyio.create_task_group() as tg:
+			for sample_id in due:
+				tg.start_soon(poll, sample_id)
+
+	async def _sleep_until_next_due(self) -> None:
+		if self._subscriptions:
+			delay = min(sub["next_due"] for sub in self._subscriptions.values()) - time.monotonic()
+		else:
+			delay = self.idle_seconds
+		self._wakeup = anyio.Event()
+		with anyio.move_on_after(max(0.05, delay)):
+			await self._wakeup.wait()
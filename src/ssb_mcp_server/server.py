@@ -1,14 +1,35 @@
 from __future__ import annotations
 
+import functools
 import json
 import os
-from typing import Any, Dict, List, Optional
+from contextlib import asynccontextmanager
+from typing import Annotated, Any, AsyncIterator, Dict, List, Literal, Optional
 
 import anyio
+import httpx
+import requests
+from pydantic import Field
 
 from .config import ServerConfig
 from .auth import KnoxAuthFactory
 from .client import SSBClient
+from .async_client import AsyncSSBClient
+from .breaker import BackendUnavailableError, CircuitBreakerRegistry
+from .budget import ResponseBudget, parse_budgets
+from .cache import CatalogCache, parse_ttls
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .sampling import SampleBufferStore, SamplePoller, SampleTailer
+from .idempotency import SubmissionTable
+from .localsql import LocalSampleEngine
+from .pagination import PageCache
+from .projection import project
+from .sketches import SampleSketches
+from .tabular import format_tabular
+from .spill import SampleSpillStore
+from .sqlcheck import SqlValidationError
+from .sqlsession import SqlSession
 
 
 # Lazy import of MCP to give a clear error if the dependency is missing
@@ -21,45 +42,140 @@ except Exception as e:  # pragma: no cover
 	) from e
 
 
+class _BudgetedFastMCP(FastMCP):
+	"""FastMCP whose tool results are shaped to fit the response budget before serialization."""
+
+	def __init__(self, name: str, response_budget: ResponseBudget, page_cache: PageCache, **kwargs: Any):
+		super().__init__(name, **kwargs)
+		self._response_budget = response_budget
+		self._page_cache = page_cache
+
+	def tool(self, *args: Any, paged: bool = False, **kwargs: Any):
+		"""Register a tool; only ``paged`` tools (served by _handle_paged_operation) get budget continuation cursors."""
+		register = super().tool(*args, **kwargs)
+		pages = self._page_cache if paged else None
+
+		def decorator(fn):
+			@functools.wraps(fn)
+			async def shaped(*fn_args: Any, **fn_kwargs: Any) -> Any:
+				result = await fn(*fn_args, **fn_kwargs)
+				return self._response_budget.shape(result, fn.__name__, pages)
+			return register(shaped)
+		return decorator
+
+
+# Compared case-insensitively against every key
+_REDACT_KEYS = frozenset({"password", "passcode", "token", "secret", "kerberoskeytab", "sslkeystorepasswd"})
+
+
+def _needs_redaction(obj: Any, max_items: int) -> bool:
+	"""Cheap pre-scan: does the payload hold a sensitive key or a list longer than max_items?"""
+	stack = [obj]
+	while stack:
+		node = stack.pop()
+		if isinstance(node, dict):
+			for k, v in node.items():
+				if isinstance(k, str) and k.lower() in _REDACT_KEYS:
+					return True
+				if isinstance(v, (dict, list)):
+					stack.append(v)
+		elif isinstance(node, list):
+			if len(node) > max_items:
+				return True
+			stack.extend(x for x in node if isinstance(x, (dict, list)))
+	return False
+
+
 def _redact_sensitive(obj: Any, max_items: int = 200) -> Any:
-	"""Redact common sensitive fields and truncate large collections for LLMs."""
-	redact_keys = {"password", "passcode", "token", "secret", "kerberosKeytab", "sslKeystorePasswd"}
-	if isinstance(obj, dict):
-		redacted: Dict[str, Any] = {}
-		for k, v in obj.items():
-			if k.lower() in redact_keys:
-				redacted[k] = "***REDACTED***"
-			else:
-				redacted[k] = _redact_sensitive(v, max_items)
-		return redacted
-	if isinstance(obj, list):
-		if len(obj) > max_items:
-			return [_redact_sensitive(x, max_items) for x in obj[:max_items]] + [
-				{"truncated": True, "omitted_count": len(obj) - max_items}
-			]
-		return [_redact_sensitive(x, max_items) for x in obj]
-	return obj
-
-
-def _handle_ssb_operation(operation_func, *args, **kwargs) -> Dict[str, Any]:
+	"""Redact common sensitive fields and truncate large collections for LLMs.
+
+	Payloads that need neither are returned as-is (callers must not mutate them,
+	as they may be shared with caches). Otherwise the copy is built iteratively so
+	deeply nested documents cannot exhaust the stack.
+	"""
+	if not _needs_redaction(obj, max_items):
+		return obj
+	root: List[Any] = [None]
+	stack: List[tuple] = [(obj, root, 0)]
+	while stack:
+		node, parent, slot = stack.pop()
+		if isinstance(node, dict):
+			redacted: Dict[str, Any] = {}
+			for k, v in node.items():
+				if isinstance(k, str) and k.lower() in _REDACT_KEYS:
+					redacted[k] = "***REDACTED***"
+				else:
+					redacted[k] = v
+					if isinstance(v, (dict, list)):
+						stack.append((v, redacted, k))
+			parent[slot] = redacted
+		else:
+			kept = list(node[:max_items])
+			for i, x in enumerate(kept):
+				if isinstance(x, (dict, list)):
+					stack.append((x, kept, i))
+			if len(node) > max_items:
+				kept.append({"truncated": True, "omitted_count": len(node) - max_items})
+			parent[slot] = kept
+	return root[0]
+
+
+def _error_response(e: Exception) -> Dict[str, Any]:
+	# Return error information in a structured format that Claude can understand
+	error_response = {
+		"error": True,
+		"error_type": type(e).__name__,
+		"error_message": str(e),
+		"message": f"Operation failed: {str(e)}"
+	}
+	if isinstance(e, BackendUnavailableError):
+		error_response["backend_unavailable"] = True
+		error_response["circuit"] = e.circuit
+		error_response["retry_after_seconds"] = round(e.retry_after, 1)
+	if isinstance(e, SqlValidationError):
+		error_response.update(e.details)
+	return error_response
+
+
+async def _handle_ssb_operation(operation_func, *args, fields: Optional[List[str]] = None, output_format: Optional[str] = None, **kwargs) -> Dict[str, Any]:
 	"""Handle SSB operations with proper error handling and redaction."""
 	try:
-		data = operation_func(*args, **kwargs)
-		return _redact_sensitive(data)
+		data = await operation_func(*args, **kwargs)
+		return format_tabular(_redact_sensitive(project(data, fields)), output_format)
 	except Exception as e:
-		# Return error information in a structured format that Claude can understand
-		error_response = {
-			"error": True,
-			"error_type": type(e).__name__,
-			"error_message": str(e),
-			"message": f"Operation failed: {str(e)}"
-		}
-		return error_response
+		return _error_response(e)
+
+
+async def _handle_paged_operation(pages: PageCache, page_size: Optional[int], cursor: Optional[str], list_key: Optional[str],
+                                  operation_func, *args, fields: Optional[List[str]] = None, output_format: Optional[str] = None,
+                                  **kwargs) -> Dict[str, Any]:
+	"""Like _handle_ssb_operation, but return long lists a page at a time behind a continuation cursor.
+
+	A cursor is served from the page cache without calling SSB again, keeping the
+	projection of the call that created it.
+	"""
+	if cursor:
+		page = pages.next_page(cursor, page_size)
+		if page is None:
+			return {
+				"error": True,
+				"error_type": "CursorExpired",
+				"error_message": f"Cursor '{cursor}' is unknown or has expired",
+				"message": "Cursor expired; call the tool again without a cursor to start over",
+			}
+		try:
+			return format_tabular(_redact_sensitive(page), output_format)
+		except ValueError as e:
+			return _error_response(e)
+	try:
+		data = await operation_func(*args, **kwargs)
+		return format_tabular(_redact_sensitive(pages.first_page(project(data, fields), page_size, list_key)), output_format)
+	except Exception as e:
+		return _error_response(e)
 
 
-def build_client(config: ServerConfig) -> SSBClient:
+def _build_session(config: ServerConfig) -> requests.Session:
 	verify = config.build_verify()
-	ssb_base = config.build_ssb_base()
 	
 	# Use Knox authentication if Knox is configured, otherwise use direct SSB authentication
 	if config.knox_gateway_url:
@@ -76,502 +192,687 @@ def build_client(config: ServerConfig) -> SSBClient:
 		session = auth.build_session()
 	else:
 		# Direct SSB authentication
-		import requests
 		session = requests.Session()
 		session.verify = verify
 		if config.ssb_user and config.ssb_password:
 			session.auth = (config.ssb_user, config.ssb_password)
+	return session
+
+
+def _build_rate_limiter(config: ServerConfig) -> RateLimiter:
+	return RateLimiter(
+		read_rps=config.rate_limit_rps,
+		write_rps=config.rate_limit_write_rps,
+		execute_rps=config.rate_limit_execute_rps,
+		burst=config.rate_limit_burst,
+	)
+
+
+def _build_retry_policy(config: ServerConfig) -> RetryPolicy:
+	return RetryPolicy(
+		max_retries=config.max_retries,
+		budget_seconds=config.retry_budget_seconds,
+	)
+
+
+def _build_circuit_breakers(config: ServerConfig) -> Optional[CircuitBreakerRegistry]:
+	if config.breaker_failure_threshold <= 0:
+		return None
+	return CircuitBreakerRegistry(
+		failure_threshold=config.breaker_failure_threshold,
+		reset_timeout=config.breaker_reset_seconds,
+	)
+
+
+# Optional projection argument accepted by every SSB-backed tool
+Fields = Annotated[Optional[List[str]], Field(
+	description="Only return these dotted paths, e.g. ['jobs.name', 'jobs.state']; lists are traversed implicitly and '*' matches any key",
+)]
+
+# Opt-in compact encodings for tabular results (sample records, query table data)
+OutputFormat = Annotated[Literal["json", "columns", "csv", "markdown"], Field(
+	description="Encoding of tabular data: 'json' rows (default), 'columns' ({columns, rows}), 'csv' or 'markdown'",
+)]
+
+
+def _build_page_cache(config: ServerConfig) -> PageCache:
+	return PageCache(ttl_seconds=config.page_cache_ttl_seconds, default_page_size=config.default_page_size)
+
+
+def _build_response_budget(config: ServerConfig) -> ResponseBudget:
+	return ResponseBudget(config.response_max_bytes, parse_budgets(config.response_budgets_csv))
+
+
+def _build_sample_buffers(config: ServerConfig) -> SampleBufferStore:
+	return SampleBufferStore(
+		max_records=config.sample_buffer_max_records,
+		max_bytes=config.sample_buffer_max_bytes,
+		compress=config.sample_buffer_compress,
+		max_samples=config.sample_buffer_max_samples,
+	)
+
+
+def build_client(config: ServerConfig) -> SSBClient:
+	ssb_base = config.build_ssb_base()
+	session = _build_session(config)
 	
 	return SSBClient(
 		ssb_base,
 		session,
 		timeout_seconds=config.timeout_seconds,
 		proxy_context_path=config.proxy_context_path,
+		rate_limiter=_build_rate_limiter(config),
+		retry_policy=_build_retry_policy(config),
+		circuit_breakers=_build_circuit_breakers(config),
+		jobs_cache_ttl=config.jobs_cache_ttl_seconds,
+		sample_fanout_workers=config.sample_fanout_workers,
+		sample_fanout_deadline=config.sample_fanout_deadline_seconds,
+		sample_fanout_keep_seconds=config.sample_fanout_keep_seconds,
+		sample_count_max_bytes=config.sample_count_max_bytes,
+		ddl_concurrency=config.ddl_concurrency,
+		sql_prevalidate=config.sql_prevalidate,
+		submissions=SubmissionTable(config.dedup_window_seconds),
+		sample_tailer=SampleTailer(config.sample_tail_max_records, config.sample_tail_max_samples),
+		sample_buffers=_build_sample_buffers(config),
+		sample_sketches=SampleSketches(config.sample_buffer_max_samples),
+		local_sql=LocalSampleEngine(max_rows=config.local_sql_max_rows),
+		sample_spills=SampleSpillStore(config.sample_spill_threshold, config.sample_spill_dir, config.sample_spill_max_files),
+		catalog_cache=CatalogCache(parse_ttls(config.catalog_cache_ttls_csv)),
+		sql_session=SqlSession(
+			config.sql_metadata_ttl_seconds,
+			schema_ttl=config.schema_cache_ttl_seconds,
+			analysis_ttl=config.analyze_cache_ttl_seconds,
+			max_analyses=config.analyze_cache_size,
+		),
+	)
+
+
+def build_async_client(config: ServerConfig) -> AsyncSSBClient:
+	ssb_base = config.build_ssb_base()
+	# Reuse the Knox/SSB auth negotiation, then carry its credentials over to httpx
+	session = _build_session(config)
+	default_headers = requests.utils.default_headers()
+	headers = {k: v for k, v in session.headers.items() if default_headers.get(k) != v}
+	http = httpx.AsyncClient(
+		headers=headers,
+		auth=session.auth,
+		verify=session.verify,
+		limits=httpx.Limits(
+			max_connections=config.max_connections,
+			max_keepalive_connections=config.max_connections,
+		),
+	)
+	
+	return AsyncSSBClient(
+		ssb_base,
+		http,
+		timeout_seconds=config.timeout_seconds,
+		proxy_context_path=config.proxy_context_path,
+		rate_limiter=_build_rate_limiter(config),
+		retry_policy=_build_retry_policy(config),
+		circuit_breakers=_build_circuit_breakers(config),
+		jobs_cache_ttl=config.jobs_cache_ttl_seconds,
+		sample_fanout_workers=config.sample_fanout_workers,
+		sample_fanout_deadline=config.sample_fanout_deadline_seconds,
+		sample_fanout_keep_seconds=config.sample_fanout_keep_seconds,
+		sample_count_max_bytes=config.sample_count_max_bytes,
+		ddl_concurrency=config.ddl_concurrency,
+		sql_prevalidate=config.sql_prevalidate,
+		submissions=SubmissionTable(config.dedup_window_seconds),
+		sample_tailer=SampleTailer(config.sample_tail_max_records, config.sample_tail_max_samples),
+		sample_buffers=_build_sample_buffers(config),
+		sample_sketches=SampleSketches(config.sample_buffer_max_samples),
+		local_sql=LocalSampleEngine(max_rows=config.local_sql_max_rows),
+		sample_spills=SampleSpillStore(config.sample_spill_threshold, config.sample_spill_dir, config.sample_spill_max_files),
+		catalog_cache=CatalogCache(parse_ttls(config.catalog_cache_ttls_csv)),
+		sql_session=SqlSession(
+			config.sql_metadata_ttl_seconds,
+			schema_ttl=config.schema_cache_ttl_seconds,
+			analysis_ttl=config.analyze_cache_ttl_seconds,
+			max_analyses=config.analyze_cache_size,
+		),
 	)
 
 
-def create_server(ssb: SSBClient, readonly: bool) -> FastMCP:
-	app = FastMCP("ssb-mcp-server")
+def create_server(ssb: AsyncSSBClient, readonly: bool, subscription_idle_seconds: float = 600.0, pages: Optional[PageCache] = None,
+                  budget: Optional[ResponseBudget] = None) -> FastMCP:
+	pages = pages or PageCache()
+	budget = budget or ResponseBudget()
+	poller = SamplePoller(ssb._fetch_sample, ssb.sample_buffers, idle_seconds=subscription_idle_seconds)
+
+	@asynccontextmanager
+	async def poll_subscribed_samples(_: FastMCP) -> AsyncIterator[None]:
+		async with anyio.create_task_group() as tg:
+			tg.start_soon(poller.run)
+			yield
+			tg.cancel_scope.cancel()
+
+	app = _BudgetedFastMCP("ssb-mcp-server", budget, pages, lifespan=poll_subscribed_samples)
 
 	@app.tool()
-	async def get_ssb_info() -> Dict[str, Any]:
+	async def get_ssb_info(fields: Fields = None) -> Dict[str, Any]:
 		"""Get SSB version and system information."""
-		data = ssb.get_ssb_info()
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.get_ssb_info, fields=fields)
 
-	@app.tool()
-	async def list_streams() -> Dict[str, Any]:
-		"""List all SQL streams in SSB."""
-		data = ssb.list_streams()
-		return _redact_sensitive(data)
+	@app.tool(paged=True)
+	async def list_streams(page_size: Optional[int] = None, cursor: Optional[str] = None, fields: Fields = None) -> Dict[str, Any]:
+		"""List all SQL streams in SSB. Long lists are paged; pass the returned page.next_cursor to continue."""
+		return await _handle_paged_operation(pages, page_size, cursor, "jobs", ssb.list_streams, fields=fields)
 
 	@app.tool()
-	async def get_stream(stream_name: str) -> Dict[str, Any]:
+	async def get_stream(stream_name: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Get details of a specific SQL stream."""
-		data = ssb.get_stream(stream_name)
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.get_stream, stream_name, fields=fields)
 
 	@app.tool()
-	async def get_stream_status(stream_name: str) -> Dict[str, Any]:
+	async def get_stream_status(stream_name: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Get the status of a SQL stream (running, stopped, etc.)."""
-		data = ssb.get_stream_status(stream_name)
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.get_stream_status, stream_name, fields=fields)
 
 	@app.tool()
-	async def get_stream_metrics(stream_name: str) -> Dict[str, Any]:
+	async def get_stream_metrics(stream_name: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Get performance metrics for a SQL stream."""
-		data = ssb.get_stream_metrics(stream_name)
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.get_stream_metrics, stream_name, fields=fields)
 
 	@app.tool()
-	async def list_tables() -> Dict[str, Any]:
+	async def list_tables(fields: Fields = None) -> Dict[str, Any]:
 		"""List all available tables in SSB."""
-		data = ssb.list_tables()
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.list_tables, fields=fields)
 
 	@app.tool()
-	async def get_table_schema(table_name: str) -> Dict[str, Any]:
-		"""Get schema information for a specific table."""
-		data = ssb.get_table_schema(table_name)
-		return _redact_sensitive(data)
+	async def get_table_schema(table_name: str, fields: Fields = None) -> Dict[str, Any]:
+		"""Get the columns of a table (name, type, nullable, key, watermark) via DESCRIBE. Accepts table, database.table or catalog.database.table."""
+		return await _handle_ssb_operation(ssb.get_table_schema, table_name, fields=fields)
 
 	@app.tool()
-	async def execute_query(sql_query: str, limit: Optional[int] = None) -> Dict[str, Any]:
-		"""Execute a SQL query against SSB."""
-		return _handle_ssb_operation(ssb.execute_query, sql_query, limit)
+	async def execute_query(sql_query: str, limit: Optional[int] = None, allow_duplicate: bool = False, fields: Fields = None, output_format: OutputFormat = "json") -> Dict[str, Any]:
+		"""Execute a SQL query against SSB. Repeating a query whose job is still running returns that job (deduplicated: true) unless allow_duplicate is set."""
+		return await _handle_ssb_operation(ssb.execute_query, sql_query, limit, allow_duplicate=allow_duplicate, fields=fields, output_format=output_format)
 
 	@app.tool()
-	async def list_udfs() -> Dict[str, Any]:
+	async def list_udfs(fields: Fields = None) -> Dict[str, Any]:
 		"""List all available user-defined functions."""
-		data = ssb.list_udfs()
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.list_udfs, fields=fields)
 
 	@app.tool()
-	async def get_udf(udf_name: str) -> Dict[str, Any]:
+	async def get_udf(udf_name: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Get details of a specific user-defined function."""
-		data = ssb.get_udf(udf_name)
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.get_udf, udf_name, fields=fields)
 
 	@app.tool()
-	async def list_connectors() -> Dict[str, Any]:
+	async def list_connectors(fields: Fields = None) -> Dict[str, Any]:
 		"""List all available connectors."""
-		data = ssb.list_connectors()
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.list_connectors, fields=fields)
 
 	@app.tool()
-	async def get_connector(connector_name: str) -> Dict[str, Any]:
+	async def get_connector(connector_name: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Get details of a specific connector."""
-		data = ssb.get_connector(connector_name)
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.get_connector, connector_name, fields=fields)
 
 	@app.tool()
-	async def list_topics() -> Dict[str, Any]:
+	async def list_topics(fields: Fields = None) -> Dict[str, Any]:
 		"""List all Kafka topics."""
-		data = ssb.list_topics()
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.list_topics, fields=fields)
 
 	@app.tool()
-	async def get_topic(topic_name: str) -> Dict[str, Any]:
+	async def get_topic(topic_name: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Get details of a specific Kafka topic."""
-		data = ssb.get_topic(topic_name)
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.get_topic, topic_name, fields=fields)
 
 	@app.tool()
-	async def get_cluster_info() -> Dict[str, Any]:
+	async def get_cluster_info(fields: Fields = None) -> Dict[str, Any]:
 		"""Get SSB cluster information."""
-		data = ssb.get_cluster_info()
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.get_cluster_info, fields=fields)
 
 	@app.tool()
-	async def get_cluster_health() -> Dict[str, Any]:
+	async def get_cluster_health(fields: Fields = None) -> Dict[str, Any]:
 		"""Get SSB cluster health status."""
-		data = ssb.get_cluster_health()
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.get_cluster_health, fields=fields)
 	
 	@app.tool()
-	async def get_job_status(job_id: int) -> Dict[str, Any]:
+	async def get_job_status(job_id: int, fields: Fields = None) -> Dict[str, Any]:
 		"""Get status of a specific SSB job."""
-		data = ssb.get_job_status(job_id)
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.get_job_status, job_id, fields=fields)
+	
+	@app.tool(paged=True)
+	async def get_job_sample(sample_id: str, page_size: Optional[int] = None, cursor: Optional[str] = None, fields: Fields = None,
+	                         output_format: OutputFormat = "json") -> Dict[str, Any]:
+		"""Get sample data from a job execution. Records are paged; pass the returned page.next_cursor to continue."""
+		return await _handle_paged_operation(pages, page_size, cursor, "records", ssb.get_job_sample, sample_id, fields=fields, output_format=output_format)
 	
 	@app.tool()
-	async def get_job_sample(sample_id: str) -> Dict[str, Any]:
-		"""Get sample data from a job execution."""
-		data = ssb.get_job_sample(sample_id)
-		return _redact_sensitive(data)
+	async def read_sample_spill(spill_id: str, offset: int = 0, limit: int = 100, fields: Fields = None, output_format: OutputFormat = "json") -> Dict[str, Any]:
+		"""Read a page of records from a large sample that get_job_sample wrote to disk."""
+		return await _handle_ssb_operation(ssb.read_sample_spill, spill_id, offset, limit, fields=fields, output_format=output_format)
 	
 	@app.tool()
-	async def get_job_sample_by_id(job_id: int) -> Dict[str, Any]:
-		"""Get sample data from a job by job ID."""
-		data = ssb.get_job_sample_by_id(job_id)
-		return _redact_sensitive(data)
+	async def tail_job_sample(sample_id: str, cursor: Optional[str] = None, fields: Fields = None, output_format: OutputFormat = "json") -> Dict[str, Any]:
+		"""Get only sample records not seen before; pass the returned cursor on the next call to keep tailing."""
+		return await _handle_ssb_operation(ssb.tail_job_sample, sample_id, cursor, fields=fields, output_format=output_format)
+	
+	@app.tool()
+	async def summarize_job_sample(sample_id: str, histogram_bins: int = 10, top_k: int = 5, fields: Fields = None) -> Dict[str, Any]:
+		"""Get per-column statistics (null rate, min/max/mean/percentiles, histogram, top values) of a sample."""
+		return await _handle_ssb_operation(ssb.summarize_job_sample, sample_id, histogram_bins, top_k, fields=fields)
+	
+	@app.tool()
+	async def query_job_sample(sample_id: str, sql: str, refresh: bool = False, max_rows: Optional[int] = None, fields: Fields = None) -> Dict[str, Any]:
+		"""Run a read-only SELECT over a sample's records locally, without a Flink job. Query the table `sample`; nested fields are dotted column names (quote them). Set refresh=True to reload an unsubscribed sample from SSB."""
+		return await _handle_ssb_operation(ssb.query_job_sample, sample_id, sql, refresh, max_rows, fields=fields)
+	
+	@app.tool()
+	async def subscribe_job_sample(sample_id: str, interval_seconds: float = 5.0) -> Dict[str, Any]:
+		"""Poll a sample in the background into a local ring buffer readable with get_buffered_sample."""
+		return poller.subscribe(sample_id, interval_seconds)
+	
+	@app.tool()
+	async def unsubscribe_job_sample(sample_id: str) -> Dict[str, Any]:
+		"""Stop background polling of a sample; already buffered records stay readable until evicted."""
+		return poller.unsubscribe(sample_id)
+	
+	@app.tool()
+	async def list_sample_subscriptions() -> Dict[str, Any]:
+		"""List subscribed samples with their polling interval, poll count and last error."""
+		return {"subscriptions": poller.subscriptions()}
+	
+	@app.tool()
+	async def sketch_job_sample(sample_id: str, columns: List[str], interval_seconds: float = 5.0) -> Dict[str, Any]:
+		"""Subscribe to a sample and keep distinct-count, top-k and quantile sketches for the given columns (dotted names for nested fields)."""
+		result = await _handle_ssb_operation(ssb.sketch_job_sample, sample_id, columns)
+		if not result.get("error"):
+			result["subscription"] = poller.subscribe(sample_id, interval_seconds)
+		return result
 	
 	@app.tool()
-	async def list_jobs_with_samples() -> Dict[str, Any]:
-		"""List all jobs with their sample information."""
-		data = ssb.list_jobs_with_samples()
-		return _redact_sensitive(data)
+	async def get_sample_sketches(sample_id: str, top_k: int = 10, quantiles: Optional[List[float]] = None, fields: Fields = None) -> Dict[str, Any]:
+		"""Query a sample's sketches: estimated distinct count, top values and quantiles (default 0.5, 0.9, 0.99) per column."""
+		return await _handle_ssb_operation(ssb.get_sample_sketches, sample_id, top_k, quantiles, fields=fields)
 	
 	@app.tool()
-	async def stop_job(job_id: int, savepoint: bool = True) -> Dict[str, Any]:
+	async def get_buffered_sample(sample_id: str, last_n: int = 100, fields: Fields = None, output_format: OutputFormat = "json") -> Dict[str, Any]:
+		"""Read the most recent records of a subscribed sample from the local buffer, without calling SSB."""
+		return await _handle_ssb_operation(ssb.get_buffered_sample, sample_id, last_n, fields=fields, output_format=output_format)
+	
+	@app.tool()
+	async def get_job_sample_by_id(job_id: int, fields: Fields = None) -> Dict[str, Any]:
+		"""Get sample data from a job by job ID."""
+		return await _handle_ssb_operation(ssb.get_job_sample_by_id, job_id, fields=fields)
+	
+	@app.tool(paged=True)
+	async def list_jobs_with_samples(include_records: bool = False, page_size: Optional[int] = None, cursor: Optional[str] = None, fields: Fields = None) -> Dict[str, Any]:
+		"""List all jobs with their sample information (record counts only unless include_records is set). Jobs are paged via page.next_cursor."""
+		return await _handle_paged_operation(pages, page_size, cursor, "jobs", ssb.list_jobs_with_samples, include_records, fields=fields)
+	
+	@app.tool()
+	async def stop_job(job_id: int, savepoint: bool = True, fields: Fields = None) -> Dict[str, Any]:
 		"""Stop a specific SSB job."""
-		data = ssb.stop_job(job_id, savepoint)
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.stop_job, job_id, savepoint, fields=fields)
 	
 	@app.tool()
-	async def execute_job(job_id: int, sql_query: str) -> Dict[str, Any]:
+	async def execute_job(job_id: int, sql_query: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Execute/restart a specific SSB job with new SQL."""
-		data = ssb.execute_job(job_id, sql_query)
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.execute_job, job_id, sql_query, fields=fields)
 	
 	@app.tool()
-	async def configure_sampling(sample_id: str, sample_interval: int = 1000, sample_count: int = 100, window_size: int = 100, sample_all_messages: bool = False) -> Dict[str, Any]:
+	async def configure_sampling(sample_id: str, sample_interval: int = 1000, sample_count: int = 100, window_size: int = 100, sample_all_messages: bool = False, fields: Fields = None) -> Dict[str, Any]:
 		"""Configure sampling parameters for a job."""
-		data = ssb.configure_sampling(sample_id, sample_interval, sample_count, window_size, sample_all_messages)
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.configure_sampling, sample_id, sample_interval, sample_count, window_size, sample_all_messages, fields=fields)
 	
 	@app.tool()
-	async def execute_query_with_sampling(sql_query: str, sample_interval: int = 1000, sample_count: int = 100, window_size: int = 100, sample_all_messages: bool = False) -> Dict[str, Any]:
-		"""Execute a SQL query with proper sampling configuration."""
-		data = ssb.execute_query_with_sampling(sql_query, sample_interval, sample_count, window_size, sample_all_messages)
-		return _redact_sensitive(data)
+	async def execute_query_with_sampling(sql_query: str, sample_interval: int = 1000, sample_count: int = 100, window_size: int = 100, sample_all_messages: bool = False, allow_duplicate: bool = False, fields: Fields = None) -> Dict[str, Any]:
+		"""Execute a SQL query with proper sampling configuration. Repeating a query whose job is still running returns that job unless allow_duplicate is set."""
+		return await _handle_ssb_operation(ssb.execute_query_with_sampling, sql_query, sample_interval, sample_count, window_size, sample_all_messages, allow_duplicate, fields=fields)
 	
 	@app.tool()
-	async def restart_job_with_sampling(job_id: int, sql_query: str, sample_interval: int = 1000, sample_all_messages: bool = False) -> Dict[str, Any]:
+	async def restart_job_with_sampling(job_id: int, sql_query: str, sample_interval: int = 1000, sample_all_messages: bool = False, fields: Fields = None) -> Dict[str, Any]:
 		"""Restart a job with new SQL and proper sampling configuration."""
-		data = ssb.restart_job_with_sampling(job_id, sql_query, sample_interval, sample_all_messages)
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.restart_job_with_sampling, job_id, sql_query, sample_interval, sample_all_messages, fields=fields)
 	
 	@app.tool()
 	async def create_kafka_table(table_name: str, topic: str, kafka_connector_type: str = "local-kafka", 
 	                           bootstrap_servers: str = "localhost:9092", format_type: str = "json",
-	                           scan_startup_mode: str = "latest-offset", additional_properties: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+	                           scan_startup_mode: str = "latest-offset", additional_properties: Optional[Dict[str, str]] = None,
+	                           fields: Fields = None) -> Dict[str, Any]:
 		"""Create a new table that only uses local-kafka connector."""
-		return _handle_ssb_operation(ssb.create_kafka_table, table_name, topic, kafka_connector_type, bootstrap_servers, format_type, scan_startup_mode, additional_properties)
+		return await _handle_ssb_operation(ssb.create_kafka_table, table_name, topic, kafka_connector_type, bootstrap_servers, format_type, scan_startup_mode, additional_properties, fields=fields)
 	
 	@app.tool()
-	async def validate_kafka_connector(kafka_connector_type: str) -> Dict[str, Any]:
+	async def validate_kafka_connector(kafka_connector_type: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Validate that a connector type is the local-kafka connector and get its properties."""
-		data = ssb.validate_kafka_connector(kafka_connector_type)
-		return _redact_sensitive(data)
+		return await _handle_ssb_operation(ssb.validate_kafka_connector, kafka_connector_type, fields=fields)
 	
 	@app.tool()
-	async def register_kafka_table(table_name: str, topic: str, schema_fields: Optional[List[Dict[str, str]]] = None, use_ssb_prefix: bool = True, catalog: str = "ssb", database: str = "ssb_default") -> Dict[str, Any]:
+	async def register_kafka_table(table_name: str, topic: str, schema_fields: Optional[List[Dict[str, str]]] = None, use_ssb_prefix: bool = True, catalog: str = "ssb", database: str = "ssb_default", fields: Fields = None) -> Dict[str, Any]:
 		"""Register a Kafka table in the Flink catalog using DDL (makes it queryable)."""
-		return _handle_ssb_operation(ssb.register_kafka_table, table_name, topic, schema_fields, use_ssb_prefix, catalog, database)
+		return await _handle_ssb_operation(ssb.register_kafka_table, table_name, topic, schema_fields, use_ssb_prefix, catalog, database, fields=fields)
+
+	@app.tool()
+	async def register_kafka_tables(
+		tables: Annotated[List[Dict[str, Any]], Field(description="Tables to register, each {\"topic\": ..., \"table_name\": optional, defaults to topic, \"schema_fields\": optional [{\"name\", \"type\"}]}")],
+		use_ssb_prefix: bool = True,
+		catalog: str = "ssb",
+		database: str = "ssb_default",
+		max_concurrency: Optional[int] = None,
+		fields: Fields = None,
+	) -> Dict[str, Any]:
+		"""Register several Kafka tables at once: one catalog check, concurrent DDL and a single SHOW TABLES verification. Reports success or failure per table."""
+		return await _handle_ssb_operation(ssb.register_kafka_tables, tables, use_ssb_prefix, catalog, database, max_concurrency, fields=fields)
 
 	# Write operations (only available if not in readonly mode)
 	if not readonly:
 		@app.tool()
-		async def create_stream(stream_name: str, sql_query: str, description: Optional[str] = None) -> Dict[str, Any]:
+		async def create_stream(stream_name: str, sql_query: str, description: Optional[str] = None, fields: Fields = None) -> Dict[str, Any]:
 			"""Create a new SQL stream."""
-			data = ssb.create_stream(stream_name, sql_query, description)
-			return _redact_sensitive(data)
+			return await _handle_ssb_operation(ssb.create_stream, stream_name, sql_query, description, fields=fields)
 
 		@app.tool()
-		async def update_stream(stream_name: str, sql_query: str, description: Optional[str] = None) -> Dict[str, Any]:
+		async def update_stream(stream_name: str, sql_query: str, description: Optional[str] = None, fields: Fields = None) -> Dict[str, Any]:
 			"""Update an existing SQL stream."""
-			data = ssb.update_stream(stream_name, sql_query, description)
-			return _redact_sensitive(data)
+			return await _handle_ssb_operation(ssb.update_stream, stream_name, sql_query, description, fields=fields)
 
 		@app.tool()
-		async def delete_stream(stream_name: str) -> Dict[str, Any]:
+		async def delete_stream(stream_name: str, fields: Fields = None) -> Dict[str, Any]:
 			"""Delete a SQL stream."""
-			data = ssb.delete_stream(stream_name)
-			return _redact_sensitive(data)
+			return await _handle_ssb_operation(ssb.delete_stream, stream_name, fields=fields)
 
 		@app.tool()
-		async def start_stream(stream_name: str) -> Dict[str, Any]:
+		async def start_stream(stream_name: str, fields: Fields = None) -> Dict[str, Any]:
 			"""Start a SQL stream."""
-			data = ssb.start_stream(stream_name)
-			return _redact_sensitive(data)
+			return await _handle_ssb_operation(ssb.start_stream, stream_name, fields=fields)
 
 		@app.tool()
-		async def stop_stream(stream_name: str) -> Dict[str, Any]:
+		async def stop_stream(stream_name: str, fields: Fields = None) -> Dict[str, Any]:
 			"""Stop a SQL stream."""
-			data = ssb.stop_stream(stream_name)
-			return _redact_sensitive(data)
+			return await _handle_ssb_operation(ssb.stop_stream, stream_name, fields=fields)
 
 	# ============================================================================
 	# HIGH-PRIORITY ADDITIONS - ADVANCED JOB MANAGEMENT
 	# ============================================================================
 	
-	@app.tool()
-	async def get_job_events(job_id: int) -> Dict[str, Any]:
-		"""Get detailed job event history and timeline."""
-		return _handle_ssb_operation(ssb.get_job_events, job_id)
+	@app.tool(paged=True)
+	async def get_job_events(job_id: int, page_size: Optional[int] = None, cursor: Optional[str] = None, fields: Fields = None) -> Dict[str, Any]:
+		"""Get detailed job event history and timeline. Events are paged; pass the returned page.next_cursor to continue."""
+		return await _handle_paged_operation(pages, page_size, cursor, None, ssb.get_job_events, job_id, fields=fields)
 	
 	@app.tool()
-	async def get_job_state(job_id: int) -> Dict[str, Any]:
+	async def get_job_state(job_id: int, fields: Fields = None) -> Dict[str, Any]:
 		"""Get comprehensive job state information."""
-		return _handle_ssb_operation(ssb.get_job_state, job_id)
+		return await _handle_ssb_operation(ssb.get_job_state, job_id, fields=fields)
 	
 	@app.tool()
-	async def get_job_mv_endpoints(job_id: int) -> Dict[str, Any]:
+	async def get_job_mv_endpoints(job_id: int, fields: Fields = None) -> Dict[str, Any]:
 		"""Get materialized view endpoints for a job."""
-		return _handle_ssb_operation(ssb.get_job_mv_endpoints, job_id)
+		return await _handle_ssb_operation(ssb.get_job_mv_endpoints, job_id, fields=fields)
 	
 	@app.tool()
-	async def create_job_mv_endpoint(job_id: int, mv_config: Dict[str, Any]) -> Dict[str, Any]:
+	async def create_job_mv_endpoint(job_id: int, mv_config: Dict[str, Any], fields: Fields = None) -> Dict[str, Any]:
 		"""Create or update a materialized view endpoint for a job."""
-		return _handle_ssb_operation(ssb.create_job_mv_endpoint, job_id, mv_config)
+		return await _handle_ssb_operation(ssb.create_job_mv_endpoint, job_id, mv_config, fields=fields)
 	
 	@app.tool()
-	async def copy_job(job_id: int) -> Dict[str, Any]:
+	async def copy_job(job_id: int, fields: Fields = None) -> Dict[str, Any]:
 		"""Duplicate an existing job."""
-		return _handle_ssb_operation(ssb.copy_job, job_id)
+		return await _handle_ssb_operation(ssb.copy_job, job_id, fields=fields)
 	
 	@app.tool()
-	async def copy_data_source(data_source_id: str) -> Dict[str, Any]:
+	async def copy_data_source(data_source_id: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Clone a data source."""
-		return _handle_ssb_operation(ssb.copy_data_source, data_source_id)
+		return await _handle_ssb_operation(ssb.copy_data_source, data_source_id, fields=fields)
 
 	# ============================================================================
 	# HIGH-PRIORITY ADDITIONS - MONITORING & DIAGNOSTICS
 	# ============================================================================
 	
 	@app.tool()
-	async def get_diagnostic_counters() -> Dict[str, Any]:
+	async def get_diagnostic_counters(fields: Fields = None) -> Dict[str, Any]:
 		"""Get system performance counters and diagnostics."""
-		return _handle_ssb_operation(ssb.get_diagnostic_counters)
+		return await _handle_ssb_operation(ssb.get_diagnostic_counters, fields=fields)
 	
 	@app.tool()
-	async def get_heartbeat() -> Dict[str, Any]:
+	async def get_heartbeat(fields: Fields = None) -> Dict[str, Any]:
 		"""Check system health and connectivity."""
-		return _handle_ssb_operation(ssb.get_heartbeat)
+		return await _handle_ssb_operation(ssb.get_heartbeat, fields=fields)
 	
 	@app.tool()
-	async def analyze_sql(sql_query: str) -> Dict[str, Any]:
+	async def get_client_stats() -> Dict[str, Any]:
+		"""Get MCP-side HTTP client statistics (rate limiter wait times, circuit breaker states, cache hit rates)."""
+		result = await _handle_ssb_operation(ssb.get_client_stats)
+		result["page_cache"] = pages.stats()
+		result["responses_shaped"] = budget.shaped
+		return result
+	
+	@app.tool()
+	async def analyze_sql(sql_query: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Analyze SQL query without execution (syntax, performance analysis)."""
-		return _handle_ssb_operation(ssb.analyze_sql, sql_query)
+		return await _handle_ssb_operation(ssb.analyze_sql, sql_query, fields=fields)
 
 	# ============================================================================
 	# HIGH-PRIORITY ADDITIONS - ENHANCED TABLE MANAGEMENT
 	# ============================================================================
 	
-	@app.tool()
-	async def list_tables_detailed() -> Dict[str, Any]:
-		"""Get comprehensive table information."""
-		return _handle_ssb_operation(ssb.list_tables_detailed)
+	@app.tool(paged=True)
+	async def list_tables_detailed(page_size: Optional[int] = None, cursor: Optional[str] = None, fields: Fields = None) -> Dict[str, Any]:
+		"""Get comprehensive table information. Tables are paged; pass the returned page.next_cursor to continue."""
+		return await _handle_paged_operation(pages, page_size, cursor, "tables", ssb.list_tables_detailed, fields=fields)
 	
 	@app.tool()
-	async def get_table_tree() -> Dict[str, Any]:
+	async def get_table_tree(fields: Fields = None) -> Dict[str, Any]:
 		"""Get hierarchical table structure organized by catalog."""
-		return _handle_ssb_operation(ssb.get_table_tree)
+		return await _handle_ssb_operation(ssb.get_table_tree, fields=fields)
 	
 	@app.tool()
-	async def validate_data_source(data_source_config: Dict[str, Any]) -> Dict[str, Any]:
+	async def validate_data_source(data_source_config: Dict[str, Any], fields: Fields = None) -> Dict[str, Any]:
 		"""Validate data source configuration."""
-		return _handle_ssb_operation(ssb.validate_data_source, data_source_config)
+		return await _handle_ssb_operation(ssb.validate_data_source, data_source_config, fields=fields)
 	
 	@app.tool()
-	async def create_table_detailed(table_config: Dict[str, Any]) -> Dict[str, Any]:
+	async def create_table_detailed(table_config: Dict[str, Any], fields: Fields = None) -> Dict[str, Any]:
 		"""Create table with full configuration."""
-		return _handle_ssb_operation(ssb.create_table_detailed, table_config)
+		return await _handle_ssb_operation(ssb.create_table_detailed, table_config, fields=fields)
 	
 	@app.tool()
-	async def get_table_details(table_id: str) -> Dict[str, Any]:
+	async def get_table_details(table_id: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Get detailed information about a specific table."""
-		return _handle_ssb_operation(ssb.get_table_details, table_id)
+		return await _handle_ssb_operation(ssb.get_table_details, table_id, fields=fields)
 
 	# ============================================================================
 	# HIGH-PRIORITY ADDITIONS - CONNECTOR & FORMAT MANAGEMENT
 	# ============================================================================
 	
 	@app.tool()
-	async def list_data_formats() -> Dict[str, Any]:
+	async def list_data_formats(fields: Fields = None) -> Dict[str, Any]:
 		"""List all available data formats."""
-		return _handle_ssb_operation(ssb.list_data_formats)
+		return await _handle_ssb_operation(ssb.list_data_formats, fields=fields)
 	
 	@app.tool()
-	async def get_data_format_details(format_id: str) -> Dict[str, Any]:
+	async def get_data_format_details(format_id: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Get detailed information about a specific data format."""
-		return _handle_ssb_operation(ssb.get_data_format_details, format_id)
+		return await _handle_ssb_operation(ssb.get_data_format_details, format_id, fields=fields)
 	
 	@app.tool()
-	async def create_data_format(format_config: Dict[str, Any]) -> Dict[str, Any]:
+	async def create_data_format(format_config: Dict[str, Any], fields: Fields = None) -> Dict[str, Any]:
 		"""Create a new data format."""
-		return _handle_ssb_operation(ssb.create_data_format, format_config)
+		return await _handle_ssb_operation(ssb.create_data_format, format_config, fields=fields)
 	
 	@app.tool()
-	async def get_connector_jar(connector_type: str) -> Dict[str, Any]:
+	async def get_connector_jar(connector_type: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Get connector JAR information."""
-		return _handle_ssb_operation(ssb.get_connector_jar, connector_type)
+		return await _handle_ssb_operation(ssb.get_connector_jar, connector_type, fields=fields)
 	
 	@app.tool()
-	async def get_connector_type_details(connector_type: str) -> Dict[str, Any]:
+	async def get_connector_type_details(connector_type: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Get detailed connector type information."""
-		return _handle_ssb_operation(ssb.get_connector_type_details, connector_type)
+		return await _handle_ssb_operation(ssb.get_connector_type_details, connector_type, fields=fields)
 	
 	@app.tool()
-	async def get_connector_details(connector_id: str) -> Dict[str, Any]:
+	async def get_connector_details(connector_id: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Get detailed connector information."""
-		return _handle_ssb_operation(ssb.get_connector_details, connector_id)
+		return await _handle_ssb_operation(ssb.get_connector_details, connector_id, fields=fields)
 
 	# ============================================================================
 	# HIGH-PRIORITY ADDITIONS - USER & PROJECT MANAGEMENT
 	# ============================================================================
 	
 	@app.tool()
-	async def get_user_settings() -> Dict[str, Any]:
+	async def get_user_settings(fields: Fields = None) -> Dict[str, Any]:
 		"""Get user preferences and settings."""
-		return _handle_ssb_operation(ssb.get_user_settings)
+		return await _handle_ssb_operation(ssb.get_user_settings, fields=fields)
 	
 	@app.tool()
-	async def update_user_settings(settings: Dict[str, Any]) -> Dict[str, Any]:
+	async def update_user_settings(settings: Dict[str, Any], fields: Fields = None) -> Dict[str, Any]:
 		"""Update user configuration."""
-		return _handle_ssb_operation(ssb.update_user_settings, settings)
+		return await _handle_ssb_operation(ssb.update_user_settings, settings, fields=fields)
 	
 	@app.tool()
-	async def list_projects() -> Dict[str, Any]:
+	async def list_projects(fields: Fields = None) -> Dict[str, Any]:
 		"""List available projects."""
-		return _handle_ssb_operation(ssb.list_projects)
+		return await _handle_ssb_operation(ssb.list_projects, fields=fields)
 	
 	@app.tool()
-	async def get_project_details(project_id: str) -> Dict[str, Any]:
+	async def get_project_details(project_id: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Get project information."""
-		return _handle_ssb_operation(ssb.get_project_details, project_id)
+		return await _handle_ssb_operation(ssb.get_project_details, project_id, fields=fields)
 	
 	@app.tool()
-	async def create_project(project_config: Dict[str, Any]) -> Dict[str, Any]:
+	async def create_project(project_config: Dict[str, Any], fields: Fields = None) -> Dict[str, Any]:
 		"""Create a new project."""
-		return _handle_ssb_operation(ssb.create_project, project_config)
+		return await _handle_ssb_operation(ssb.create_project, project_config, fields=fields)
 	
 	@app.tool()
-	async def get_user_info() -> Dict[str, Any]:
+	async def get_user_info(fields: Fields = None) -> Dict[str, Any]:
 		"""Get current user information."""
-		return _handle_ssb_operation(ssb.get_user_info)
+		return await _handle_ssb_operation(ssb.get_user_info, fields=fields)
 
 	# ============================================================================
 	# HIGH-PRIORITY ADDITIONS - API KEY MANAGEMENT
 	# ============================================================================
 	
 	@app.tool()
-	async def list_api_keys() -> Dict[str, Any]:
+	async def list_api_keys(fields: Fields = None) -> Dict[str, Any]:
 		"""List user API keys."""
-		return _handle_ssb_operation(ssb.list_api_keys)
+		return await _handle_ssb_operation(ssb.list_api_keys, fields=fields)
 	
 	@app.tool()
-	async def create_api_key(key_config: Dict[str, Any]) -> Dict[str, Any]:
+	async def create_api_key(key_config: Dict[str, Any], fields: Fields = None) -> Dict[str, Any]:
 		"""Create new API key."""
-		return _handle_ssb_operation(ssb.create_api_key, key_config)
+		return await _handle_ssb_operation(ssb.create_api_key, key_config, fields=fields)
 	
 	@app.tool()
-	async def delete_api_key(key_id: str) -> Dict[str, Any]:
+	async def delete_api_key(key_id: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Delete API key."""
-		return _handle_ssb_operation(ssb.delete_api_key, key_id)
+		return await _handle_ssb_operation(ssb.delete_api_key, key_id, fields=fields)
 	
 	@app.tool()
-	async def get_api_key_details(key_id: str) -> Dict[str, Any]:
+	async def get_api_key_details(key_id: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Get API key information."""
-		return _handle_ssb_operation(ssb.get_api_key_details, key_id)
+		return await _handle_ssb_operation(ssb.get_api_key_details, key_id, fields=fields)
 
 	# ============================================================================
 	# HIGH-PRIORITY ADDITIONS - ENVIRONMENT MANAGEMENT
 	# ============================================================================
 	
 	@app.tool()
-	async def list_environments() -> Dict[str, Any]:
+	async def list_environments(fields: Fields = None) -> Dict[str, Any]:
 		"""List available environments."""
-		return _handle_ssb_operation(ssb.list_environments)
+		return await _handle_ssb_operation(ssb.list_environments, fields=fields)
 	
 	@app.tool()
-	async def activate_environment(env_id: str) -> Dict[str, Any]:
+	async def activate_environment(env_id: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Activate/switch to an environment."""
-		return _handle_ssb_operation(ssb.activate_environment, env_id)
+		return await _handle_ssb_operation(ssb.activate_environment, env_id, fields=fields)
 	
 	@app.tool()
-	async def get_environment_details(env_id: str) -> Dict[str, Any]:
+	async def get_environment_details(env_id: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Get environment configuration."""
-		return _handle_ssb_operation(ssb.get_environment_details, env_id)
+		return await _handle_ssb_operation(ssb.get_environment_details, env_id, fields=fields)
 	
 	@app.tool()
-	async def create_environment(env_config: Dict[str, Any]) -> Dict[str, Any]:
+	async def create_environment(env_config: Dict[str, Any], fields: Fields = None) -> Dict[str, Any]:
 		"""Create new environment."""
-		return _handle_ssb_operation(ssb.create_environment, env_config)
+		return await _handle_ssb_operation(ssb.create_environment, env_config, fields=fields)
 	
 	@app.tool()
-	async def deactivate_environment() -> Dict[str, Any]:
+	async def deactivate_environment(fields: Fields = None) -> Dict[str, Any]:
 		"""Deactivate current environment."""
-		return _handle_ssb_operation(ssb.deactivate_environment)
+		return await _handle_ssb_operation(ssb.deactivate_environment, fields=fields)
 
 	# ============================================================================
 	# HIGH-PRIORITY ADDITIONS - SYNC & CONFIGURATION
 	# ============================================================================
 	
 	@app.tool()
-	async def get_sync_config() -> Dict[str, Any]:
+	async def get_sync_config(fields: Fields = None) -> Dict[str, Any]:
 		"""Get sync configuration."""
-		return _handle_ssb_operation(ssb.get_sync_config)
+		return await _handle_ssb_operation(ssb.get_sync_config, fields=fields)
 	
 	@app.tool()
-	async def update_sync_config(config: Dict[str, Any]) -> Dict[str, Any]:
+	async def update_sync_config(config: Dict[str, Any], fields: Fields = None) -> Dict[str, Any]:
 		"""Update sync configuration."""
-		return _handle_ssb_operation(ssb.update_sync_config, config)
+		return await _handle_ssb_operation(ssb.update_sync_config, config, fields=fields)
 	
 	@app.tool()
-	async def delete_sync_config() -> Dict[str, Any]:
+	async def delete_sync_config(fields: Fields = None) -> Dict[str, Any]:
 		"""Delete sync configuration."""
-		return _handle_ssb_operation(ssb.delete_sync_config)
+		return await _handle_ssb_operation(ssb.delete_sync_config, fields=fields)
 	
 	@app.tool()
-	async def validate_sync_config(project: str) -> Dict[str, Any]:
+	async def validate_sync_config(project: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Validate sync configuration for a project."""
-		return _handle_ssb_operation(ssb.validate_sync_config, project)
+		return await _handle_ssb_operation(ssb.validate_sync_config, project, fields=fields)
 	
 	@app.tool()
-	async def export_project(project: str) -> Dict[str, Any]:
+	async def export_project(project: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Export project configuration."""
-		return _handle_ssb_operation(ssb.export_project, project)
+		return await _handle_ssb_operation(ssb.export_project, project, fields=fields)
 	
 	@app.tool()
-	async def import_project(project: str, config: Dict[str, Any]) -> Dict[str, Any]:
+	async def import_project(project: str, config: Dict[str, Any], fields: Fields = None) -> Dict[str, Any]:
 		"""Import project configuration."""
-		return _handle_ssb_operation(ssb.import_project, project, config)
+		return await _handle_ssb_operation(ssb.import_project, project, config, fields=fields)
 
 	# ============================================================================
 	# HIGH-PRIORITY ADDITIONS - UDF MANAGEMENT
 	# ============================================================================
 	
 	@app.tool()
-	async def list_udfs_detailed() -> Dict[str, Any]:
+	async def list_udfs_detailed(fields: Fields = None) -> Dict[str, Any]:
 		"""Get comprehensive UDF information."""
-		return _handle_ssb_operation(ssb.list_udfs_detailed)
+		return await _handle_ssb_operation(ssb.list_udfs_detailed, fields=fields)
 	
 	@app.tool()
-	async def run_udf(udf_id: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+	async def run_udf(udf_id: str, parameters: Dict[str, Any], fields: Fields = None) -> Dict[str, Any]:
 		"""Execute UDF function."""
-		return _handle_ssb_operation(ssb.run_udf, udf_id, parameters)
+		return await _handle_ssb_operation(ssb.run_udf, udf_id, parameters, fields=fields)
 	
 	@app.tool()
-	async def get_udf_artifacts() -> Dict[str, Any]:
+	async def get_udf_artifacts(fields: Fields = None) -> Dict[str, Any]:
 		"""Get UDF artifacts and dependencies."""
-		return _handle_ssb_operation(ssb.get_udf_artifacts)
+		return await _handle_ssb_operation(ssb.get_udf_artifacts, fields=fields)
 	
 	@app.tool()
-	async def create_udf(udf_config: Dict[str, Any]) -> Dict[str, Any]:
+	async def create_udf(udf_config: Dict[str, Any], fields: Fields = None) -> Dict[str, Any]:
 		"""Create custom UDF."""
-		return _handle_ssb_operation(ssb.create_udf, udf_config)
+		return await _handle_ssb_operation(ssb.create_udf, udf_config, fields=fields)
 	
 	@app.tool()
-	async def update_udf(udf_id: str, udf_config: Dict[str, Any]) -> Dict[str, Any]:
+	async def update_udf(udf_id: str, udf_config: Dict[str, Any], fields: Fields = None) -> Dict[str, Any]:
 		"""Update UDF configuration."""
-		return _handle_ssb_operation(ssb.update_udf, udf_id, udf_config)
+		return await _handle_ssb_operation(ssb.update_udf, udf_id, udf_config, fields=fields)
 	
 	@app.tool()
-	async def get_udf_details(udf_id: str) -> Dict[str, Any]:
+	async def get_udf_details(udf_id: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Get detailed UDF information."""
-		return _handle_ssb_operation(ssb.get_udf_details, udf_id)
+		return await _handle_ssb_operation(ssb.get_udf_details, udf_id, fields=fields)
 	
 	@app.tool()
-	async def get_udf_artifact_details(artifact_id: str) -> Dict[str, Any]:
+	async def get_udf_artifact_details(artifact_id: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Get UDF artifact details."""
-		return _handle_ssb_operation(ssb.get_udf_artifact_details, artifact_id)
+		return await _handle_ssb_operation(ssb.get_udf_artifact_details, artifact_id, fields=fields)
 	
 	@app.tool()
-	async def get_udf_artifact_by_type(artifact_type: str) -> Dict[str, Any]:
+	async def get_udf_artifact_by_type(artifact_type: str, fields: Fields = None) -> Dict[str, Any]:
 		"""Get UDF artifacts by type."""
-		return _handle_ssb_operation(ssb.get_udf_artifact_by_type, artifact_type)
+		return await _handle_ssb_operation(ssb.get_udf_artifact_by_type, artifact_type, fields=fields)
 
 	return app
 
@@ -579,10 +880,16 @@ def create_server(ssb: SSBClient, readonly: bool) -> FastMCP:
 async def run_stdio() -> None:
 	# For FastMCP, prefer the built-in stdio runner
 	config = ServerConfig()
-	ssb = build_client(config)
-	server = create_server(ssb, readonly=config.readonly)
-	# run() is synchronous; call the async flavor directly
-	await server.run_stdio_async()
+	async with build_async_client(config) as ssb:
+		server = create_server(
+			ssb,
+			readonly=config.readonly,
+			subscription_idle_seconds=config.sample_subscription_idle_seconds,
+			pages=_build_page_cache(config),
+			budget=_build_response_budget(config),
+		)
+		# run() is synchronous; call the async flavor directly
+		await server.run_stdio_async()
 
 
 def main() -> None:
@@ -590,8 +897,14 @@ def main() -> None:
 	if transport != "stdio":
 		# Defer to FastMCP synchronous run helper for other transports when added
 		config = ServerConfig()
-		ssb = build_client(config)
-		server = create_server(ssb, readonly=config.readonly)
+		ssb = build_async_client(config)
+		server = create_server(
+			ssb,
+			readonly=config.readonly,
+			subscription_idle_seconds=config.sample_subscription_idle_seconds,
+			pages=_build_page_cache(config),
+			budget=_build_response_budget(config),
+		)
 		server.run(transport=transport)
 		return
 	anyio.run(run_stdio)
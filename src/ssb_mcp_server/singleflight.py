@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+import anyio
+
+
+def request_key(method: str, path: str, params: Optional[Dict[str, Any]] = None) -> Hashable:
+	"""Key identifying identical requests: method, normalized path and sorted params."""
+	return (method.upper(), path.strip("/"), json.dumps(params, sort_keys=True, default=str) if params else None)
+
+
+class _Call:
+	def __init__(self) -> None:
+		self.done = False
+		self.result: Any = None
+		self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+	"""Coalesces concurrent identical calls from multiple threads into one execution.
+
+	The first caller for a key runs the function; callers arriving while it is in
+	flight block and receive the same result (or exception). Results are shared, so
+	callers must not mutate them in ways that matter to each other.
+	"""
+
+	def __init__(self) -> None:
+		self._calls: Dict[Hashable, tuple[_Call, threading.Event]] = {}
+		self._lock = threading.Lock()
+		self.coalesced = 0
+
+	def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+		with self._lock:
+			entry = self._calls.get(key)
+			if entry is None:
+				call, event = _Call(), threading.Event()
+				self._calls[key] = (call, event)
+				leader = True
+			else:
+				call, event = entry
+				self.coalesced += 1
+				leader = False
+
+		if not leader:
+			event.wait()
+			if not call.done:
+				# The leader was interrupted before producing an outcome; go it alone
+				return func()
+			if call.error is not None:
+				raise call.error
+			return call.result
+
+		try:
+			call.result = func()
+			call.done = True
+			return call.result
+		except Exception as e:
+			call.error = e
+			call.done = True
+			raise
+		finally:
+			with self._lock:
+				self._calls.pop(key, None)
+			event.set()
+
+	def stats(self) -> Dict[str, Any]:
+		with self._lock:
+			return {"in_flight": len(self._calls), "coalesced": self.coalesced}
+
+
+class AsyncSingleFlight:
+	"""Event-loop counterpart of SingleFlight for coroutine functions."""
+
+	def __init__(self) -> None:
+		self._calls: Dict[Hashable, tuple[_Call, anyio.Event]] = {}
+		self.coalesced = 0
+
+	async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+		entry = self._calls.get(key)
+		if entry is not None:
+			call, event = entry
+			self.coalesced += 1
+			await event.wait()
+			if not call.done:
+				# The leader was cancelled before producing an outcome; go it alone
+				return await func()
+			if call.error is not None:
+				raise call.error
+			return call.result
+
+		call, event = _Call(), anyio.Event()
+		self._calls[key] = (call, event)
+		try:
+			call.result = await func()
+			call.done = True
+			return call.result
+		except Exception as e:
+			call.error = e
+			call.done = True
+			raise
+		finally:
+			self._calls.pop(key, None)
+			event.set()
+
+	def stats(self) -> Dict[str, Any]:
+		return {"in_flight": len(self._calls), "coalesced": self.coalesced}
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .summary import _flatten
+
+
+def _hash64(value: Any) -> int:
+	"""Stable 64-bit hash of any JSON-serializable value."""
+	payload = value if isinstance(value, str) else json.dumps(value, sort_keys=True, default=str)
+	return int.from_bytes(hashlib.blake2b(payload.encode(), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+	"""Distinct-count estimator using 2**precision one-byte registers (~1.6% error at the default 12)."""
+
+	def __init__(self, precision: int = 12):
+		self.precision = precision
+		self.registers = bytearray(1 << precision)
+
+	def add(self, value: Any) -> None:
+		h = _hash64(value)
+		index = h >> (64 - self.precision)
+		rest = (h << self.precision) & ((1 << 64) - 1)
+		rank = 64 - self.precision + 1 if rest == 0 else 65 - rest.bit_length()
+		if rank > self.registers[index]:
+			self.registers[index] = rank
+
+	def merge(self, other: "HyperLogLog") -> None:
+		if other.precision != self.precision:
+			raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+		self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+	def count(self) -> int:
+		m = len(self.registers)
+		alpha = 0.7213 / (1 + 1.079 / m)
+		estimate = alpha * m * m / math.fsum(2.0 ** -r for r in self.registers)
+		zeros = self.registers.count(0)
+		if estimate <= 2.5 * m and zeros:
+			# Small-range correction: linear counting
+			estimate = m * math.log(m / zeros)
+		return int(round(estimate))
+
+
+class CountMinTopK:
+	"""Count-Min sketch for frequencies plus a bounded candidate set for heavy hitters."""
+
+	def __init__(self, width: int = 2048, depth: int = 4, capacity: int = 64):
+		self.width = width
+		self.depth = depth
+		self.capacity = capacity
+		self.total = 0
+		self.table = [[0] * width for _ in range(depth)]
+		self.candidates: Dict[str, int] = {}
+
+	def _cells(self, key: str) -> Iterable[Tuple[int, int]]:
+		digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+		h1, h2 = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big") | 1
+		for row in range(self.depth):
+			yield row, (h1 + row * h2) % self.width
+
+	def add(self, value: Any, count: int = 1) -> None:
+		key = value if isinstance(value, str) else json.dumps(value, sort_keys=True, default=str)
+		self.total += count
+		estimate = None
+		for row, col in self._cells(key):
+			self.table[row][col] += count
+			cell = self.table[row][col]
+			estimate = cell if estimate is None else min(estimate, cell)
+		self._offer(key, estimate or 0)
+
+	def _offer(self, key: str, estimate: int) -> None:
+		if key in self.candidates or len(self.candidates) < self.capacity:
+			self.candidates[key] = estimate
+			return
+		weakest = min(self.candidates, key=self.candidates.__getitem__)
+		if estimate > self.candidates[weakest]:
+			del self.candidates[weakest]
+			self.candidates[key] = estimate
+
+	def estimate(self, key: str) -> int:
+		return min(self.table[row][col] for row, col in self._cells(key))
+
+	def merge(self, other: "CountMinTopK") -> None:
+		if (other.width, other.depth) != (self.width, self.depth):
+			raise ValueError("Cannot merge Count-Min sketches of different dimensions")
+		for row in range(self.depth):
+			self.table[row] = [a + b for a, b in zip(self.table[row], other.table[row])]
+		self.total += other.total
+		for key in set(self.candidates) | set(other.candidates):
+			self.candidates.pop(key, None)
+			self._offer(key, self.estimate(key))
+
+	def top(self, k: int) -> List[Dict[str, Any]]:
+		ranked = sorted(((self.estimate(key), key) for key in self.candidates), reverse=True)[:k]
+		return [{"value": key, "count": count} for count, key in ranked]
+
+
+class TDigest:
+	"""Merging t-digest for quantiles; keeps O(compression) centroids however many values are added."""
+
+	def __init__(self, compression: float = 100.0):
+		self.compression = compression
+		self.centroids: List[List[float]] = []  # [mean, weight], sorted by mean
+		self.buffer: List[float] = []
+		self.count = 0.0
+		self.min = math.inf
+		self.max = -math.inf
+
+	def add(self, value: float) -> None:
+		if not math.isfinite(value):
+			return
+		self.buffer.append(value)
+		self.count += 1
+		self.min = min(self.min, value)
+		self.max = max(self.max, value)
+		if len(self.buffer) >= 5 * self.compression:
+			self._compress()
+
+	def merge(self, other: "TDigest") -> None:
+		other._compress()
+		self._compress()
+		self.centroids.extend([list(c) for c in other.centroids])
+		self.count += other.count
+		self.min = min(self.min, other.min)
+		self.max = max(self.max, other.max)
+		self._compress(force=True)
+
+	def _compress(self, force: bool = False) -> None:
+		if not self.buffer and not force:
+			return
+		points = sorted(self.centroids + [[v, 1.0] for v in self.buffer])
+		self.buffer = []
+		if not points:
+			return
+		merged = [points[0][:]]
+		seen = 0.0
+		for mean, weight in points[1:]:
+			last = merged[-1]
+			q = (seen + last[1] / 2) / self.count
+			limit = max(1.0, 4 * self.count * q * (1 - q) / self.compression)
+			if last[1] + weight <= limit:
+				last[0] += (mean - last[0]) * weight / (last[1] + weight)
+				last[1] += weight
+			else:
+				seen += last[1]
+				merged.append([mean, weight])
+		self.centroids = merged
+
+	def quantile(self, q: float) -> Optional[float]:
+		self._compress()
+		if not self.centroids:
+			return None
+		if len(self.centroids) == 1 or q <= 0:
+			return self.min if q <= 0 else self.centroids[0][0]
+		if q >= 1:
+			return self.max
+		target = q * self.count
+		cumulative = 0.0
+		previous_mid, previous_mean = 0.0, self.min
+		for mean, weight in self.centroids:
+			mid = cumulative + weight / 2
+			if target <= mid:
+				span = mid - previous_mid
+				fraction = (target - previous_mid) / span if span else 0.0
+				return previous_mean + (mean - previous_mean) * fraction
+			cumulative += weight
+			previous_mid, previous_mean = mid, mean
+		span = self.count - previous_mid
+		fraction = (target - previous_mid) / span if span else 0.0
+		return previous_mean + (self.max - previous_mean) * fraction
+
+
+class ColumnSketch:
+	"""All sketches maintained for one column of a sample stream."""
+
+	def __init__(self) -> None:
+		self.values = 0
+		self.nulls = 0
+		self.distinct = HyperLogLog()
+		self.frequent = CountMinTopK()
+		self.quantiles = TDigest()
+
+	def add(self, value: Any) -> None:
+		if value is None:
+			self.nulls += 1
+			return
+		self.values += 1
+		self.distinct.add(value)
+		self.frequent.add(value)
+		if isinstance(value, (int, float)) and not isinstance(value, bool):
+			self.quantiles.add(float(value))
+
+	def merge(self, other: "ColumnSketch") -> None:
+		self.values += other.values
+		self.nulls += other.nulls
+		self.distinct.merge(other.distinct)
+		self.frequent.merge(other.frequent)
+		self.quantiles.merge(other.quantiles)
+
+	def report(self, top_k: int, quantiles: List[float]) -> Dict[str, Any]:
+		report: Dict[str, Any] = {
+			"values": self.values,
+			"nulls": self.nulls,
+			"distinct_estimate": self.distinct.count(),
+			"top_values": self.frequent.top(top_k),
+		}
+		if self.quantiles.count:
+			report["quantiles"] = {str(q): self.quantiles.quantile(q) for q in quantiles}
+			report["min"] = self.quantiles.min
+			report["max"] = self.quantiles.max
+		return report
+
+
+class SampleSketches:
+	"""Per-sample column sketches fed with each sample's new records, keeping at most ``max_samples``."""
+
+	def __init__(self, max_samples: int = 16):
+		self.max_samples = max_samples
+		self._samples: "OrderedDict[str, Dict[str, ColumnSketch]]" = OrderedDict()
+		self._lock = threading.Lock()
+
+	def enable(self, sample_id: str, columns: List[str], seed: Optional[List[Any]] = None) -> List[str]:
+		"""Start sketching columns (dotted names for nested fields), seeding new ones from already seen records.
+
+		Returns every column sketched for the sample.
+		"""
+		with self._lock:
+			sketches = self._samples.setdefault(sample_id, {})
+			added = {column: ColumnSketch() for column in columns if column not in sketches}
+			self._feed(added, seed or [])
+			sketches.update(added)
+			self._samples.move_to_end(sample_id)
+			while len(self._samples) > self.max_samples:
+				self._samples.popitem(last=False)
+			return list(sketches)
+
+	@staticmethod
+	def _feed(sketches: Dict[str, ColumnSketch], records: List[Any]) -> None:
+		if not sketches:
+			return
+		for record in records:
+			if isinstance(record, str):
+				try:
+					record = json.loads(record)
+				except ValueError:
+					pass
+			row = _flatten(record)
+			for column, sketch in sketches.items():
+				sketch.add(row.get(column))
+
+	def update(self, sample_id: str, records: List[Any]) -> None:
+		"""Feed records not seen before; samples without enabled columns are ignored."""
+		with self._lock:
+			sketches = self._samples.get(sample_id)
+			if sketches:
+				self._feed(sketches, records)
+
+	def query(self, sample_id: str, top_k: int = 10, quantiles: Optional[List[float]] = None) -> Optional[Dict[str, Any]]:
+		quantiles = quantiles or [0.5, 0.9, 0.99]
+		with self._lock:
+			sketches = self._samples.get(sample_id)
+			if sketches is None:
+				return None
+			self._samples.move_to_end(sample_id)
+			return {column: sketch.report(top_k, quantiles) for column, sketch in sketches.items()}
+
+	def drop(self, sample_id: str) -> None:
+		with self._lock:
+			self._samples.pop(sample_id, None)
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import secrets
+import shutil
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from .localsql import _column_type
+from .summary import columnarize
+
+# pyarrow is optional; without it spills are written as JSON Lines
+try:
+	import pyarrow as pa
+	import pyarrow.ipc as pa_ipc
+except ImportError:  # pragma: no cover
+	pa = None
+	pa_ipc = None
+
+
+_BATCH_SIZE = 1000
+
+
+class _Spill:
+	"""One spilled sample on disk plus what is needed to page through it."""
+
+	def __init__(self, spill_id: str, sample_id: str, path: str, fmt: str, row_count: int, schema: List[Dict[str, str]], offsets: Optional[array] = None):
+		self.spill_id = spill_id
+		self.sample_id = sample_id
+		self.path = path
+		self.format = fmt
+		self.row_count = row_count
+		self.schema = schema
+		# Byte offset of every JSON line, plus the end of the file
+		self.offsets = offsets
+
+	def descriptor(self) -> Dict[str, Any]:
+		return {
+			"spill_id": self.spill_id,
+			"sample_id": self.sample_id,
+			"path": self.path,
+			"format": self.format,
+			"row_count": self.row_count,
+			"bytes": os.path.getsize(self.path),
+			"schema": self.schema,
+		}
+
+
+class SampleSpillStore:
+	"""Writes large sample pulls to local files and pages through them with memory-mapped reads.
+
+	Files are Arrow IPC when pyarrow is installed, otherwise JSON Lines. At most
+	``max_files`` spills are kept; the oldest file is deleted once that is exceeded.
+	"""
+
+	def __init__(self, threshold_records: int = 1000, directory: Optional[str] = None, max_files: int = 32):
+		self.threshold_records = threshold_records
+		self.max_files = max_files
+		self._directory = directory
+		self._owns_directory = directory is None
+		self._spills: "OrderedDict[str, _Spill]" = OrderedDict()
+		self._lock = threading.Lock()
+
+	@property
+	def directory(self) -> str:
+		if self._directory is None:
+			self._directory = tempfile.mkdtemp(prefix="ssb-mcp-samples-")
+		os.makedirs(self._directory, exist_ok=True)
+		return self._directory
+
+	def should_spill(self, records: List[Any]) -> bool:
+		return self.threshold_records > 0 and len(records) > self.threshold_records
+
+	def write(self, sample_id: str, records: List[Any]) -> Dict[str, Any]:
+		"""Spill records to a new file in batches and return its descriptor."""
+		spill_id = secrets.token_hex(8)
+		schema = [
+			{"name": name, "type": _column_type(values)}
+			for name, values in columnarize(records[:_BATCH_SIZE]).items()
+		]
+		spill = None
+		if pa is not None:
+			try:
+				spill = self._write_arrow(spill_id, sample_id, records, schema)
+			except (pa.ArrowException, TypeError, ValueError):
+				# Records whose types drift between batches do not fit one Arrow schema
+				spill = None
+		if spill is None:
+			spill = self._write_jsonl(spill_id, sample_id, records, schema)
+
+		with self._lock:
+			self._spills[spill_id] = spill
+			evicted = []
+			while len(self._spills) > self.max_files:
+				evicted.append(self._spills.popitem(last=False)[1])
+		for old in evicted:
+			self._remove(old.path)
+		return spill.descriptor()
+
+	def _write_arrow(self, spill_id: str, sample_id: str, records: List[Any], schema: List[Dict[str, str]]) -> _Spill:
+		path = os.path.join(self.directory, f"{spill_id}.arrow")
+		writer = None
+		try:
+			for start in range(0, len(records), _BATCH_SIZE):
+				batch = [r if isinstance(r, dict) else {"value": r} for r in records[start:start + _BATCH_SIZE]]
+				if writer is None:
+					table = pa.Table.from_pylist(batch)
+					writer = pa_ipc.new_file(path, table.schema)
+				else:
+					table = pa.Table.from_pylist(batch, schema=writer.schema)
+				writer.write_table(table)
+		except Exception:
+			if writer is not None:
+				writer.close()
+			self._remove(path)
+			raise
+		if writer is None:
+			raise ValueError("No records to spill")
+		writer.close()
+		return _Spill(spill_id, sample_id, path, "arrow", len(records), schema)
+
+	def _write_jsonl(self, spill_id: str, sample_id: str, records: List[Any], schema: List[Dict[str, str]]) -> _Spill:
+		path = os.path.join(self.directory, f"{spill_id}.jsonl")
+		offsets = array("Q", [0])
+		with open(path, "wb") as f:
+			for start in range(0, len(records), _BATCH_SIZE):
+				lines = [json.dumps(r, separators=(",", ":"), default=str).encode() + b"\n" for r in records[start:start + _BATCH_SIZE]]
+				for line in lines:
+					offsets.append(offsets[-1] + len(line))
+				f.write(b"".join(lines))
+		return _Spill(spill_id, sample_id, path, "jsonl", len(records), schema, offsets)
+
+	def read(self, spill_id: str, offset: int = 0, limit: int = 100) -> Optional[Dict[str, Any]]:
+		"""Read a page of spilled records through a memory map; None if the spill is unknown."""
+		with self._lock:
+			spill = self._spills.get(spill_id)
+		if spill is None:
+			return None
+		offset = max(0, offset)
+		end = min(spill.row_count, offset + max(0, limit))
+		if spill.format == "arrow":
+			with pa.memory_map(spill.path) as source:
+				table = pa_ipc.open_file(source).read_all()
+				records = table.slice(offset, max(0, end - offset)).to_pylist()
+		elif offset >= end:
+			records = []
+		else:
+			with open(spill.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+				records = [
+					json.loads(mm[spill.offsets[i]:spill.offsets[i + 1]])
+					for i in range(offset, end)
+				]
+		return {
+			"spill_id": spill_id,
+			"offset": offset,
+			"records": records,
+			"row_count": spill.row_count,
+			"has_more": end < spill.row_count,
+		}
+
+	def delete(self, spill_id: str) -> bool:
+		with self._lock:
+			spill = self._spills.pop(spill_id, None)
+		if spill is not None:
+			self._remove(spill.path)
+		return spill is not None
+
+	def close(self) -> None:
+		"""Delete every spill file along with a directory this store created."""
+		with self._lock:
+			spills = list(self._spills.values())
+			self._spills.clear()
+		for spill in spills:
+			self._remove(spill.path)
+		if self._owns_directory and self._directory is not None:
+			shutil.rmtree(self._directory, ignore_errors=True)
+			self._directory = None
+
+	@staticmethod
+	def _remove(path: str) -> None:
+		try:
+			os.remove(path)
+		except FileNotFoundError:
+			pass
+
+	def stats(self) -> Dict[str, Any]:
+		with self._lock:
+			return {"files": len(self._spills), "format": "arrow" if pa is not None else "jsonl"}
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import difflib
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .sqlsession import _KEYWORDS, _TOKEN, split_name
+
+
+# Statements Flink SQL (as run by SSB) can start with, including ADD/REMOVE JAR, LOAD/UNLOAD MODULE,
+# STOP JOB, COMPILE PLAN, EXECUTE PLAN/STATEMENT SET, BEGIN STATEMENT SET ... END and REPLACE TABLE AS
+STATEMENT_KEYWORDS = (
+	"ADD", "ALTER", "ANALYZE", "BEGIN", "CALL", "COMPILE", "CREATE", "DELETE", "DESC", "DESCRIBE", "DROP", "END",
+	"EXECUTE", "EXPLAIN", "INSERT", "LOAD", "REMOVE", "REPLACE", "RESET", "SELECT", "SET", "SHOW", "STOP", "TRUNCATE",
+	"UNLOAD", "UPDATE", "USE", "VALUES", "WITH",
+)
+# Words that can follow FROM/JOIN/INTO without naming a table
+_CLAUSE_WORDS = frozenset({"SELECT", "LATERAL", "UNNEST", "TABLE", "AS", "ON", "WHERE", "GROUP", "ORDER", "LIMIT", "FROM"})
+_TRAILING_COMMA_BEFORE = frozenset({"FROM", "WHERE", "GROUP", "ORDER", "HAVING", "LIMIT", "UNION", ")"})
+
+_UPPERCASED = _KEYWORDS.union(STATEMENT_KEYWORDS)
+
+_Token = Tuple[str, str, int]
+
+
+class SqlValidationError(ValueError):
+	"""Raised for SQL rejected locally, before it is sent to SSB."""
+
+	def __init__(self, message: str, position: Optional[int] = None, suggestion: Optional[str] = None):
+		super().__init__(message)
+		self.details: Dict[str, Any] = {"checked_locally": True}
+		if position is not None:
+			self.details["position"] = position
+		if suggestion:
+			self.details["suggestion"] = suggestion
+
+
+def _tokens(sql: str) -> List[_Token]:
+	tokens: List[_Token] = []
+	for match in _TOKEN.finditer(sql):
+		kind, text = match.lastgroup, match.group()
+		if kind == "comment":
+			continue
+		if kind == "word" and text.upper() in _UPPERCASED:
+			text = text.upper()
+		tokens.append((kind, text, match.start()))
+	return tokens
+
+
+def _check_lexical(tokens: List[_Token]) -> None:
+	depth = 0
+	for i, (kind, text, position) in enumerate(tokens):
+		if kind != "other":
+			continue
+		if text in ("'", "`", '"'):
+			what = "string literal" if text == "'" else "quoted identifier"
+			raise SqlValidationError(f"Unterminated {what} starting at position {position}", position)
+		if text == "/" and i + 1 < len(tokens) and tokens[i + 1][1] == "*" and tokens[i + 1][2] == position + 1:
+			raise SqlValidationError(f"Unterminated /* comment starting at position {position}", position)
+		if text == "(":
+			depth += 1
+		elif text == ")":
+			depth -= 1
+			if depth < 0:
+				raise SqlValidationError(f"Unbalanced ')' at position {position}", position)
+	if depth > 0:
+		raise SqlValidationError(f"{depth} unclosed '(' in statement")
+
+
+def _statements(tokens: List[_Token]) -> List[List[_Token]]:
+	statements: List[List[_Token]] = [[]]
+	for token in tokens:
+		if token[1] == ";":
+			statements.append([])
+		elif token[0] != "space":
+			statements[-1].append(token)
+	return [statement for statement in statements if statement]
+
+
+def _check_structure(statement: List[_Token]) -> None:
+	kind, first, position = statement[0]
+	if first != "(" and (kind != "word" or first.upper() not in STATEMENT_KEYWORDS):
+		close = difflib.get_close_matches(first.upper(), STATEMENT_KEYWORDS, n=1)
+		raise SqlValidationError(
+			f"Statement cannot start with '{first}'",
+			position,
+			f"Did you mean {close[0]}?" if close else None,
+		)
+	words = [text for _, text, _ in statement]
+	for i, (_, text, position) in enumerate(statement[:-1]):
+		following = statement[i + 1][1]
+		if text == "," and following in _TRAILING_COMMA_BEFORE:
+			raise SqlValidationError(f"Trailing comma before {following} at position {position}", position)
+		if text in ("SELECT", "FROM", "WHERE", "BY") and following == text:
+			raise SqlValidationError(f"Repeated {text} at position {statement[i + 1][2]}", statement[i + 1][2])
+	if statement[-1][1] in ("SELECT", "FROM", "WHERE", "AND", "OR", "ON", "BY", ","):
+		raise SqlValidationError(f"Statement ends unexpectedly after '{statement[-1][1]}'", statement[-1][2])
+	if first == "SELECT" and "FROM" not in words and any(word in words for word in ("WHERE", "GROUP", "HAVING")):
+		raise SqlValidationError("SELECT has a WHERE/GROUP BY clause but no FROM")
+	if first == "INSERT" and not any(word in words for word in ("SELECT", "VALUES")):
+		raise SqlValidationError("INSERT needs a SELECT or VALUES source")
+
+
+def _cte_names(statement: List[_Token]) -> Set[str]:
+	"""Names defined in a WITH clause: ``name AS (`` at nesting depth zero."""
+	names: Set[str] = set()
+	depth = 0
+	for i, (_, text, _) in enumerate(statement):
+		if text == "(":
+			depth += 1
+		elif text == ")":
+			depth -= 1
+		elif depth == 0 and text == "AS" and i > 0 and i + 1 < len(statement) and statement[i + 1][1] == "(":
+			names.add(split_name(statement[i - 1][1])[-1])
+	return names
+
+
+def _table_references(statement: List[_Token]) -> List[Tuple[str, int]]:
+	"""Dotted names following FROM, JOIN or INSERT INTO that are not subqueries or table functions.
+
+	FROM inside function calls such as ``EXTRACT(YEAR FROM ts)`` or after
+	``IS DISTINCT`` names a column, so only query-level FROMs count.
+	"""
+	references: List[Tuple[str, int]] = []
+	# One entry per open parenthesis: does it open a subquery?
+	subquery: List[bool] = []
+	for i, (_, text, _) in enumerate(statement):
+		if text == "(":
+			subquery.append(i + 1 < len(statement) and statement[i + 1][1] in ("SELECT", "WITH", "VALUES", "("))
+			continue
+		if text == ")":
+			if subquery:
+				subquery.pop()
+			continue
+		if text not in ("FROM", "JOIN", "INTO") or (subquery and not subquery[-1]):
+			continue
+		if text == "FROM" and i > 0 and statement[i - 1][1] == "DISTINCT":
+			continue
+		j = i + 1
+		parts: List[str] = []
+		start = statement[j][2] if j < len(statement) else 0
+		while j < len(statement) and statement[j][0] in ("word", "quoted"):
+			parts.append(statement[j][1])
+			if j + 1 < len(statement) and statement[j + 1][1] == ".":
+				j += 2
+				continue
+			j += 1
+			break
+		if not parts or parts[0].upper() in _CLAUSE_WORDS or (j < len(statement) and statement[j][1] == "("):
+			continue
+		references.append((".".join(parts), start))
+	return references
+
+
+def check_sql(sql: str, table_exists: Optional[Callable[[str], Optional[bool]]] = None) -> None:
+	"""Reject malformed SQL locally, before a round trip to SSB.
+
+	This is a structural pass, not a full Flink SQL parser: it catches unbalanced
+	quotes and parentheses, unknown leading keywords, dangling clauses and tables
+	``table_exists`` reports as missing (False); None means unknown and passes.
+	"""
+	tokens = _tokens(sql)
+	_check_lexical(tokens)
+	statements = _statements(tokens)
+	if not statements:
+		raise SqlValidationError("SQL statement is empty")
+	for statement in statements:
+		_check_structure(statement)
+		if table_exists is None or statement[0][1] not in ("SELECT", "WITH", "INSERT"):
+			continue
+		ctes = _cte_names(statement)
+		for name, position in _table_references(statement):
+			if split_name(name)[-1] in ctes:
+				continue
+			if table_exists(name) is False:
+				raise SqlValidationError(f"Table '{name}' not found in the cached catalog", position)
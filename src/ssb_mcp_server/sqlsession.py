@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .cache import TTLCache
+
+
+DEFAULT_NAMESPACE = ("default_catalog", "default_database")
+
+_IDENT = r"`[^`]+`|[\w$-]+"
+_USE_CATALOG = re.compile(rf"^\s*USE\s+CATALOG\s+({_IDENT})\s*;?\s*$", re.IGNORECASE)
+_USE = re.compile(rf"^\s*USE\s+(?:({_IDENT})\s*\.\s*)?({_IDENT})\s*;?\s*$", re.IGNORECASE)
+_NAME = rf"(?:{_IDENT})(?:\s*\.\s*(?:{_IDENT})){{0,2}}"
+_DDL = re.compile(r"^\s*(CREATE|DROP|ALTER)\s+(?:TEMPORARY\s+|OR\s+REPLACE\s+)*(CATALOG|DATABASE|SCHEMA)?", re.IGNORECASE)
+_METADATA = re.compile(r"^\s*(?:USE|SHOW|DESCRIBE|DESC|EXPLAIN|SET|RESET)\b", re.IGNORECASE)
+_TABLE_DDL = re.compile(
+	rf"^\s*(?:CREATE|DROP|ALTER)\s+(?:TEMPORARY\s+|OR\s+REPLACE\s+)*(?:TABLE|VIEW)\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?({_NAME})",
+	re.IGNORECASE,
+)
+
+
+_TOKEN = re.compile(
+	r"(?P<comment>--[^\n]*|/\*.*?\*/)"
+	r"|(?P<string>'(?:[^']|'')*')"
+	r"|(?P<quoted>`[^`]*`|\"[^\"]*\")"
+	r"|(?P<word>[\w$]+)"
+	r"|(?P<space>\s+)"
+	r"|(?P<other>.)",
+	re.DOTALL,
+)
+# Keywords are case-insensitive in Flink SQL; identifiers are not, so only these are folded
+_KEYWORDS = frozenset("""
+	ADD ALL ALTER AND AS ASC BETWEEN BIGINT BOOLEAN BY CASE CAST CATALOG CREATE CROSS CURRENT_TIMESTAMP DATABASE
+	DATE DECIMAL DESC DESCRIBE DISTINCT DOUBLE DROP ELSE END EXISTS EXPLAIN FALSE FLOAT FOR FROM FULL FUNCTION
+	GROUP HAVING HOP IF IN INNER INSERT INT INTEGER INTERVAL INTO IS JOIN LEFT LIKE LIMIT METADATA NOT NULL ON
+	OR ORDER OUTER OVER PARTITION PRIMARY REPLACE RIGHT ROW SECOND SELECT SESSION SET SHOW SMALLINT STRING
+	SYSTEM_TIME TABLE TABLES TEMPORARY THEN TIMESTAMP TINYINT TRUE TUMBLE UNION USE VALUES VARCHAR VIEW
+	WATERMARK WHEN WHERE WINDOW WITH ZONE
+""".split())
+
+
+def normalize_sql(sql: str) -> str:
+	"""Canonical text of a statement: no comments, single spaces only where needed, keywords
+	upper-cased and one trailing semicolon, as ``execute_query`` sends it."""
+	tokens = []
+	for match in _TOKEN.finditer(sql):
+		kind, text = match.lastgroup, match.group()
+		if kind in ("comment", "space"):
+			continue
+		if kind == "word" and text.upper() in _KEYWORDS:
+			text = text.upper()
+		if tokens and kind != "other" and tokens[-1][0] != "other":
+			tokens.append(("space", " "))
+		tokens.append((kind, text))
+	while tokens and tokens[-1][1] == ";":
+		tokens.pop()
+	return "".join(text for _, text in tokens) + ";"
+
+
+def statement_count(sql: str) -> int:
+	"""Number of non-empty statements; semicolons in literals and comments do not separate."""
+	count = 0
+	pending = True
+	for match in _TOKEN.finditer(sql):
+		kind, text = match.lastgroup, match.group()
+		if kind in ("comment", "space"):
+			continue
+		if text == ";":
+			pending = True
+		elif pending:
+			count += 1
+			pending = False
+	return count
+
+
+def fingerprint_sql(sql: str) -> str:
+	"""Short stable hash of the normalized statement."""
+	return hashlib.sha256(normalize_sql(sql).encode()).hexdigest()[:16]
+
+
+def statement_kind(sql: str) -> str:
+	"""Classify what a ``sql/execute`` request can change.
+
+	``"script"`` for several statements, ``"ddl"`` for CREATE/DROP/ALTER,
+	``"metadata"`` for USE, SHOW, DESCRIBE, EXPLAIN, SET and RESET, and ``"job"``
+	for everything else (queries, INSERTs, statement sets), which starts a Flink job.
+	"""
+	if statement_count(sql) > 1:
+		return "script"
+	statement = normalize_sql(sql)
+	if _DDL.match(statement):
+		return "ddl"
+	if _METADATA.match(statement):
+		return "metadata"
+	return "job"
+
+
+def _unquote(identifier: str) -> str:
+	return identifier[1:-1] if identifier.startswith("`") else identifier
+
+
+def split_name(name: str) -> Tuple[str, ...]:
+	"""Split a possibly backtick-quoted ``[catalog.][database.]table`` name into its parts."""
+	return tuple(_unquote(part.strip()) for part in re.findall(rf"{_IDENT}", name))
+
+
+def quote_name(qualified: str) -> str:
+	return ".".join(f"`{part}`" for part in qualified.split(".", 2))
+
+
+class SqlSession:
+	"""Client-side view of the SSB SQL session behind ``sql/execute``.
+
+	Tracks the current catalog and database so callers can skip redundant
+	``USE`` statements, and caches ``SHOW`` results, parsed table schemas and
+	``sql/analyze`` results until a DDL statement observed through
+	:meth:`observe` (or the TTL) invalidates them.
+	"""
+
+	def __init__(self, metadata_ttl: float = 60.0, schema_ttl: float = 600.0, max_schemas: int = 256,
+	             analysis_ttl: float = 300.0, max_analyses: int = 256):
+		self.current: Optional[Tuple[str, Optional[str]]] = None
+		self.show_tables_from: Optional[bool] = None
+		self.show_current: Optional[bool] = None
+		self._results = TTLCache(metadata_ttl, max_entries=128)
+		self.schemas = TTLCache(schema_ttl, max_entries=max_schemas)
+		self.analyses = TTLCache(analysis_ttl, max_entries=max_analyses)
+		self.use_skipped = 0
+
+	def invalidate(self) -> None:
+		"""Forget all cached metadata, e.g. after another environment was activated."""
+		self._results.invalidate()
+		self.schemas.invalidate()
+		self.analyses.invalidate()
+
+	def analysis_key(self, sql: str) -> Tuple[str, Optional[Tuple[str, Optional[str]]]]:
+		"""Analyses depend on the statement and on the namespace unqualified names resolve in."""
+		return fingerprint_sql(sql), self.current
+
+	def qualify(self, name: str) -> Optional[str]:
+		"""Fully qualified ``catalog.database.table`` for a name, resolved against the tracked namespace.
+
+		None when the name needs a part of the namespace that is not known.
+		"""
+		parts = split_name(name)
+		namespace = self.current or (None, None)
+		missing = namespace[:max(0, 3 - len(parts))]
+		if None in missing:
+			return None
+		return ".".join(missing + parts[-3:])
+
+	def table_exists(self, name: str) -> Optional[bool]:
+		"""True when the cached SHOW TABLES result of the table's database lists it, else None.
+
+		A table missing from the cached result is still unknown, not absent: it may have
+		been created since, e.g. by another SSB user. None also when the name is not
+		fully qualified and the session's namespace is unknown.
+		"""
+		qualified = self.qualify(name)
+		if qualified is None:
+			return None
+		catalog, database, table = qualified.split(".", 2)
+		result = self._results.get(("tables", catalog, database))
+		if not isinstance(result, dict):
+			return None
+		rows = (result.get("table_data") or {}).get("data") or []
+		if any(isinstance(row, dict) and row.get("table name") == table for row in rows):
+			return True
+		return None
+
+	def needs_use(self, catalog: str, database: str) -> bool:
+		if self.current == (catalog, database):
+			self.use_skipped += 1
+			return False
+		return True
+
+	def observe(self, sql: str) -> None:
+		"""Update the tracked namespace and cached metadata after a statement was sent."""
+		if statement_count(sql) > 1:
+			# Several statements in one request: too ambiguous to track precisely
+			self.current = None
+			self.invalidate()
+			return
+		statement = normalize_sql(sql)
+		match = _USE_CATALOG.match(statement)
+		if match:
+			self.current = (_unquote(match.group(1)), None)
+			return
+		match = _USE.match(statement)
+		if match:
+			catalog, database = match.group(1), _unquote(match.group(2))
+			if catalog is not None:
+				self.current = (_unquote(catalog), database)
+			elif self.current is not None:
+				self.current = (self.current[0], database)
+			return
+		match = _DDL.match(statement)
+		if match:
+			self.analyses.invalidate()
+			if match.group(2):
+				# Catalogs or databases changed: every cached listing may be stale
+				self.invalidate()
+			else:
+				self._results.invalidate_where(lambda key: key[0] == "tables")
+				table = _TABLE_DDL.match(statement)
+				if table:
+					qualified = self.qualify(table.group(1))
+					if qualified is None:
+						# Cannot tell which cached table the name refers to
+						self.schemas.invalidate()
+					else:
+						self.schemas.invalidate(qualified)
+
+	def cached(self, key: Hashable) -> Any:
+		return self._results.get(key)
+
+	def remember(self, key: Hashable, result: Any) -> None:
+		self._results.set(key, result)
+
+	def stats(self) -> Dict[str, Any]:
+		return {
+			"current": ".".join(part for part in self.current if part) if self.current else None,
+			"use_skipped": self.use_skipped,
+			"show_tables_from": self.show_tables_from,
+			"show_current": self.show_current,
+			"results": self._results.stats(),
+			"schemas": self.schemas.stats(),
+			"analyses": self.analyses.stats(),
+		}
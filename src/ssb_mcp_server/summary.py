@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import math
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+# NumPy is optional; without it the same statistics are computed in pure Python
+try:
+	import numpy as np
+except ImportError:  # pragma: no cover
+	np = None
+
+
+def _flatten(record: Any, prefix: str = "", out: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+	"""Flatten nested objects into dotted column names."""
+	out = {} if out is None else out
+	if isinstance(record, dict):
+		for key, value in record.items():
+			name = f"{prefix}.{key}" if prefix else str(key)
+			if isinstance(value, dict):
+				_flatten(value, name, out)
+			else:
+				out[name] = value
+	else:
+		out[prefix or "value"] = record
+	return out
+
+
+def columnarize(records: List[Any]) -> Dict[str, List[Any]]:
+	"""Decode sample records into equally long columns, with None where a field is missing."""
+	columns: Dict[str, List[Any]] = {}
+	for row, record in enumerate(records):
+		if isinstance(record, str):
+			try:
+				record = json.loads(record)
+			except ValueError:
+				pass
+		for name, value in _flatten(record).items():
+			column = columns.get(name)
+			if column is None:
+				column = columns[name] = [None] * row
+			column.append(value)
+		for column in columns.values():
+			if len(column) <= row:
+				column.append(None)
+	return columns
+
+
+def _is_number(value: Any) -> bool:
+	return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _numeric_stats(values: List[float], bins: int) -> Dict[str, Any]:
+	if np is not None:
+		arr = np.asarray(values, dtype=np.float64)
+		arr = arr[np.isfinite(arr)]
+		if arr.size == 0:
+			return {}
+		p50, p95 = np.percentile(arr, [50, 95])
+		counts, edges = np.histogram(arr, bins=bins)
+		return {
+			"min": float(arr.min()),
+			"max": float(arr.max()),
+			"mean": float(arr.mean()),
+			"std": float(arr.std()),
+			"p50": float(p50),
+			"p95": float(p95),
+			"histogram": {"edges": [float(e) for e in edges], "counts": [int(c) for c in counts]},
+		}
+
+	arr = sorted(v for v in values if math.isfinite(v))
+	if not arr:
+		return {}
+	n = len(arr)
+	mean = math.fsum(arr) / n
+	lo, hi = arr[0], arr[-1]
+	width = (hi - lo) / bins if hi > lo else 1.0
+	edges = [lo + i * width for i in range(bins + 1)] if hi > lo else [lo - 0.5 + i / bins for i in range(bins + 1)]
+	counts = [0] * bins
+	for v in arr:
+		counts[min(bins - 1, int((v - edges[0]) / (edges[1] - edges[0])))] += 1
+	return {
+		"min": lo,
+		"max": hi,
+		"mean": mean,
+		"std": math.sqrt(math.fsum((v - mean) ** 2 for v in arr) / n),
+		"p50": _percentile(arr, 50),
+		"p95": _percentile(arr, 95),
+		"histogram": {"edges": edges, "counts": counts},
+	}
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+	"""Linear-interpolated percentile, matching numpy's default method."""
+	pos = (len(sorted_values) - 1) * q / 100
+	low = math.floor(pos)
+	high = min(low + 1, len(sorted_values) - 1)
+	return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (pos - low)
+
+
+def summarize_column(values: List[Any], histogram_bins: int = 10, top_k: int = 5) -> Dict[str, Any]:
+	"""Null rate, type mix and numeric or categorical statistics for one column."""
+	total = len(values)
+	present = [v for v in values if v is not None]
+	types = Counter(type(v).__name__ for v in present)
+	summary: Dict[str, Any] = {
+		"count": len(present),
+		"nulls": total - len(present),
+		"null_rate": round((total - len(present)) / total, 4) if total else 0.0,
+		"types": dict(types),
+	}
+
+	numbers = [v for v in present if _is_number(v)]
+	if numbers:
+		summary.update(_numeric_stats(numbers, max(1, histogram_bins)))
+
+	others = [v for v in present if not _is_number(v)]
+	if others:
+		hashable = [v if isinstance(v, (str, bool)) else json.dumps(v, sort_keys=True, default=str) for v in others]
+		counts = Counter(hashable)
+		summary["distinct"] = len(counts)
+		summary["top_values"] = [{"value": value, "count": count} for value, count in counts.most_common(top_k)]
+		strings = [v for v in others if isinstance(v, str)]
+		if strings:
+			lengths = [len(v) for v in strings]
+			summary["length"] = {"min": min(lengths), "max": max(lengths), "mean": sum(lengths) / len(lengths)}
+	return summary
+
+
+def summarize_records(records: List[Any], histogram_bins: int = 10, top_k: int = 5) -> Dict[str, Any]:
+	"""Per-column summary of sample records, small enough to hand to an LLM instead of the rows."""
+	columns = columnarize(records)
+	return {
+		"record_count": len(records),
+		"engine": "numpy" if np is not None else "python",
+		"columns": {name: summarize_column(values, histogram_bins, top_k) for name, values in columns.items()},
+	}
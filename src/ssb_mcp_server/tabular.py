@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any, Dict, List, Optional
+
+FORMATS = ("json", "columns", "csv", "markdown")
+
+
+def to_columns(rows: List[Any]) -> Dict[str, Any]:
+	"""Turn a list of row dicts into ``{columns, rows}`` in one pass, so keys are not repeated per row."""
+	index: Dict[str, int] = {}
+	out: List[List[Any]] = []
+	for row in rows:
+		if not isinstance(row, dict):
+			row = {"value": row}
+		values: List[Any] = [None] * len(index)
+		for key, value in row.items():
+			position = index.get(key)
+			if position is None:
+				position = index[key] = len(index)
+				values.append(None)
+			values[position] = value
+		out.append(values)
+	width = len(index)
+	for values in out:
+		if len(values) < width:
+			values.extend([None] * (width - len(values)))
+	return {"columns": list(index), "rows": out}
+
+
+def _text(value: Any) -> str:
+	if value is None:
+		return ""
+	if isinstance(value, str):
+		return value
+	return json.dumps(value, default=str)
+
+
+def to_csv(rows: List[Any]) -> str:
+	table = to_columns(rows)
+	buffer = io.StringIO()
+	writer = csv.writer(buffer, lineterminator="\n")
+	writer.writerow(table["columns"])
+	writer.writerows([_text(v) for v in values] for values in table["rows"])
+	return buffer.getvalue()
+
+
+def to_markdown(rows: List[Any]) -> str:
+	table = to_columns(rows)
+	if not table["columns"]:
+		return ""
+
+	def cell(value: Any) -> str:
+		return _text(value).replace("|", "\\|").replace("\n", " ")
+
+	lines = [
+		"| " + " | ".join(cell(c) for c in table["columns"]) + " |",
+		"|" + "---|" * len(table["columns"]),
+	]
+	lines.extend("| " + " | ".join(cell(v) for v in values) + " |" for values in table["rows"])
+	return "\n".join(lines)
+
+
+_ENCODERS = {"columns": to_columns, "csv": to_csv, "markdown": to_markdown}
+
+
+def format_tabular(result: Any, output_format: Optional[str]) -> Any:
+	"""Re-encode the tabular parts of a response (``records`` and ``table_data.data``).
+
+	Returns a new dict; the response itself is left untouched since it may be shared.
+	"""
+	if not output_format or output_format == "json" or not isinstance(result, dict):
+		return result
+	encoder = _ENCODERS.get(output_format)
+	if encoder is None:
+		raise ValueError(f"Unknown output_format '{output_format}'; expected one of {', '.join(FORMATS)}")
+	formatted = dict(result)
+	if isinstance(result.get("records"), list):
+		formatted["records"] = encoder(result["records"])
+	table_data = result.get("table_data")
+	if isinstance(table_data, dict) and isinstance(table_data.get("data"), list):
+		formatted["table_data"] = {**table_data, "data": encoder(table_data["data"])}
+	if formatted.keys() != result.keys() or any(formatted[k] is not result[k] for k in result):
+		formatted["output_format"] = output_format
+	return formatted
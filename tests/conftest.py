@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import functools
+import inspect
+from typing import Any, Iterator
+
+import httpx
+import pytest
+import requests
+from anyio.from_thread import BlockingPortal, start_blocking_portal
+
+from ssb_mcp_server.async_client import AsyncSSBClient
+from ssb_mcp_server.client import SSBClient
+from ssb_mcp_server.retry import RetryPolicy
+from ssb_mcp_server.spill import SampleSpillStore
+
+
+class BlockingAsyncClient:
+	"""Calls an AsyncSSBClient from test code as if it were blocking, on one long-lived event loop."""
+
+	def __init__(self, client: AsyncSSBClient, portal: BlockingPortal):
+		self.client = client
+		self.portal = portal
+
+	def __getattr__(self, name: str) -> Any:
+		attr = getattr(self.client, name)
+		if inspect.iscoroutinefunction(attr):
+			return lambda *args, **kwargs: self.portal.call(functools.partial(attr, *args, **kwargs))
+		return attr
+
+
+def client_options(tmp_path: Any) -> dict:
+	return {
+		# Keep retries fast
+		"retry_policy": RetryPolicy(max_retries=2, backoff_base=0.01, backoff_max=0.01),
+		"sample_spills": SampleSpillStore(directory=str(tmp_path / "spills")),
+	}
+
+
+@pytest.fixture(params=["sync", "async"])
+def ssb(request: pytest.FixtureRequest, httpserver: Any, tmp_path: Any) -> Iterator[Any]:
+	"""The sync client, or the async client driven through a blocking portal, pointed at httpserver."""
+	base_url = httpserver.url_for("/api/v1")
+	if request.param == "sync":
+		client = SSBClient(base_url, requests.Session(), timeout_seconds=5, **client_options(tmp_path))
+		yield client
+		client.close()
+		return
+	with start_blocking_portal() as portal:
+		client = AsyncSSBClient(base_url, httpx.AsyncClient(), timeout_seconds=5, **client_options(tmp_path))
+		yield BlockingAsyncClient(client, portal)
+		portal.call(client.aclose)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from ssb_mcp_server.breaker import (
+	CLOSED, HALF_OPEN, OPEN, BackendUnavailableError, CircuitBreaker, CircuitBreakerRegistry, endpoint_group,
+)
+
+
+def failing(breaker: CircuitBreaker, times: int) -> None:
+	for _ in range(times):
+		breaker.before_call()
+		breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures():
+	breaker = CircuitBreaker("jobs", failure_threshold=2, reset_timeout=60)
+	failing(breaker, 1)
+	breaker.before_call()
+	breaker.record_success()
+	failing(breaker, 2)
+
+	assert breaker.state == OPEN
+	with pytest.raises(BackendUnavailableError, match="retry in"):
+		breaker.before_call()
+	assert breaker.stats()["rejected_calls"] == 1
+
+
+def test_half_open_admits_one_probe():
+	breaker = CircuitBreaker("jobs", failure_threshold=1, reset_timeout=0.01)
+	failing(breaker, 1)
+	time.sleep(0.02)
+
+	breaker.before_call()
+	assert breaker.state == HALF_OPEN
+	with pytest.raises(BackendUnavailableError):
+		breaker.before_call()
+	breaker.record_success()
+	assert breaker.state == CLOSED
+
+
+def test_failed_probe_reopens():
+	breaker = CircuitBreaker("jobs", failure_threshold=3, reset_timeout=0.01)
+	failing(breaker, 3)
+	time.sleep(0.02)
+	failing(breaker, 1)
+
+	assert breaker.state == OPEN
+
+
+def test_released_probe_lets_the_next_call_through():
+	breaker = CircuitBreaker("jobs", failure_threshold=1, reset_timeout=0.01)
+	failing(breaker, 1)
+	time.sleep(0.02)
+	breaker.before_call()
+	breaker.release()
+
+	breaker.before_call()
+
+
+def test_registry_keys_by_base_url_and_group():
+	registry = CircuitBreakerRegistry()
+
+	assert endpoint_group("/jobs/1/events") == "jobs"
+	assert registry.get("a", "jobs/1") is registry.get("a", "/jobs")
+	assert registry.get("a", "jobs") is not registry.get("b", "jobs")
+	assert registry.get("a", "jobs") is not registry.get("a", "samples/1")
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from ssb_mcp_server.budget import ResponseBudget, parse_budgets
+from ssb_mcp_server.pagination import PageCache
+
+
+def jobs(count: int, **extra):
+	return {"jobs": [{"job_id": i, "name": f"job{i}", **extra} for i in range(count)]}
+
+
+def test_small_responses_are_returned_unchanged():
+	result = jobs(2)
+
+	assert ResponseBudget(10_000).shape(result, "list_streams") is result
+
+
+def test_per_tool_budgets_are_parsed():
+	assert parse_budgets("a=10, b = 20,bad,c=x") == {"a": 10, "b": 20}
+
+
+def test_long_strings_are_shortened_first():
+	result = {"job": {"name": "j", "sql": "x" * 10_000}}
+
+	shaped = ResponseBudget(3_000).shape(result, "get_job")
+
+	assert shaped["job"]["sql"].startswith("x" * 1024)
+	assert shaped["_budget"]["truncated_strings"]["original_lengths"] == {"job.sql": 10_000}
+	assert len(result["job"]["sql"]) == 10_000
+
+
+def test_fields_are_dropped_by_path_not_by_key():
+	result = {
+		"jobs": [{"job_id": i, "config": {"blob": ["y" * 50] * 20}} for i in range(5)],
+		"cluster": {"config": {"parallelism": 4}},
+	}
+
+	shaped = ResponseBudget(1_000).shape(result, "list_streams")
+
+	assert shaped["_budget"]["dropped_fields"]["fields"] == ["jobs.config"]
+	assert all("config" not in job for job in shaped["jobs"])
+	assert shaped["cluster"] == {"config": {"parallelism": 4}}
+
+
+def test_cut_list_cursor_serves_unshaped_items():
+	pages = PageCache(default_page_size=1000)
+	result = jobs(50, sql="s" * 2000, meta={"owner": "o"})
+	budget = ResponseBudget(4_000)
+
+	shaped = budget.shape(result, "list_streams", pages)
+
+	cut = shaped["_budget"]["cut_lists"][0]
+	assert cut["path"] == "jobs" and cut["kept"] < 50
+	assert "meta" not in shaped["jobs"][0] and len(shaped["jobs"][0]["sql"]) < 2000
+	rest = pages.next_page(cut["next_cursor"])
+	assert rest["jobs"][0] == result["jobs"][cut["kept"]]
+	assert rest["page"]["total_items"] == 50
+
+
+def test_lists_without_a_page_cache_get_no_cursor():
+	shaped = ResponseBudget(500).shape(jobs(50), "list_streams")
+
+	assert "next_cursor" not in shaped["_budget"]["cut_lists"][0]
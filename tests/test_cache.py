@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import time
+
+from ssb_mcp_server.cache import CatalogCache, JobsSnapshot, TTLCache, parse_ttls
+
+
+def test_entries_expire_after_their_ttl():
+	cache = TTLCache(60)
+	cache.set("a", 1)
+	cache.set("b", 2, ttl=0.01)
+	time.sleep(0.02)
+
+	assert cache.get("a") == 1
+	assert cache.get("b") is None
+	assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+def test_zero_ttl_is_not_stored():
+	cache = TTLCache(0)
+	cache.set("a", 1)
+
+	assert cache.get("a", "missing") == "missing"
+
+
+def test_least_recently_used_entry_is_dropped():
+	cache = TTLCache(60, max_entries=2)
+	cache.set("a", 1)
+	cache.set("b", 2)
+	cache.get("a")
+	cache.set("c", 3)
+
+	assert cache.get("b") is None
+	assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_invalidate_where_drops_matching_keys():
+	cache = TTLCache(60)
+	cache.set(("tables", "a"), 1)
+	cache.set(("show", "a"), 2)
+	cache.invalidate_where(lambda key: key[0] == "tables")
+
+	assert cache.get(("tables", "a")) is None and cache.get(("show", "a")) == 2
+
+
+def test_jobs_snapshot_keeps_the_first_match():
+	snapshot = JobsSnapshot({"jobs": [{"job_id": 1, "name": "a"}, {"job_id": 2, "name": "a"}]})
+
+	assert snapshot.lookup("name", "a")["job_id"] == 1
+	assert snapshot.lookup("job_id", 3) is None
+
+
+def test_catalog_writes_drop_only_affected_listings():
+	catalog = CatalogCache()
+	catalog.put("tables", {"tables": [{"name": "t"}]})
+	catalog.put("udfs", {"udfs": []})
+	catalog.put("ddl/connectors", [{"type": "kafka"}])
+
+	catalog.invalidate_for_write("/data-sources/ds1")
+
+	assert catalog.get("tables") is None
+	assert catalog.get("udfs") is not None
+	assert catalog.get("ddl/connectors").lookup("type", "kafka") == {"type": "kafka"}
+
+
+def test_catalog_ttl_overrides():
+	catalog = CatalogCache(parse_ttls("tables=0, udfs=5,bad=x"))
+	catalog.put("tables", [])
+
+	assert catalog.ttls["udfs"] == 5 and "bad" not in catalog.ttls
+	assert catalog.get("tables") is None
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import httpx
+import pytest
+import requests
+from werkzeug import Response
+
+from ssb_mcp_server.core import SSBClientCore, SSBError
+
+
+JOBS = {"jobs": [
+	{"job_id": 1, "name": "orders", "state": "RUNNING", "sample_id": "s1"},
+	{"job_id": 2, "name": "old", "state": "STOPPED", "sample_id": None},
+]}
+
+
+def requests_to(httpserver, path: str) -> int:
+	return sum(1 for request, _ in httpserver.log if request.path == f"/api/v1/{path}")
+
+
+def test_clients_share_the_core_operations():
+	from ssb_mcp_server.async_client import AsyncSSBClient
+	from ssb_mcp_server.client import SSBClient
+
+	for name in ("list_streams", "execute_query", "list_jobs_with_samples", "_fetch_sample"):
+		assert getattr(SSBClient, name).__wrapped__ is getattr(AsyncSSBClient, name).__wrapped__ is vars(SSBClientCore)[name]
+
+
+def test_jobs_listing_is_cached(ssb, httpserver):
+	httpserver.expect_request("/api/v1/jobs", method="GET").respond_with_json(JOBS)
+
+	assert ssb.list_streams() == JOBS
+	assert ssb.get_stream("orders")["job_id"] == 1
+	assert ssb.get_job_status(2)["state"] == "STOPPED"
+	assert requests_to(httpserver, "jobs") == 1
+
+
+def test_error_response_raises_ssb_error(ssb, httpserver):
+	httpserver.expect_request("/api/v1/cluster/info").respond_with_json({"error_message": "broken"}, status=400)
+
+	with pytest.raises(SSBError, match="broken for cluster/info"):
+		ssb.get_cluster_info()
+
+
+def test_unauthorized_raises_the_http_library_error(ssb, httpserver):
+	httpserver.expect_request("/api/v1/heartbeat").respond_with_data("nope", status=401)
+
+	with pytest.raises((requests.HTTPError, httpx.HTTPStatusError), match="Unauthorized"):
+		ssb.get_heartbeat()
+
+
+def test_get_is_retried_on_transient_status(ssb, httpserver):
+	httpserver.expect_oneshot_request("/api/v1/heartbeat").respond_with_data("busy", status=503)
+	httpserver.expect_request("/api/v1/heartbeat").respond_with_json({"ok": True})
+
+	assert ssb.get_heartbeat() == {"ok": True}
+	assert requests_to(httpserver, "heartbeat") == 2
+
+
+def test_post_is_not_retried_on_transient_status(ssb, httpserver):
+	httpserver.expect_request("/api/v1/projects", method="POST").respond_with_data("busy", status=503)
+
+	with pytest.raises(SSBError):
+		ssb.create_project({"name": "p"})
+	assert requests_to(httpserver, "projects") == 1
+
+
+def test_repeated_query_returns_the_running_job(ssb, httpserver):
+	httpserver.expect_request("/api/v1/sql/execute", method="POST").respond_with_json({"type": "job", "job_id": 1, "sample_id": "s1"})
+	httpserver.expect_request("/api/v1/jobs", method="GET").respond_with_json(JOBS)
+
+	first = ssb.execute_query("SELECT * FROM orders")
+	second = ssb.execute_query("select *   from orders;")
+
+	assert first["status"] == "success" and "deduplicated" not in first
+	assert second["deduplicated"] is True and second["job_id"] == 1
+	assert requests_to(httpserver, "sql/execute") == 1
+
+
+def test_jobs_with_samples_fan_out(ssb, httpserver):
+	httpserver.expect_request("/api/v1/jobs", method="GET").respond_with_json(JOBS)
+	httpserver.expect_request("/api/v1/samples/s1").respond_with_json({"records": [{"a": 1}, {"a": 2}], "job_status": "RUNNING"})
+
+	result = ssb.list_jobs_with_samples()
+
+	by_id = {job["job_id"]: job for job in result["jobs"]}
+	assert by_id[1]["sample_records_count"] == 2 and by_id[1]["sample_status"] == "RUNNING"
+	assert by_id[2]["sample_status"] == "no_sample_id"
+	assert "pending_samples" not in result
+
+
+def test_samples_missing_the_deadline_are_pending(ssb, httpserver):
+	httpserver.expect_request("/api/v1/jobs", method="GET").respond_with_json(JOBS)
+	release = threading.Event()
+	httpserver.expect_request("/api/v1/samples/s1").respond_with_handler(lambda request: release.wait(5) and Response("{}"))
+
+	started = time.monotonic()
+	try:
+		result = ssb.list_jobs_with_samples(deadline_seconds=0.2)
+	finally:
+		release.set()
+
+	assert time.monotonic() - started < 2
+	assert result["pending_samples"] == 1
+
+
+def test_bulk_registration_runs_each_ddl(ssb, httpserver):
+	httpserver.expect_request("/api/v1/sql/execute", method="POST", json={"sql": "SHOW CATALOGS;"}).respond_with_json(
+		{"table_data": {"data": [{"catalog name": "ssb"}]}})
+	httpserver.expect_request("/api/v1/sql/execute", method="POST", json={"sql": "SHOW TABLES FROM `ssb`.`ssb_default`;"}).respond_with_json(
+		{"table_data": {"data": [{"table name": "ssb_a"}]}})
+	httpserver.expect_request("/api/v1/sql/execute", method="POST").respond_with_json({"type": "ddl"})
+
+	result = ssb.register_kafka_tables([{"topic": "a"}, {"topic": "b"}, {"table_name": "a", "topic": "c"}])
+
+	assert [entry["status"] for entry in result["tables"]] == ["registered", "registered", "failed"]
+	assert [entry["available_for_querying"] for entry in result["tables"][:2]] == [True, False]
+	assert requests_to(httpserver, "sql/execute") == 4
+
+
+def test_repeat_listing_reuses_fetched_samples(ssb, httpserver):
+	httpserver.expect_request("/api/v1/jobs", method="GET").respond_with_json(JOBS)
+	httpserver.expect_request("/api/v1/samples/s1").respond_with_json({"records": [{"a": 1}], "job_status": "RUNNING"})
+
+	ssb.list_jobs_with_samples()
+	result = ssb.list_jobs_with_samples()
+
+	assert result["jobs"][0]["sample_records_count"] == 1
+	assert requests_to(httpserver, "samples/s1") == 1
+
+
+def test_oversized_sample_is_not_downloaded_for_counting(ssb, httpserver):
+	httpserver.expect_request("/api/v1/jobs", method="GET").respond_with_json(JOBS)
+	httpserver.expect_request("/api/v1/samples/s1").respond_with_json({"records": [{"a": "x" * 100}] * 100, "job_status": "RUNNING"})
+	getattr(ssb, "client", ssb).sample_count_max_bytes = 1024
+
+	result = ssb.list_jobs_with_samples()
+
+	assert result["jobs"][0]["sample_status"] == "too_large"
+	assert result["jobs"][0]["sample_records_count"] is None
+
+
+def test_read_only_posts_keep_cached_state(ssb, httpserver):
+	httpserver.expect_request("/api/v1/sql/analyze", method="POST").respond_with_json({"valid": True})
+	httpserver.expect_request("/api/v1/tables", method="GET").respond_with_json({"tables": [{"name": "orders"}]})
+	for path in ("data-sources/validate", "udfs/run", "sync/config/validate/p1"):
+		httpserver.expect_request(f"/api/v1/{path}", method="POST").respond_with_json({"ok": True})
+
+	ssb.analyze_sql("SELECT 1")
+	ssb.list_tables_detailed()
+	ssb.validate_data_source({"type": "kafka"})
+	ssb.run_udf("u1", {})
+	ssb.validate_sync_config("p1")
+
+	assert ssb.analyze_sql("SELECT 1")["cached"] is True
+	ssb.list_tables_detailed()
+	assert requests_to(httpserver, "sql/analyze") == 1
+	assert requests_to(httpserver, "tables") == 1
+
+
+def test_writes_invalidate_cached_state(ssb, httpserver):
+	httpserver.expect_request("/api/v1/tables", method="GET").respond_with_json({"tables": []})
+	httpserver.expect_request("/api/v1/tables", method="POST").respond_with_json({"name": "orders"})
+
+	ssb.list_tables_detailed()
+	ssb.create_table_detailed({"name": "orders"})
+	ssb.list_tables_detailed()
+
+	assert sum(1 for request, _ in httpserver.log if request.path == "/api/v1/tables" and request.method == "GET") == 2
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from ssb_mcp_server.localsql import LocalQueryError, LocalSampleEngine, _check_read_only
+
+
+RECORDS = [{"name": "a--b", "n": 1}, {"name": "x;y", "n": 2}, {"name": "plain", "n": 3}]
+
+
+@pytest.fixture
+def engine():
+	engine = LocalSampleEngine(max_snapshots=2)
+	engine.load("s1", 1, RECORDS)
+	return engine
+
+
+def test_trailing_semicolon_and_comments_are_accepted():
+	assert _check_read_only("-- note\nSELECT 1; /* done */ ;") == "-- note\nSELECT 1"
+
+
+def test_comment_markers_inside_literals_are_kept(engine):
+	result = engine.query("s1", "SELECT n FROM sample WHERE name = 'a--b'")
+
+	assert result["rows"] == [[1]]
+
+
+def test_semicolon_inside_literal_is_one_statement(engine):
+	result = engine.query("s1", "SELECT n FROM sample WHERE name = 'x;y';")
+
+	assert result["rows"] == [[2]]
+
+
+@pytest.mark.parametrize("sql", [
+	"SELECT 1; DROP TABLE sample",
+	"SELECT 1; -- fine\nSELECT 2",
+])
+def test_several_statements_are_rejected(sql):
+	with pytest.raises(LocalQueryError, match="single statement"):
+		_check_read_only(sql)
+
+
+@pytest.mark.parametrize("sql", [
+	"DELETE FROM sample",
+	"/* SELECT */ DROP TABLE sample",
+	"'SELECT' FROM sample",
+	"",
+])
+def test_writes_are_rejected(sql):
+	with pytest.raises(LocalQueryError, match="read-only"):
+		_check_read_only(sql)
+
+
+def test_same_version_is_loaded_once(engine):
+	engine.load("s1", 1, RECORDS)
+
+	assert engine.stats()["loads"] == 1
+
+
+def test_least_recently_used_snapshot_is_evicted(engine):
+	engine.load("s2", 1, RECORDS)
+	engine.query("s1", "SELECT 1")
+	engine.load("s3", 1, RECORDS)
+
+	assert engine.snapshot_version("s2") is None
+	assert engine.snapshot_version("s1") == 1
+
+
+def test_eviction_waits_for_a_running_query(engine):
+	snapshot = engine._snapshots["s1"]
+	snapshot.lock.acquire()
+	closer = threading.Thread(target=snapshot.close)
+	closer.start()
+	closer.join(0.1)
+
+	assert closer.is_alive()
+	snapshot.lock.release()
+	closer.join(5)
+	with pytest.raises(LocalQueryError, match="replaced"):
+		snapshot.query("SELECT 1", 10)
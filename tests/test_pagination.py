@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from ssb_mcp_server.pagination import PageCache
+
+
+def test_short_lists_are_not_paged():
+	result = {"jobs": [1, 2]}
+
+	assert PageCache(default_page_size=5).first_page(result) is result
+
+
+def test_cursor_walks_the_whole_list():
+	pages = PageCache(default_page_size=3)
+	page = pages.first_page({"total": 7, "jobs": list(range(7))})
+	seen = list(page["jobs"])
+	while page["page"]["next_cursor"]:
+		page = pages.next_page(page["page"]["next_cursor"])
+		seen += page["jobs"]
+		assert page["total"] == 7
+
+	assert seen == list(range(7))
+
+
+def test_page_size_is_capped_by_the_default():
+	page = PageCache(default_page_size=3).first_page(list(range(10)), page_size=50)
+
+	assert page["items"] == [0, 1, 2] and page["page"]["page_size"] == 3
+
+
+def test_unknown_or_malformed_cursors_return_none():
+	pages = PageCache(default_page_size=2)
+	token = pages.first_page({"jobs": [1, 2, 3]})["page"]["next_cursor"].partition(":")[0]
+
+	assert pages.next_page("missing:2") is None
+	assert pages.next_page(f"{token}:x") is None
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from ssb_mcp_server.projection import project
+
+
+DOC = {
+	"state": "RUNNING",
+	"jobs": [{"name": "a", "config": {"p": 1, "q": 2}}, {"name": "b", "config": {"p": 3}}],
+	"meta": {"x": {"v": 1}, "y": {"v": 2}},
+}
+
+
+def test_no_fields_keeps_everything():
+	assert project(DOC, None) is DOC
+	assert project(DOC, []) is DOC
+
+
+def test_lists_are_traversed_implicitly():
+	assert project(DOC, ["jobs.config.p"]) == {"jobs": [{"config": {"p": 1}}, {"config": {"p": 3}}]}
+
+
+def test_wildcard_matches_any_key():
+	assert project(DOC, ["meta.*.v", "state"]) == {"state": "RUNNING", "meta": {"x": {"v": 1}, "y": {"v": 2}}}
+
+
+def test_shorter_path_keeps_the_whole_subtree():
+	assert project(DOC, ["jobs.config.p", "jobs.config"]) == project(DOC, ["jobs.config"])
+	assert project(DOC, ["jobs.config"])["jobs"][0]["config"] == {"p": 1, "q": 2}
+
+
+def test_unknown_paths_yield_nothing():
+	assert project(DOC, ["missing.path"]) == {}
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pytest
+
+from ssb_mcp_server.ratelimit import EXECUTE, READ, WRITE, RateLimiter, TokenBucket, classify_request
+
+
+@pytest.mark.parametrize("method, path, expected", [
+	("GET", "jobs", READ),
+	("POST", "jobs", WRITE),
+	("DELETE", "/streams/x", WRITE),
+	("POST", "/sql/execute", EXECUTE),
+])
+def test_requests_are_classified(method, path, expected):
+	assert classify_request(method, path) == expected
+
+
+def test_burst_is_free_then_reservations_queue_in_order():
+	bucket = TokenBucket(rate=10, capacity=2)
+
+	delays = [bucket.reserve() for _ in range(4)]
+
+	assert delays[:2] == [0.0, 0.0]
+	assert 0.09 <= delays[2] <= 0.1
+	assert 0.19 <= delays[3] <= 0.2
+	assert bucket.stats()["delayed_requests"] == 2
+
+
+def test_classes_have_separate_buckets():
+	limiter = RateLimiter(read_rps=1, execute_rps=1, burst=1)
+
+	assert limiter.reserve("GET", "jobs") == 0.0
+	assert limiter.reserve("POST", "sql/execute") == 0.0
+	assert limiter.reserve("GET", "jobs") > 0
+
+
+def test_non_positive_rate_disables_a_class():
+	limiter = RateLimiter(read_rps=0, write_rps=1)
+
+	assert all(limiter.reserve("GET", "jobs") == 0.0 for _ in range(10))
+	assert set(limiter.stats()) == {WRITE}
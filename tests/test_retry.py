@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import socket
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+import requests
+
+from ssb_mcp_server.retry import RetryPolicy, connection_never_established, parse_retry_after
+
+
+@pytest.fixture
+def closed_url():
+	with socket.socket() as sock:
+		sock.bind(("127.0.0.1", 0))
+		port = sock.getsockname()[1]
+	return f"http://127.0.0.1:{port}/"
+
+
+def test_retry_after_seconds_and_dates():
+	assert parse_retry_after("3") == 3.0
+	assert parse_retry_after("-1") == 0.0
+	assert parse_retry_after("soon") is None
+	assert parse_retry_after(None) is None
+	later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+	assert 25 < parse_retry_after(later) <= 30
+
+
+def test_only_transient_statuses_are_retried():
+	policy = RetryPolicy()
+
+	assert policy.should_retry_status(503, idempotent=True)
+	assert not policy.should_retry_status(503, idempotent=False)
+	assert policy.should_retry_status(429, idempotent=False)
+	assert not policy.should_retry_status(404, idempotent=True)
+
+
+def test_backoff_is_capped_and_honours_retry_after():
+	policy = RetryPolicy(backoff_base=1.0, backoff_max=4.0)
+
+	assert all(0 <= policy.backoff(10) <= 4.0 for _ in range(100))
+	assert 7.0 <= policy.backoff(1, retry_after=7.0) <= 8.0
+
+
+def test_retries_stop_at_the_limit_and_budget():
+	state = RetryPolicy(max_retries=2, backoff_base=0.0).begin()
+	assert state.next_delay(False) is None
+	assert state.next_delay(True) is not None
+	assert state.next_delay(True) is not None
+	assert state.next_delay(True) is None
+
+	slow = RetryPolicy(budget_seconds=1.0).begin()
+	assert slow.next_delay(True, retry_after=5.0) is None
+
+
+def test_refused_connections_were_never_established(closed_url):
+	with pytest.raises(requests.ConnectionError) as sync_error:
+		requests.post(closed_url, timeout=2)
+	with pytest.raises(httpx.ConnectError) as async_error:
+		httpx.post(closed_url, timeout=2)
+
+	assert connection_never_established(sync_error.value)
+	assert connection_never_established(async_error.value)
+
+
+@pytest.mark.parametrize("error", [
+	requests.ConnectTimeout(),
+	httpx.ConnectTimeout("timed out"),
+])
+def test_connect_timeouts_were_never_established(error):
+	assert connection_never_established(error)
+
+
+@pytest.mark.parametrize("error", [
+	requests.ReadTimeout(),
+	requests.ConnectionError("Connection aborted"),
+	httpx.ReadTimeout("timed out"),
+	httpx.RemoteProtocolError("Server disconnected"),
+	ValueError(),
+])
+def test_errors_after_sending_may_have_been_processed(error):
+	assert not connection_never_established(error)
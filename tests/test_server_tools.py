@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import anyio
+import httpx
+
+from ssb_mcp_server.async_client import AsyncSSBClient
+from ssb_mcp_server.server import create_server
+
+
+def tool_parameters(readonly: bool) -> dict:
+	async def collect() -> dict:
+		client = AsyncSSBClient("http://ssb.invalid/api/v1", httpx.AsyncClient())
+		try:
+			app = create_server(client, readonly)
+			return {tool.name: set(tool.inputSchema.get("properties", {})) for tool in await app.list_tools()}
+		finally:
+			await client.aclose()
+	return anyio.run(collect)
+
+
+def test_write_tools_accept_fields():
+	tools = tool_parameters(readonly=False)
+
+	for name in ("create_kafka_table", "create_stream", "update_stream", "delete_stream", "start_stream", "stop_stream"):
+		assert "fields" in tools[name], name
+
+
+def test_readonly_mode_hides_stream_writes():
+	tools = tool_parameters(readonly=True)
+
+	assert "create_stream" not in tools and "fields" in tools["list_streams"]
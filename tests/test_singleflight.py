@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import anyio
+import pytest
+
+from ssb_mcp_server.singleflight import AsyncSingleFlight, SingleFlight, request_key
+
+
+def test_request_key_ignores_param_order_and_slashes():
+	assert request_key("get", "/jobs/", {"b": 1, "a": 2}) == request_key("GET", "jobs", {"a": 2, "b": 1})
+	assert request_key("GET", "jobs") != request_key("GET", "jobs", {"a": 1})
+
+
+def test_concurrent_callers_share_one_execution():
+	flight = SingleFlight()
+	started, release = threading.Event(), threading.Event()
+	calls = []
+
+	def fetch():
+		calls.append(1)
+		started.set()
+		release.wait(5)
+		return {"jobs": []}
+
+	results = []
+	leader = threading.Thread(target=lambda: results.append(flight.do("k", fetch)))
+	leader.start()
+	started.wait(5)
+	followers = [threading.Thread(target=lambda: results.append(flight.do("k", fetch))) for _ in range(3)]
+	for thread in followers:
+		thread.start()
+	while flight.stats()["coalesced"] < 3:
+		time.sleep(0.001)
+	release.set()
+	for thread in [leader, *followers]:
+		thread.join(5)
+
+	assert len(calls) == 1 and len(results) == 4
+	assert all(result is results[0] for result in results)
+	assert flight.stats() == {"in_flight": 0, "coalesced": 3}
+
+
+def test_errors_are_shared_and_not_remembered():
+	flight = SingleFlight()
+
+	with pytest.raises(ValueError):
+		flight.do("k", lambda: (_ for _ in ()).throw(ValueError("boom")))
+	assert flight.do("k", lambda: 1) == 1
+
+
+def test_async_callers_share_one_execution():
+	flight = AsyncSingleFlight()
+	calls = []
+
+	async def fetch():
+		calls.append(1)
+		await anyio.sleep(0.05)
+		return "result"
+
+	async def main():
+		results = []
+
+		async def call():
+			results.append(await flight.do("k", fetch))
+
+		async with anyio.create_task_group() as tg:
+			for _ in range(4):
+				tg.start_soon(call)
+		return results
+
+	assert anyio.run(main) == ["result"] * 4
+	assert len(calls) == 1
+
+
+def test_follower_runs_alone_when_the_leader_is_cancelled():
+	flight = AsyncSingleFlight()
+
+	async def main():
+		scopes, results = [], []
+
+		async def slow():
+			await anyio.sleep(10)
+
+		async def quick():
+			return "mine"
+
+		async def leader():
+			with anyio.CancelScope() as scope:
+				scopes.append(scope)
+				await flight.do("k", slow)
+
+		async def follower():
+			results.append(await flight.do("k", quick))
+
+		async with anyio.create_task_group() as tg:
+			tg.start_soon(leader)
+			await anyio.sleep(0.01)
+			tg.start_soon(follower)
+			await anyio.sleep(0.01)
+			scopes[0].cancel()
+		return results
+
+	assert anyio.run(main) == ["mine"]
+	assert flight.stats() == {"in_flight": 0, "coalesced": 1}
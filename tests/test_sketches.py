@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import random
+
+from ssb_mcp_server.sketches import CountMinTopK, HyperLogLog, SampleSketches, TDigest
+
+
+def test_distinct_count_is_close():
+	sketch = HyperLogLog()
+	for i in range(20_000):
+		sketch.add(f"user-{i % 5000}")
+
+	assert abs(sketch.count() - 5000) / 5000 < 0.05
+
+
+def test_merged_distinct_counts_union():
+	a, b = HyperLogLog(), HyperLogLog()
+	for i in range(1000):
+		a.add(i)
+		b.add(i + 500)
+	a.merge(b)
+
+	assert abs(a.count() - 1500) / 1500 < 0.05
+
+
+def test_heavy_hitters_are_found():
+	sketch = CountMinTopK(capacity=8)
+	for i in range(2000):
+		sketch.add("hot" if i % 2 else f"cold-{i}")
+
+	assert sketch.top(1) == [{"value": "hot", "count": 1000}]
+
+
+def test_quantiles_are_close_and_merge():
+	values = list(range(10_000))
+	random.Random(1).shuffle(values)
+	a, b = TDigest(), TDigest()
+	for value in values[:5000]:
+		a.add(value)
+	for value in values[5000:]:
+		b.add(value)
+	a.merge(b)
+
+	assert abs(a.quantile(0.5) - 5000) < 150
+	assert abs(a.quantile(0.99) - 9900) < 50
+	assert a.quantile(0) == 0 and a.quantile(1) == 9999
+
+
+def test_sample_sketches_follow_enabled_columns():
+	sketches = SampleSketches(max_samples=1)
+	sketches.enable("s1", ["user.id"], seed=['{"user": {"id": 1}}'])
+	sketches.update("s1", [{"user": {"id": 2}}, {"user": {"id": None}}])
+	sketches.update("other", [{"user": {"id": 3}}])
+
+	report = sketches.query("s1")["user.id"]
+	assert report["values"] == 2 and report["nulls"] == 1
+	assert report["distinct_estimate"] == 2 and report["min"] == 1.0
+	assert sketches.query("other") is None
+
+	sketches.enable("s2", ["x"])
+	assert sketches.query("s1") is None
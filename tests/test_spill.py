@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from ssb_mcp_server import spill as spill_module
+from ssb_mcp_server.spill import SampleSpillStore
+
+
+RECORDS = [{"id": i, "name": f"n{i}"} for i in range(2500)]
+
+
+@pytest.fixture(params=["arrow", "jsonl"])
+def store(request, tmp_path, monkeypatch):
+	if request.param == "arrow":
+		pytest.importorskip("pyarrow")
+	else:
+		monkeypatch.setattr(spill_module, "pa", None)
+	store = SampleSpillStore(threshold_records=100, directory=str(tmp_path), max_files=2)
+	yield store
+	store.close()
+
+
+def test_only_large_samples_spill(store):
+	assert store.should_spill(RECORDS)
+	assert not store.should_spill(RECORDS[:100])
+
+
+def test_pages_read_back_what_was_written(store):
+	descriptor = store.write("s1", RECORDS)
+
+	assert descriptor["row_count"] == 2500
+	assert descriptor["schema"] == [{"name": "id", "type": "BIGINT"}, {"name": "name", "type": "VARCHAR"}]
+	page = store.read(descriptor["spill_id"], offset=999, limit=3)
+	assert page["records"] == RECORDS[999:1002] and page["has_more"]
+	last = store.read(descriptor["spill_id"], offset=2499, limit=10)
+	assert last["records"] == RECORDS[2499:] and not last["has_more"]
+	assert store.read(descriptor["spill_id"], offset=5000)["records"] == []
+
+
+def test_oldest_spill_is_deleted(store):
+	first = store.write("s1", RECORDS)
+	store.write("s2", RECORDS)
+	store.write("s3", RECORDS)
+
+	assert store.read(first["spill_id"]) is None
+	assert not os.path.exists(first["path"])
+
+
+def test_delete_and_close_remove_files(store):
+	kept = store.write("s1", RECORDS)
+	deleted = store.write("s2", RECORDS)
+
+	assert store.delete(deleted["spill_id"]) and not store.delete(deleted["spill_id"])
+	assert not os.path.exists(deleted["path"])
+	store.close()
+	assert not os.path.exists(kept["path"])
+
+
+def test_records_with_drifting_types_still_spill(store):
+	records = [{"v": i} for i in range(1500)] + [{"v": "text"}]
+
+	descriptor = store.write("s1", records)
+
+	assert store.read(descriptor["spill_id"], offset=1500)["records"] == [{"v": "text"}]
+
+
+def test_own_directory_is_removed_on_close():
+	store = SampleSpillStore()
+	descriptor = store.write("s1", RECORDS[:10])
+	directory = os.path.dirname(descriptor["path"])
+
+	store.close()
+
+	assert not os.path.exists(directory)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pytest
+
+from ssb_mcp_server.sqlcheck import SqlValidationError, check_sql
+
+
+@pytest.mark.parametrize("sql", [
+	"SELECT * FROM orders",
+	"STOP JOB '123'",
+	"RESET 'table.exec.state.ttl'",
+	"LOAD MODULE hive",
+	"UNLOAD MODULE hive",
+	"ADD JAR '/tmp/udf.jar'",
+	"REMOVE JAR '/tmp/udf.jar'",
+	"EXECUTE STATEMENT SET BEGIN INSERT INTO a SELECT * FROM b; END",
+	"COMPILE PLAN 'plan.json' FOR INSERT INTO a SELECT * FROM b",
+	"REPLACE TABLE t AS SELECT * FROM b",
+	"SELECT '--not a comment' FROM orders",
+	"SELECT 'a;b' FROM orders; -- trailing\n",
+	"(SELECT 1) UNION (SELECT 2)",
+])
+def test_valid_statements_pass(sql):
+	check_sql(sql)
+
+
+@pytest.mark.parametrize("sql, message", [
+	("", "empty"),
+	("SELECT 'open FROM t", "Unterminated string literal"),
+	("SELECT (1 FROM t", "unclosed"),
+	("SELECT 1) FROM t", "Unbalanced"),
+	("SELECT a, FROM t", "Trailing comma"),
+	("SELECT * FROM t WHERE", "ends unexpectedly"),
+	("SELECT a WHERE a > 1", "no FROM"),
+	("INSERT INTO t", "SELECT or VALUES"),
+])
+def test_malformed_statements_are_rejected(sql, message):
+	with pytest.raises(SqlValidationError, match=message):
+		check_sql(sql)
+
+
+def test_unknown_keyword_gets_a_suggestion():
+	with pytest.raises(SqlValidationError) as raised:
+		check_sql("SELEC * FROM t")
+
+	assert raised.value.details == {"checked_locally": True, "position": 0, "suggestion": "Did you mean SELECT?"}
+
+
+def test_only_tables_reported_missing_are_rejected():
+	known = {"orders": True, "gone": False}
+
+	check_sql("SELECT * FROM orders JOIN elsewhere ON true", known.get)
+	check_sql("WITH gone AS (SELECT 1) SELECT * FROM gone", known.get)
+	check_sql("SELECT EXTRACT(YEAR FROM gone) FROM orders", known.get)
+	with pytest.raises(SqlValidationError, match="'gone' not found"):
+		check_sql("SELECT * FROM orders JOIN gone ON true", known.get)
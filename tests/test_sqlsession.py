@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from ssb_mcp_server.sqlsession import SqlSession, fingerprint_sql, normalize_sql, statement_kind
+
+
+def test_normalize_folds_keywords_and_drops_comments():
+	assert normalize_sql("select  *\nfrom Orders -- c\n;;") == "SELECT*FROM Orders;"
+	assert normalize_sql("SELECT 'a -- b'") == "SELECT 'a -- b';"
+	assert fingerprint_sql("select 1") == fingerprint_sql("SELECT 1;")
+
+
+def test_statement_kinds():
+	assert statement_kind("CREATE TABLE t (a INT)") == "ddl"
+	assert statement_kind("SHOW TABLES") == "metadata"
+	assert statement_kind("SELECT 1; SELECT 2") == "script"
+	assert statement_kind("INSERT INTO t SELECT 1") == "job"
+	assert statement_kind("SELECT ';'") == "job"
+
+
+def test_use_statements_track_the_namespace():
+	session = SqlSession()
+	session.observe("USE CATALOG ssb")
+	session.observe("USE `ssb_default`")
+
+	assert session.current == ("ssb", "ssb_default")
+	assert session.qualify("orders") == "ssb.ssb_default.orders"
+	assert not session.needs_use("ssb", "ssb_default")
+
+
+def test_table_exists_is_true_or_unknown():
+	session = SqlSession()
+	session.observe("USE ssb.db")
+	session.remember(("tables", "ssb", "db"), {"table_data": {"data": [{"table name": "orders"}]}})
+
+	assert session.table_exists("orders") is True
+	assert session.table_exists("created_elsewhere") is None
+	assert session.table_exists("other.db2.orders") is None
+
+
+def test_table_exists_is_unknown_without_a_namespace():
+	assert SqlSession().table_exists("orders") is None
+
+
+def test_ddl_invalidates_cached_listings_but_use_does_not():
+	session = SqlSession()
+	session.observe("USE ssb.db")
+	session.remember(("tables", "ssb", "db"), {"table_data": {"data": []}})
+	session.observe("USE ssb.db")
+	assert session.cached(("tables", "ssb", "db")) is not None
+
+	session.observe("CREATE TABLE t (a INT)")
+
+	assert session.cached(("tables", "ssb", "db")) is None
+
+
+def test_semicolon_in_a_literal_keeps_the_namespace():
+	session = SqlSession()
+	session.observe("USE ssb.db")
+	session.observe("SELECT 'a;b'")
+
+	assert session.current == ("ssb", "db")